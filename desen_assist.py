@@ -36,6 +36,7 @@ import processing  # type: ignore
 
 from qgis.core import ( # type: ignore
     Qgis,
+    QgsApplication,
     QgsCategorizedSymbolRenderer,
     QgsFeature,
     QgsFeatureRequest,
@@ -50,7 +51,6 @@ from qgis.core import ( # type: ignore
     QgsCategorizedSymbolRenderer,
     QgsRendererCategory,
     QgsSpatialIndex,
-    QgsVectorFileWriter,
     QgsVectorLayer,
     QgsWkbTypes,
     QgsFeatureRequest,
@@ -60,6 +60,20 @@ from qgis.core import ( # type: ignore
 from . import config
 from .func.generate_excel import GenerateExcelDialog
 from .func.helper_functions import HelperBase, SHPProcessor
+from .func.network_snapshot import DEFAULT_TOLERANCE, DetachedLayer
+from .func.post_export import (
+    POST_LAYERS,
+    SELECTION_LAYERS,
+    PostExportTask,
+    ensure_attribute_indexes,
+    export_posts,
+    export_selection,
+    load_output,
+    majority_id_bdi,
+    pole_id_bdi_votes,
+)
+from .func.result_cache import ResultCache
+from .func.stalp_fields import StalpRules, stalp_field_changes
 from .func.vector_verifier import VectorVerifier
 from .resources import *
 
@@ -82,6 +96,9 @@ class DesenAssist:
         self.plugin_dir = os.path.dirname(__file__)
         self.helper = HelperBase()
         self.processor = None
+        self.verifier = None
+        self.single_gpkg = False        # separations saved as one multi-layer GeoPackage
+        self.export_task = None         # separation running in the background
         # initialize locale
         locale = QSettings().value('locale/userLocale')[0:2]
         locale_path = os.path.join(
@@ -431,7 +448,11 @@ class DesenAssist:
         self.load_ui_action.setIcon(QIcon(str(self.plugin_path('icons/ui_done.png'))))
 
     def prepare_and_separate(self):
-        success = self.assign_id_bdis(self.layers)
+        try:
+            success = self.assign_id_bdis(self.layers)
+        except IOError as e:
+            QgsMessageLog.logMessage(str(e), "DesenAssist", level=Qgis.Critical)
+            success = False
         
         if success:
             self.separate_poles_by_id(self.layers)
@@ -443,8 +464,11 @@ class DesenAssist:
         Completes ID_BDI for BRANS_FIRI_GRPM_JT, FB_pe_C_LES, TRONSON_JT by mapping from their LINIE_JT - which corresponds to DENUM from layer LINIA_JT (which also has ID_BDI)
         Completes ID_BDI for STALP_JT by getting the intersected TRONSON_JT's ID_BDI. If multiple intersecting TRONSON_JT features have different ID_BDI values, assign the most frequent one.
         If no intersection is found in TRONSON_JT, checks for intersections in BRANS_FIRI_GRPM_JT.
+        The poles touching lines of more than one ID_BDI are reported in DE_VERIFICAT.
+        Only the features whose ID_BDI actually changes are written, with one bulk attribute write per layer.
         """
-        
+        helper = self.helper
+
         # Create dictionary for LINIE_JT mapping (DENUM -> ID_BDI)
         linia_jt_layer = layers["LINIE_JT"]
         linia_jt_mapping = {feat["DENUM"]: feat["ID_BDI"] for feat in linia_jt_layer.getFeatures()}
@@ -452,158 +476,187 @@ class DesenAssist:
         # Update ID_BDI for BRANS_FIRI_GRPM_JT, FB pe C LES, TRONSON_JT based on LINIA_JT
         for layer_name in ["BRANS_FIRI_GRPM_JT", "FB pe C LES", "TRONSON_JT"]:
             layer = layers[layer_name]
-            layer.startEditing()
-            for feature in layer.getFeatures():
+            id_bdi_idx = layer.fields().indexOf("ID_BDI")
+            request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes(["LINIA_JT", "ID_BDI"], layer.fields())
+            changes = {}
+            for feature in layer.getFeatures(request):
                 linia_denum = feature["LINIA_JT"]
                 if linia_denum in linia_jt_mapping:
-                    feature["ID_BDI"] = linia_jt_mapping[linia_denum]
-                    layer.updateFeature(feature)
-            layer.commitChanges()
+                    target = linia_jt_mapping[linia_denum]
+                    if not helper.same_value(feature[id_bdi_idx], target):
+                        changes[feature.id()] = {id_bdi_idx: target}
+            helper.write_attribute_changes(layer, changes)
         
-        # Spatially join ID_BDI from TRONSON_JT to STALP_JT
-        tronson_jt_layer = layers["TRONSON_JT"]
-        bransament_jt_layer = layers["BRANS_FIRI_GRPM_JT"]
+        # Spatially join ID_BDI from TRONSON_JT (else BRANS_FIRI_GRPM_JT) to STALP_JT, by majority vote,
+        # with the snapping tolerance of "Verificare vectorială"
         stalp_jt_layer = layers["STALP_JT"]
-        
-        spatial_index_tr = QgsSpatialIndex(tronson_jt_layer.getFeatures())
-        spatial_index_br = QgsSpatialIndex(bransament_jt_layer.getFeatures())
-        
-        stalp_jt_layer.startEditing()
-        for stalp in stalp_jt_layer.getFeatures():
-            intersecting_ids_tr = spatial_index_tr.intersects(stalp.geometry().boundingBox())
-            
-            id_bdi_value = None
-            
-            # First, try to get ID_BDI from intersecting TRONSON_JT
-            if intersecting_ids_tr:
-                for tronson in tronson_jt_layer.getFeatures(QgsFeatureRequest().setFilterFids(intersecting_ids_tr)):
-                    if stalp.geometry().intersects(tronson.geometry()):
-                        id_bdi_value = tronson["ID_BDI"]
-                        if id_bdi_value:  # If found, no need to check further
-                            break
-            
-            # If no ID_BDI found in TRONSON_JT, check BRANS_FIRI_GRPM_JT
-            if not id_bdi_value:
-                intersecting_ids_br = spatial_index_br.intersects(stalp.geometry().boundingBox())
-                
-                if intersecting_ids_br:
-                    for bransament in bransament_jt_layer.getFeatures(QgsFeatureRequest().setFilterFids(intersecting_ids_br)):
-                        if stalp.geometry().intersects(bransament.geometry()):
-                            id_bdi_value = bransament["ID_BDI"]
-                            if id_bdi_value:
-                                break  # Stop as soon as one is found
-            
-            # Assign the found ID_BDI to the STALP_JT feature
-            if id_bdi_value:
-                stalp["ID_BDI"] = id_bdi_value
-                stalp_jt_layer.updateFeature(stalp)
-
-        stalp_jt_layer.commitChanges()
+        votes = pole_id_bdi_votes(stalp_jt_layer, [layers["TRONSON_JT"], layers["BRANS_FIRI_GRPM_JT"]],
+                                  tol=DEFAULT_TOLERANCE)
+
+        stalp_id_bdi_idx = stalp_jt_layer.fields().indexOf("ID_BDI")
+        request = QgsFeatureRequest().setFilterFids(list(votes))
+        request.setSubsetOfAttributes(["DENUM", "ID_BDI"], stalp_jt_layer.fields())
+        changes = {}
+        ambiguous = []
+        for stalp in stalp_jt_layer.getFeatures(request):
+            counter = votes[stalp.id()]
+            id_bdi_value = majority_id_bdi(counter)
+            if len(counter) > 1:
+                ambiguous.append((stalp, id_bdi_value, counter))
+
+            # Assign the winning ID_BDI to the STALP_JT feature, if it differs
+            if not helper.same_value(stalp[stalp_id_bdi_idx], id_bdi_value):
+                changes[stalp.id()] = {stalp_id_bdi_idx: id_bdi_value}
+
+        helper.write_attribute_changes(stalp_jt_layer, changes)
+        self.report_ambiguous_id_bdi(stalp_jt_layer, ambiguous)
         return True
 
+    def report_ambiguous_id_bdi(self, stalp_jt_layer, ambiguous):
+        """
+        Adds STALP_JT_ID_BDI_ambiguu to DE_VERIFICAT: the poles touching lines of more than one ID_BDI,
+        with the ID_BDI they were given and the votes of every candidate.
+        """
+        if not ambiguous:
+            return
+
+        crs = stalp_jt_layer.crs().authid()
+        memory_layer = QgsVectorLayer(f"Point?crs={crs}", "STALP_JT_ID_BDI_ambiguu", "memory")
+        dp = memory_layer.dataProvider()
+
+        new_fields = QgsFields()
+        new_fields.append(QgsField("fid", QVariant.Int))
+        new_fields.append(QgsField("DENUM", QVariant.String))
+        new_fields.append(QgsField("ID_BDI", QVariant.String))
+        new_fields.append(QgsField("VOTURI", QVariant.String))
+        dp.addAttributes(new_fields)
+        memory_layer.updateFields()
+
+        features = []
+        for stalp, id_bdi_value, counter in ambiguous:
+            new_feat = QgsFeature(memory_layer.fields())
+            new_feat.setGeometry(stalp.geometry())
+            votes = ", ".join(f"{value}: {count}" for value, count in counter.most_common())
+            new_feat.setAttributes([stalp.id(), str(stalp["DENUM"] or ""), str(id_bdi_value), votes])
+            features.append(new_feat)
+        dp.addFeatures(features)
+
+        self.helper.add_layer_to_de_verificat(memory_layer)
+        QgsMessageLog.logMessage(f"{len(features)} stâlpi ating linii cu ID_BDI diferite - vezi STALP_JT_ID_BDI_ambiguu",
+                                 "DesenAssist", level=Qgis.Warning)
+
+
+    def ask_output_mode(self):
+        """
+        Asks how a separation is saved: one .gpkg per layer or a single GeoPackage with every layer.
+        Returns True for the single GeoPackage, None when the dialog is cancelled.
+        """
+        choices = ["Câte un fișier .gpkg pe strat", "Un singur GeoPackage cu toate straturile"]
+        choice, ok = QInputDialog.getItem(None, "Mod de salvare", "Salvează straturile filtrate ca:",
+                                          choices, int(self.single_gpkg), False)
+        if not ok:
+            return None
+        self.single_gpkg = choice == choices[1]
+        return self.single_gpkg
+
+    def run_export(self, description, export, on_done):
+        """
+        Runs a separation export in a background QgsTask, with progress and cancel in the task bar.
+        export(task) runs in the task; on_done(result) runs on the main thread once it succeeded.
+        """
+        if self.export_task is not None:
+            self.iface.messageBar().pushWarning(description, "O separare rulează deja.")
+            return
+
+        def finished(ok, result, exception):
+            self.export_task = None
+            if ok:
+                on_done(result)
+            elif exception is not None:
+                self.iface.messageBar().pushCritical(description, str(exception))
+            else:
+                self.iface.messageBar().pushWarning(description, "Separarea a fost anulată.")
+
+        self.export_task = PostExportTask(description, export, finished)
+        QgsApplication.taskManager().addTask(self.export_task)
 
     def separate_poles_by_id(self, layers):
         """
         Filters all layers based on user-input ID_BDI values and exports them into single .gpkg files per layer type.
+        With "*" every ID_BDI is exported, each post into its own <base_dir>/<ID_BDI>/ folder.
+        Every layer is read once, whatever the number of posts.
+        Optionally all layers go into a single GeoPackage (see ask_output_mode).
+        The export runs in the background; the layers are loaded once it is done.
         """
-        id_bdis, ok = QInputDialog.getText(None, "Input ID_BDI", "ID_BDI:")
+        id_bdis, ok = QInputDialog.getText(None, "Input ID_BDI", "ID_BDI (separate prin virgulă, * = toate posturile):")
 
         if ok and not id_bdis:
             QMessageBox.warning(None, "Input Error", "ID_BDI nu a fost introdus.")
             return
 
         if id_bdis:
-            # Convert input IDs to a list
-            id_bdi_list = [id_bdi.strip() for id_bdi in id_bdis.split(",") if id_bdi.strip()]
-            
-            # Access the layers
-            linie_jt_layer = layers["LINIE_JT"]
-            stalp_jt_layer = layers["STALP_JT"]
-            brans_layer = layers["BRANS_FIRI_GRPM_JT"]
-            fb_les_layer = layers["FB pe C LES"]
-            tronson_layer = layers["TRONSON_JT"]
-            
-            # Define layers to filter
-            layers_to_filter = {
-                "LINIE_JT": linie_jt_layer,
-                "STALP_JT": stalp_jt_layer,
-                "BRANS_FIRI_GRPM_JT": brans_layer,
-                "FB pe C LES": fb_les_layer,
-                "TRONSON_JT": tronson_layer
-            }
-            
+            single_file = self.ask_output_mode()
+            if single_file is None:
+                return
+
             base_dir = self.base_dir
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir)
-            
-            # Create a new group in QGIS
-            root = QgsProject.instance().layerTreeRoot()
-            new_group = root.addGroup(f"Date_Filtrate_{'_'.join(id_bdi_list)}")
-            
-            missing_id_bdis = []
-            
-            for id_bdi in id_bdi_list:
-                found = False
-                for feature in linie_jt_layer.getFeatures():
-                    if str(feature["ID_BDI"]) == id_bdi:
-                        found = True
-                        break
-                if not found:
-                    missing_id_bdis.append(id_bdi)
-            
-            for layer_name, original_layer in layers_to_filter.items():
-                # Retrieve geometry type and CRS
-                geometry_type = QgsWkbTypes.displayString(original_layer.wkbType())
-                crs = original_layer.crs().authid()
-                
-                # Create a new in-memory layer
-                new_layer = QgsVectorLayer(f"{geometry_type}?crs={crs}", layer_name, "memory")
-                new_layer_data = new_layer.dataProvider()
-                new_layer_data.addAttributes(original_layer.fields())
-                new_layer.updateFields()
-                
-                # Collect all matching features
-                matching_features = []
-                for feature in original_layer.getFeatures():
-                    if str(feature["ID_BDI"]) in id_bdi_list:
-                        matching_features.append(QgsFeature(feature))
-                
-                # Add filtered features to new layer (even if empty)
-                new_layer_data.addFeatures(matching_features)
-                new_layer.updateExtents()
-                                            
-                # Export to GeoPackage
-                output_path = os.path.join(base_dir, f"{layer_name}.gpkg")
-                QgsVectorFileWriter.writeAsVectorFormat(
-                    new_layer, output_path, "UTF-8", original_layer.crs(), "GPKG"
+
+            # main thread: indexes on the sources, thread-safe copies for the task
+            for layer_name in POST_LAYERS:
+                ensure_attribute_indexes(layers[layer_name])
+            sources = {layer_name: DetachedLayer(layers[layer_name]) for layer_name in POST_LAYERS}
+            transform_context = QgsProject.instance().transformContext()
+
+            if id_bdis.strip() == "*":
+                def all_exported(result):
+                    partitions, _outputs = result
+                    QMessageBox.information(
+                        None, "Success",
+                        f"Au fost exportate {len(set().union(*partitions.values()))} posturi în {base_dir}"
+                    )
+
+                self.run_export(
+                    "Separare posturi",
+                    lambda task: export_posts(sources, base_dir, single_file=single_file, feedback=task,
+                                              transform_context=transform_context),
+                    all_exported,
                 )
-                
-                permanent_layer = QgsVectorLayer(output_path, layer_name, "ogr")
-                QgsProject.instance().addMapLayer(permanent_layer, False)
-                new_group.addLayer(permanent_layer)
-                
-                if layer_name != "LINIE_JT" and original_layer:
-                    orig_renderer = original_layer.renderer()
-                    if orig_renderer is not None:
-                        permanent_layer.setRenderer(orig_renderer.clone())
-                    else:
-                        print(f"Warning: No renderer found for {layer_name}.")
-
-                    # Clone labeling if enabled and available
-                    if original_layer.labelsEnabled() and original_layer.labeling() is not None:
-                        permanent_layer.setLabeling(original_layer.labeling().clone())
-                        permanent_layer.setLabelsEnabled(True)
-
-                    permanent_layer.triggerRepaint()
-            
-            QMessageBox.information(None, "Success", "Layerele filtrate au fost salvate cu succes")
-            
-            if missing_id_bdis:
-                QMessageBox.warning(None, "ID_BDI lipsă în LINIE_JT", f"ID_BDI lipsă în LINIE_JT: {', '.join(missing_id_bdis)}")
+                return
+
+            # Convert input IDs to a list, without duplicates
+            id_bdi_list = list(dict.fromkeys(id_bdi.strip() for id_bdi in id_bdis.split(",") if id_bdi.strip()))
+
+            def exported(result):
+                partitions, outputs = result
+
+                # Create a new group in QGIS
+                root = QgsProject.instance().layerTreeRoot()
+                new_group = root.addGroup(f"Date_Filtrate_{'_'.join(id_bdi_list)}")
+
+                for layer_name in POST_LAYERS:
+                    original_layer = layers[layer_name] if layer_name != "LINIE_JT" else None
+                    load_output(outputs[None].uri(layer_name), layer_name, new_group, original_layer)
+
+                QMessageBox.information(None, "Success", "Layerele filtrate au fost salvate cu succes")
+
+                missing_id_bdis = [id_bdi for id_bdi in id_bdi_list if id_bdi not in partitions["LINIE_JT"]]
+                if missing_id_bdis:
+                    QMessageBox.warning(None, "ID_BDI lipsă în LINIE_JT", f"ID_BDI lipsă în LINIE_JT: {', '.join(missing_id_bdis)}")
+
+            self.run_export(
+                f"Separare {', '.join(id_bdi_list)}",
+                lambda task: export_posts(sources, base_dir, id_bdi_list, single_file, feedback=task,
+                                          transform_context=transform_context),
+                exported,
+            )
                 
     def separate_poles_by_selection(self):
         '''
         based on a selection or a drawn polygon, get all features from the layers and save them in new layers with the same names, saving them to self.base_dir
+        with several polygons in the "poligon" layer, each one gets its own output (<base_dir>/poligon_<fid>)
         '''
         
         layer_names = ["STALP_JT", "BRANS_FIRI_GRPM_JT", "FB pe C LES", "TRONSON_JT"]
@@ -648,82 +701,44 @@ class DesenAssist:
             return
             
 
-        if polygon_layer.featureCount() != 1:
-            QMessageBox.warning(
-                None,
-                "Poligon invalid",
-                f"Layerul {polygon_layer_name} trebuie să conțină un singur poligon."
-            )
-            return
+        # one output per polygon; a single polygon keeps the usual file names
+        polygon_features = list(polygon_layer.getFeatures())
+        if len(polygon_features) == 1:
+            polygons = {None: polygon_features[0].geometry()}
+        else:
+            polygons = {f"{polygon_layer_name}_{f.id()}": f.geometry() for f in polygon_features}
 
-        polygon_feature = next(polygon_layer.getFeatures())
-        polygon_geom = polygon_feature.geometry()
-        
-        stalp_jt_layer = layers["STALP_JT"]
-        brans_layer = layers["BRANS_FIRI_GRPM_JT"]
-        fb_les_layer = layers["FB pe C LES"]
-        tronson_layer = layers["TRONSON_JT"]
-
-        layers_to_filter = {
-            "STALP_JT": stalp_jt_layer,
-            "BRANS_FIRI_GRPM_JT": brans_layer,
-            "FB pe C LES": fb_les_layer,
-            "TRONSON_JT": tronson_layer
-        }
+        single_file = self.ask_output_mode()
+        if single_file is None:
+            return
 
         base_dir = self.base_dir
         if not os.path.exists(base_dir):
             os.makedirs(base_dir)
 
-        root = QgsProject.instance().layerTreeRoot()
-        group_name = f"Date_Filtrate_{polygon_layer_name}"
-        new_group = root.addGroup(group_name)
-
-        for layer_name, original_layer in layers_to_filter.items():
-            geometry_type = QgsWkbTypes.displayString(original_layer.wkbType())
-            crs = original_layer.crs().authid()
-
-            # Create a temporary in-memory layer
-            new_layer = QgsVectorLayer(f"{geometry_type}?crs={crs}", layer_name, "memory")
-            new_layer_data = new_layer.dataProvider()
-            new_layer_data.addAttributes(original_layer.fields())
-            new_layer.updateFields()
-
-            # Filter features intersecting polygon_geom and add them to the temporary layer
-            matching_features = []
-            for feature in original_layer.getFeatures():
-                if feature.geometry() and feature.geometry().intersects(polygon_geom):
-                    matching_features.append(QgsFeature(feature))
-            new_layer_data.addFeatures(matching_features)
-            new_layer.updateExtents()
-
-            # Save the temporary layer to disk (GeoPackage)
-            output_path = os.path.join(base_dir, f"{layer_name}.gpkg")
-            QgsVectorFileWriter.writeAsVectorFormat(
-                new_layer, output_path, "UTF-8", original_layer.crs(), "GPKG"
-            )
-
-            # Load the saved layer as the permanent layer
-            permanent_layer = QgsVectorLayer(output_path, layer_name, "ogr")
-            QgsProject.instance().addMapLayer(permanent_layer, False)
-            new_group.addLayer(permanent_layer)
-            
-            if original_layer:
-                orig_renderer = original_layer.renderer()
-                if orig_renderer is not None:
-                    permanent_layer.setRenderer(orig_renderer.clone())
-                else:
-                    print(f"Warning: No renderer found for {layer_name}.")
+        # features go straight from the layers into the GeoPackages, every layer read once,
+        # in the background – the task only sees thread-safe copies of the layers and of the
+        # project's transform context
+        sources = {layer_name: DetachedLayer(layer) for layer_name, layer in layers.items()}
+        polygon_crs = polygon_layer.crs()
+        transform_context = QgsProject.instance().transformContext()
 
-                # Clone labeling if enabled and available
-                if original_layer.labelsEnabled() and original_layer.labeling() is not None:
-                    permanent_layer.setLabeling(original_layer.labeling().clone())
-                    permanent_layer.setLabelsEnabled(True)
-
-                permanent_layer.triggerRepaint()
-
-
-        QMessageBox.information(None, "Succes", "Layerele filtrate au fost salvate cu succes.")
+        def exported(result):
+            _counts, outputs = result
+            root = QgsProject.instance().layerTreeRoot()
+            for name, output in outputs.items():
+                new_group = root.addGroup(f"Date_Filtrate_{name or polygon_layer_name}")
+                for layer_name in SELECTION_LAYERS:
+                    load_output(output.uri(layer_name), layer_name, new_group, layers[layer_name])
+
+            QMessageBox.information(None, "Succes", "Layerele filtrate au fost salvate cu succes.")
+
+        self.run_export(
+            "Separare după poligon",
+            lambda task: export_selection(sources, polygons, base_dir, single_file, polygon_crs, feedback=task,
+                                          transform_context=transform_context),
+            exported,
+        )
 
 
     def complete_fields(self):
@@ -744,15 +759,93 @@ class DesenAssist:
         br = QgsProject.instance().mapLayersByName("BRANS_FIRI_GRPM_JT")[0]
         tr = QgsProject.instance().mapLayersByName("TRONSON_JT")[0]
         
-        self.update_nr_circuite(st, tr, br)
-        self.update_branch_fields(br)
-        self.update_prop_column(st)
-        self.update_tip_fund(st)
-        self.update_true_false_columns(st)
-        self.update_uzu_stp_prop_fo(st)
+        dry_run = self.ask_completion_mode()
+        if dry_run is None:
+            return
+
+        # read before anything is written, so a broken rules file leaves every layer as it was
+        rules = self.load_stalp_rules()
+        if rules is None:
+            return
+
+        # a failed BRANS_FIRI_GRPM_JT write stops here, so STALP_JT is not completed halfway
+        br_changes = self.update_branch_fields(br, dry_run)
+        if br_changes is None:
+            return
+        st_changes = self.update_stalp_fields(st, tr, br, rules, dry_run)
+        if st_changes is None:
+            return
+
+        if dry_run:
+            self.preview_field_changes({"BRANS_FIRI_GRPM_JT": (br, br_changes), "STALP_JT": (st, st_changes)})
+            return
         
         QMessageBox.information(None, "Completare campuri", "Campurile au fost completate cu succes.")
 
+    def load_stalp_rules(self):
+        """
+        Reads the STALP_JT rule tables (func/templates/stalp_fields.json) on every run, so edits to the file
+        apply without restarting QGIS. Returns None, after logging and showing the error, when the file is
+        missing or malformed.
+        """
+        try:
+            return StalpRules.load()
+        except (IOError, ValueError) as e:
+            QgsMessageLog.logMessage(f"Regulile STALP_JT nu au putut fi citite: {e}", "DesenAssist", level=Qgis.Critical)
+            QMessageBox.critical(None, "Completare campuri", f"Regulile STALP_JT nu au putut fi citite:\n{e}")
+            return None
+
+    def ask_completion_mode(self):
+        """
+        Asks whether "Completare câmpuri" writes the values or only previews them.
+        Returns True for the preview (dry run), None when the dialog is cancelled.
+        """
+        choices = ["Completează câmpurile", "Previzualizare (fără scriere)"]
+        choice, ok = QInputDialog.getItem(None, "Completare campuri", "Mod de lucru:", choices, 0, False)
+        if not ok:
+            return None
+        return choice == choices[1]
+
+    def preview_field_changes(self, changes_by_layer):
+        """
+        Dry run of "Completare câmpuri": shows how many features each field would change and adds the table
+        Previzualizare_completare (NUME_LAYER, FID, CAMP, VALOARE_ACTUALA, VALOARE_NOUA) to DE_VERIFICAT.
+        Nothing is written to the layers.
+        """
+        preview = QgsVectorLayer("None", "Previzualizare_completare", "memory")
+        dp = preview.dataProvider()
+        dp.addAttributes([
+            QgsField("NUME_LAYER", QVariant.String),
+            QgsField("FID", QVariant.Int),
+            QgsField("CAMP", QVariant.String),
+            QgsField("VALOARE_ACTUALA", QVariant.String),
+            QgsField("VALOARE_NOUA", QVariant.String),
+        ])
+        preview.updateFields()
+
+        summary = []
+        features = []
+        for layer_name, (layer, changes) in changes_by_layer.items():
+            counts, rows = self.helper.describe_attribute_changes(layer, changes)
+            if counts:
+                summary.append(f"{layer_name}: " + ", ".join(f"{name} {count}" for name, count in sorted(counts.items())))
+            for fid, name, current, value in rows:
+                feature = QgsFeature(preview.fields())
+                current = "" if self.helper.same_value(current, None) else str(current)
+                feature.setAttributes([layer_name, fid, name, current, str(value)])
+                features.append(feature)
+        dp.addFeatures(features)
+
+        if not features:
+            QMessageBox.information(None, "Previzualizare completare", "Toate campurile sunt deja completate corect - nu ar fi nimic de modificat.")
+            return
+
+        self.helper.add_layer_to_de_verificat(preview)
+        self.iface.showAttributeTable(preview)
+        QMessageBox.information(None, "Previzualizare completare",
+                                "Valori care s-ar modifica (nimic nu a fost scris):\n" + "\n".join(summary) +
+                                "\n\nDetaliile sunt în tabelul Previzualizare_completare.")
+
     def cut_bpmp(self):
         # Retrieve the layers
         br_layers = QgsProject.instance().mapLayersByName("BRANS_FIRI_GRPM_JT")
@@ -1355,177 +1448,30 @@ class DesenAssist:
             QMessageBox.information(None, "STALP_JT", "Toate coloanele specificate [UZURA_STP, NR_CIR_FO, NR_CIR_LTC, NR_CIR_CATV, NR_CONS_C2S, NR_CONS_C4S, NR_CONS_C2T, NR_CONS_C4T, NR_CONS_C2BR, NR_CONS_C4BR] conțin doar valori numerice.")
 
             
-    def update_true_false_columns(self, st):
-        columns_to_check = {
-            "NR_CIR_FO": "FIB_OPT",
-            "NR_CIR_LTC": "LTC",
-            "NR_CIR_CATV": "CATV",
-        }
-
-        layer = st
-
-        if not layer.isEditable():
-            layer.startEditing()
-
-        field_names = [field.name() for field in layer.fields()]
-
-        for feature in layer.getFeatures():
-            for key_field, bool_field in columns_to_check.items():
-                if key_field not in field_names or bool_field not in field_names:
-                    continue
-
-                key_value = feature[key_field]
-                is_completed = key_value not in config.NULL_VALUES
-
-                new_value = "Da" if is_completed else "Nu"
-
-                if feature[bool_field] != new_value:
-                    field_index = layer.fields().indexFromName(bool_field)
-                    layer.changeAttributeValue(feature.id(), field_index, new_value)
-
-        if not layer.commitChanges():
-            QMessageBox.critical(None, "FIB_OPT, LTC, CATV - STALP_JT", "Eroare la actualizarea coloanelor FIB_OPT, LTC, CATV.")
-        
-    def update_prop_column(self, st):
+    def update_stalp_fields(self, st, tr, br, rules, dry_run=False):
         """
-        Updates the PROP field in the 'STALP_JT' layer based on the DESC_CTG_MT_JT field.
-        If DESC_CTG_MT_JT is in the terti_codes list, PROP is set to 'TERTI';
-        if it's in the electrica_codes list, PROP is set to 'ELECTRICA'.
+        Completes every derived STALP_JT field - NR_CIR, PROP, TIP_FUND, FIB_OPT/LTC/CATV, PROP_FO, UZURA_STP -
+        in one pass over the poles with the StalpRules `rules` (see func/stalp_fields.py) and writes only the
+        values that change, in one bulk write.
+        With dry_run nothing is written. Returns the {fid: {field index: value}} changes, None on error.
         """
-        layer = st
-
-        if not layer.isEditable():
-            layer.startEditing()
-
-        terti_codes = [
-            'St. lemn tip SU', 'St. lemn tip SG', 'St. metalic rotund',
-            'St. octogonal zincat sustinere', 'St. octogonal zincat intindere'
-        ]
-        electrica_codes = [
-            'S 8 - U', 'S 9 - U', 'S 10 - U', 'S 10 - M', 'S 12 - M', 'S 10 - G',
-            'S 11 - G', 'S 12 - G', 'S 13 - G', 'S 14 - G', 'SE 1A', 'SE 2', 'SE 3',
-            'SE 4', 'SE 5', 'SE 6', 'SE 7', 'SE 8', 'SE 9', 'SE 10', 'SE 11',
-            'SC 10001', 'SC 10002', 'SC 10005', 'SC 15004', 'SC 15006', 'SC 15007',
-            'SC 15014-10.5', 'SC 15014', 'SI 9', 'SV 10001', 'SV 10002', 'Portal'
-        ]
-
-        for feature in layer.getFeatures():
-            desc_value = feature['DESC_CTG_MT_JT']
-            expected_prop = None
-
-            if desc_value in terti_codes:
-                expected_prop = 'TERTI'
-            elif desc_value in electrica_codes:
-                expected_prop = 'ELECTRICA'
-            else:
-                # If the description is not in any known list, skip updating.
-                continue
-
-            if feature['PROP'] not in [expected_prop, "TERTI + ELECTRICA(comodat)"]:
-                feature['PROP'] = expected_prop
-                layer.updateFeature(feature)
-
-        if not layer.commitChanges():
-            QMessageBox.critical(None, "PROP - STALP_JT", "Eroare la actualizarea coloanei PROP.")
-        
-    def update_tip_fund(self, st):
-        layer = st
-
-        if not layer.isEditable():
-            layer.startEditing()
-
-        turnata_codes = ["St. lemn tip SU", "Portal", "St. lemn tip SG", "SC 10001", "SC 10002", "SC 10005", "SC 15004", "SC 15006", "SC 15007", "SC 15014-10.5", "SC 15014", "St. metalic rotund", "SE 1A", "SV 10001", "SV 10002", "SE 8", "SE 9", "SE 10", "SE 11"]
-
-        for feature in layer.getFeatures():
-            desc_ctg_mt_jt = feature["DESC_CTG_MT_JT"]
-            
-            if desc_ctg_mt_jt:
-                if desc_ctg_mt_jt in turnata_codes:
-                    layer.changeAttributeValue(feature.id(), layer.fields().indexFromName("TIP_FUND"), "Turnata")
-                else:
-                    layer.changeAttributeValue(feature.id(), layer.fields().indexFromName("TIP_FUND"), "Burata")
-
-        if not layer.commitChanges():
-            QMessageBox.critical(None, "TIP_FUND - STALP_JT", "Eroare la actualizarea coloanei TIP_FUND.")
-            
-    def update_nr_circuite(self, st_layer, tr_layer, br_layer):
-        """
-        Updates STALP_JT.NR_CIR these rules:
-
-        • NR_CIR = # TRONSON_JT that touch the pole
-            › ignore branches entirely in this case.
-
-        • If no tronson touch but ≥1 branch does,
-            NR_CIR = 1  (constant).
-
-        • In either case, if pole.TIP_CIR contains 'IL' (case-insensitive) add +1.
-        """
-
-        # Build spatial indices once
-        tr_index = QgsSpatialIndex(tr_layer.getFeatures())
-        br_index = QgsSpatialIndex(br_layer.getFeatures())
-
-        # Field indexes on STALP_JT
-        idx_nr  = st_layer.fields().indexFromName("NR_CIR")
-        idx_tip = st_layer.fields().indexFromName("TIP_CIR")
-        if idx_nr == -1 or idx_tip == -1:
-            raise ValueError("STALP_JT is missing NR_CIR or TIP_CIR")
-
-        started_edit = False
-        if not st_layer.isEditable():
-            started_edit = st_layer.startEditing()
-            if not started_edit:
-                raise RuntimeError("Could not start editing STALP_JT")
-
         try:
-            for pole in st_layer.getFeatures():
-                geom_pole = pole.geometry()
-                tip_cir   = (pole[idx_tip] or "").upper()
-
-                # ---------- TRONSON: Get unique LINIA_JT ---------- 
-                tr_ids = tr_index.intersects(geom_pole.boundingBox())
-                tr_unique_names = set(
-                    tr_layer.getFeature(fid)[ 'LINIA_JT' ]
-                    for fid in tr_ids
-                    if tr_layer.getFeature(fid).geometry().intersects(geom_pole)
-                )
-                tr_cnt = len(tr_unique_names)
+            changes = stalp_field_changes(st, tr, br, config.NULL_VALUES, rules)
+            if not dry_run:
+                self.helper.write_attribute_changes(st, changes)
+        except (IOError, ValueError) as e:
+            QMessageBox.critical(None, "Completare campuri - STALP_JT", f"Eroare la actualizarea STALP_JT: {e}")
+            return None
+        return changes
 
-                # If at least one TRONSON touches, set NR_CIR to the number of unique LINIA_JT
-                if tr_cnt > 0:
-                    nr_cir = tr_cnt
-                else:
-                    # ---------- BRANS: Check if any branch touches ----------
-                    br_ids = br_index.intersects(geom_pole.boundingBox())
-                    has_branch = any(
-                        br_layer.getFeature(fid).geometry().intersects(geom_pole)
-                        for fid in br_ids
-                    )
-                    nr_cir = 1 if has_branch else 0
-
-                # -------- IL bump: Add +1 if TIP_CIR contains 'IL' --------
-                if "IL" in tip_cir:
-                    nr_cir += 1
-
-                # Set the NR_CIR field for the pole
-                pole[idx_nr] = nr_cir
-                st_layer.updateFeature(pole)
-
-        finally:
-            if started_edit:
-                if not st_layer.commitChanges():
-                    st_layer.rollBack()
-                    QMessageBox.critical(
-                        None, "NR_CIR - STALP_JT",
-                        "Eroare la actualizarea coloanei NR_CIR."
-                    )
-    
-    def update_branch_fields(self, br):
+    def update_branch_fields(self, br, dry_run=False):
         """
         Updates the TIP_BR field in the “BRANS_FIRI_GRPM_JT” layer based on TIP_FIRI_BR,
         validates the result against `links_cond`, and—if mismatches exist—creates a
         scratch layer called “corelare_gresita_conductor” containing only the offending
         features with fields fid, TIP_COND, TIP_BR.
+        Only the values that change are written, in one bulk write; with dry_run nothing is written
+        and nothing reported. Returns the {fid: {field index: value}} changes, None on error.
         """
         links_cond = {
             'ACBYCY 10/16': {'monofazat': ['FB1', 'BMPM', 'FDCS']},
@@ -1555,18 +1501,21 @@ class DesenAssist:
         fdcp_tip_cond_trifazat = ['TYIR 3X25Al + 16Al', 'ACBYCY 16/16']
 
         layer = br
-        if not layer.isEditable():
-            layer.startEditing()
+        idx_tip_br = layer.fields().indexFromName('TIP_BR')
+        idx_lim_prop = layer.fields().indexFromName('LIM_PROP')
+        same_value = self.helper.same_value
 
         vague = False
         wrong_features = []      # store ids only
+        changes = {}
 
         for feature in layer.getFeatures():
             code      = feature['TIP_FIRI_BR']
             tip_cond  = feature['TIP_COND']
+            changed   = {}
 
-            if code in ['FB1', 'FB3']:
-                feature['LIM_PROP'] = 'interior'
+            if code in ['FB1', 'FB3'] and not same_value(feature['LIM_PROP'], 'interior'):
+                changed[idx_lim_prop] = 'interior'
 
             # Decide TIP_BR
             if code in code_to_branch:
@@ -1581,8 +1530,10 @@ class DesenAssist:
             if code == 'FDCS' and tip_cond.upper() == 'ACYABY 4X16':
                 vague = True
 
-            feature['TIP_BR'] = branch_value
-            layer.updateFeature(feature)
+            if not same_value(feature['TIP_BR'], branch_value):
+                changed[idx_tip_br] = branch_value
+            if changed:
+                changes[feature.id()] = changed
 
             # Validate against links_cond
             for link, branches_dict in links_cond.items():
@@ -1592,10 +1543,15 @@ class DesenAssist:
                         if code not in valid_codes:
                             wrong_features.append(feature.id())
 
-        if not layer.commitChanges():
+        if dry_run:
+            return changes
+
+        try:
+            self.helper.write_attribute_changes(layer, changes)
+        except IOError:
             QMessageBox.critical(None, 'TIP_BR - BRANS_FIRI_GRPM_JT',
                                 'Eroare la actualizarea campului TIP_BR.')
-            return
+            return None
 
         if vague:
             QMessageBox.critical(
@@ -1653,29 +1609,8 @@ class DesenAssist:
                 f'⚠️ Au fost găsite neconcordanțe TIP_COND - TIP_FIRI_BR - TIP_BR\n'
                 'Verifică stratul “Corelare_gresita_conductor”.'
             )
-            
-    def update_uzu_stp_prop_fo(self, st):
-        layer = st
-        
-        if not layer.isEditable():
-            layer.startEditing()
-            
-        field_names = [field.name() for field in layer.fields()]
-        
-        for feature in layer.getFeatures():
-            if "NR_CIR_FO" in field_names and "PROP_FO" in field_names:
-                nr_cir_fo = feature["NR_CIR_FO"]
-                prop_fo = feature["PROP_FO"]
-                if nr_cir_fo not in config.NULL_VALUES and prop_fo in config.NULL_VALUES:
-                    layer.changeAttributeValue(feature.id(), layer.fields().indexFromName("PROP_FO"), "SC RCS&RDS S.A")
-            
-            if "UZURA_STP" in field_names:
-                uzura_stp = feature["UZURA_STP"]
-                if uzura_stp in config.NULL_VALUES:
-                    layer.changeAttributeValue(feature.id(), layer.fields().indexFromName("UZURA_STP"), 5)
-                    
-        if not layer.commitChanges():
-            QMessageBox.critical(None, "UZURA_STP si PROP_FO - STALP_JT", "Eroare la actualizarea coloanelor UZURA_STP si PROP_FO.")
+
+        return changes
             
     def verify_streets(self):
         self.process_layers(self.layers)
@@ -1794,15 +1729,32 @@ class DesenAssist:
         
         '''
         try:
-            verifier = VectorVerifier(self.iface)
-            verifier.verify()        # run the whole check
-            QMessageBox.information(
-                None, "Verificare vectorială",
-                "Verificarea vectorială a fost finalizată cu succes!"
-            )
-            
+            if self.verifier is not None and self.verifier.is_running():
+                self.iface.messageBar().pushWarning("Verificare vectorială", "Verificarea vectorială rulează deja.")
+                return
+
+            # kept between runs – a re-check after a few edits only re-evaluates those
+            if self.verifier is None:
+                self.verifier = VectorVerifier(self.iface)
+            # the rules run in a background task – the result comes back in on_vector_verified
+            # with a base folder chosen, the per-rule timing report is saved there as JSON when
+            # asked for in the options dialog; unchanged data reuses the errors cached in the
+            # QGIS profile, so nothing lands in the deliverables folder unasked
+            base_dir = getattr(self, "base_dir", None)
+            self.verifier.verify(on_finished=self.on_vector_verified,
+                                 report_dir=base_dir, cache_dir=ResultCache.default_directory())
+
         except Exception as e:
             # surfaces any missing fields, layer-name typos, etc.
             self.iface.messageBar().pushCritical("Verificare vectorială", str(e))
 
-        pass
\ No newline at end of file
+    def on_vector_verified(self, ok, exception):
+        if ok:
+            QMessageBox.information(
+                None, "Verificare vectorială",
+                "Verificarea vectorială a fost finalizată cu succes!"
+            )
+        elif exception is not None:
+            self.iface.messageBar().pushCritical("Verificare vectorială", str(exception))
+        else:
+            self.iface.messageBar().pushWarning("Verificare vectorială", "Verificarea vectorială a fost anulată.")
\ No newline at end of file
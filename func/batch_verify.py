@@ -0,0 +1,198 @@
+"""Headless VectorVerifier run over contractor GeoPackage deliveries.
+
+Every input GeoPackage must contain the STALP_JT, BRANS_FIRI_GRPM_JT and
+TRONSON_JT tables; the errors are written to ``<name>_erori.gpkg`` (layers
+*erori_stalp* and *erori_brans_tronson*).  Run it with the Python of a QGIS
+install, from the directory that holds the plugin::
+
+    python -m desen_assist.func.batch_verify livrari/ -o rezultate/ --denum "LES 1" -j 4
+
+Set QGIS_PREFIX_PATH when QGIS is not installed under /usr.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from qgis.core import ( # type: ignore
+    QgsApplication,
+    QgsProject,
+    QgsVectorFileWriter,
+    QgsVectorLayer,
+)
+
+from .vector_verifier import VectorVerifier
+
+
+SOURCE_LAYERS = ("STALP_JT", "BRANS_FIRI_GRPM_JT", "TRONSON_JT")
+OUTPUT_SUFFIX = "_erori.gpkg"
+
+_qgs = None
+
+
+def init_qgis() -> QgsApplication:
+    """Starts QGIS without a GUI, once per process."""
+    global _qgs
+    if _qgs is None:
+        QgsApplication.setPrefixPath(os.environ.get("QGIS_PREFIX_PATH", "/usr"), True)
+        _qgs = QgsApplication([], False)
+        _qgs.initQgis()
+    return _qgs
+
+
+def collect_inputs(paths) -> list:
+    """GeoPackages named on the command line or found directly in a directory.
+
+    Our own ``*_erori.gpkg`` outputs are skipped so a directory can be re-run.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            found.extend(os.path.join(path, n) for n in names
+                         if n.lower().endswith(".gpkg") and not n.endswith(OUTPUT_SUFFIX))
+        else:
+            found.append(path)
+    return found
+
+
+def output_path(gpkg: str, output_dir: str | None = None) -> str:
+    stem = os.path.splitext(os.path.basename(gpkg))[0]
+    return os.path.join(output_dir or os.path.dirname(gpkg), stem + OUTPUT_SUFFIX)
+
+
+def _check_denum(gpkg: str, denum: str) -> None:
+    linie = QgsVectorLayer(f"{gpkg}|layername=LINIE_JT", "LINIE_JT", "ogr")
+    if not linie.isValid():
+        return                          # nothing to check against
+    values = {str(f["DENUM"]).strip() for f in linie.getFeatures()}
+    if str(denum).strip() not in values:
+        raise ValueError(f"DENUM ‘{denum}’ nu există în LINIE_JT")
+
+
+def write_gpkg(layers, path: str) -> None:
+    """Writes *layers* as tables of a single, freshly created GeoPackage."""
+    if os.path.exists(path):
+        os.remove(path)
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = "GPKG"
+    options.fileEncoding = "UTF-8"
+    for layer in layers:
+        options.layerName = layer.name()
+        result = QgsVectorFileWriter.writeAsVectorFormatV3(
+            layer, path, QgsProject.instance().transformContext(), options
+        )
+        if result[0] != QgsVectorFileWriter.NoError:
+            raise IOError(f"Nu s-a putut scrie {layer.name()} în {path}: {result[1]}")
+        options.actionOnExistingFile = QgsVectorFileWriter.CreateOrOverwriteLayer
+
+
+def verify_gpkg(gpkg: str, output: str, denum: str | None = None,
+                tolerance: float | None = None, report_dir: str | None = None,
+                rules=None) -> dict:
+    """Runs the VectorVerifier *rules* (numbers, all when None) on *gpkg* and
+    writes the errors to *output*.
+
+    With *report_dir* the per-rule timing report is saved there as JSON.
+
+    Returns ``{error layer name: feature count}``.
+    """
+    project = QgsProject.instance()
+    project.removeAllMapLayers()
+    try:
+        for name in SOURCE_LAYERS:
+            layer = QgsVectorLayer(f"{gpkg}|layername={name}", name, "ogr")
+            if not layer.isValid():
+                raise ValueError(f"Layer ‘{name}’ not found in {gpkg}")
+            project.addMapLayer(layer, False)
+        if denum is not None:
+            _check_denum(gpkg, denum)
+
+        verifier = VectorVerifier(None)
+        verifier.prepare(*SOURCE_LAYERS, tolerance=tolerance, linia_jt_val=denum,
+                         report_dir=report_dir, rules=rules)
+        verifier.run()
+        layers = verifier.build_error_layers()
+        write_gpkg(layers, output)
+        return {layer.name(): layer.featureCount() for layer in layers}
+    finally:
+        project.removeAllMapLayers()
+
+
+def _verify_one(job: tuple) -> tuple:
+    """Pool worker: never raises, so one bad delivery does not stop the batch."""
+    gpkg, output, denum, tolerance, stats, rules = job
+    init_qgis()
+    try:
+        report_dir = os.path.dirname(output) if stats else None
+        counts = verify_gpkg(gpkg, output, denum, tolerance, report_dir, rules)
+        return gpkg, output, counts, None
+    except Exception as e:
+        return gpkg, output, None, str(e)
+
+
+def _rule_numbers(text: str) -> list:
+    try:
+        rules = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"listă de reguli invalidă: {text}")
+    if not rules or not all(1 <= n <= len(VectorVerifier.RULES) for n in rules):
+        raise argparse.ArgumentTypeError(f"regulile sunt numerotate 1–{len(VectorVerifier.RULES)}")
+    return rules
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="batch_verify",
+        description="Verificare vectorială fără interfață pentru livrări GeoPackage.",
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="fișiere .gpkg sau directoare care le conțin")
+    parser.add_argument("-o", "--output-dir",
+                        help="directorul rezultatelor (implicit lângă fiecare intrare)")
+    parser.add_argument("--denum",
+                        help="DENUM din LINIE_JT pentru regula 7 (implicit toate liniile)")
+    parser.add_argument("--tolerance", type=float,
+                        help="toleranța de snapping în unitățile stratului (implicit 0.01)")
+    parser.add_argument("--rules", type=_rule_numbers,
+                        help="regulile rulate, de ex. 2,3 (implicit toate)")
+    parser.add_argument("--stats", action="store_true",
+                        help="salvează statisticile pe reguli (JSON) lângă rezultate")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="numărul de procese paralele")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        parser.error("nu a fost găsit niciun fișier .gpkg")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    jobs = [(gpkg, output_path(gpkg, args.output_dir), args.denum, args.tolerance,
+             args.stats, args.rules)
+            for gpkg in inputs]
+
+    if args.jobs > 1 and len(jobs) > 1:
+        # spawn: every worker starts its own QgsApplication from scratch
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.jobs, mp_context=context) as pool:
+            results = list(pool.map(_verify_one, jobs))
+    else:
+        results = [_verify_one(job) for job in jobs]
+
+    failed = 0
+    for gpkg, output, counts, error in results:
+        if error is not None:
+            failed += 1
+            print(f"EROARE  {gpkg}: {error}", file=sys.stderr)
+        else:
+            summary = ", ".join(f"{name}: {n}" for name, n in counts.items())
+            print(f"OK      {gpkg} -> {output} ({summary})")
+
+    if _qgs is not None:
+        _qgs.exitQgis()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
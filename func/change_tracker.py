@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+
+class ChangeTracker:
+    """Collects the ids of features edited on a set of layers between two runs.
+
+    Listens to the edit-buffer signals (add / delete / geometry / attribute) and to
+    ``committedFeaturesAdded`` so features keep being tracked after their temporary
+    negative id is replaced on commit.  If a watched layer goes away the tracker
+    becomes *invalid* and the caller should fall back to a full run.
+    """
+
+    def __init__(self):
+        self._dirty = defaultdict(set)
+        self._watched = {}                  # layer id -> (name, layer, [(signal, slot)])
+        self.valid = True
+
+    # ------------------------------------------------------------------
+    #  Watching
+    # ------------------------------------------------------------------
+    def watch(self, name: str, layer) -> None:
+        if layer.id() in self._watched:
+            return
+
+        def mark(fid, *_):
+            self._dirty[name].add(fid)
+
+        def mark_committed(_layer_id, features):
+            self._dirty[name].update(f.id() for f in features)
+
+        def gone(*_):
+            self.valid = False
+
+        connections = [
+            (layer.featureAdded, mark),
+            (layer.featureDeleted, mark),
+            (layer.geometryChanged, mark),
+            (layer.attributeValueChanged, mark),
+            (layer.committedFeaturesAdded, mark_committed),
+            (layer.willBeDeleted, gone),
+        ]
+        for signal, slot in connections:
+            signal.connect(slot)
+        self._watched[layer.id()] = (name, layer, connections)
+
+    def unwatch_all(self) -> None:
+        for _name, _layer, connections in self._watched.values():
+            for signal, slot in connections:
+                try:
+                    signal.disconnect(slot)
+                except (TypeError, RuntimeError):
+                    pass                    # layer already deleted
+        self._watched.clear()
+
+    # ------------------------------------------------------------------
+    #  Reading
+    # ------------------------------------------------------------------
+    def take(self) -> dict:
+        """Returns ``{layer name: {fid, …}}`` collected so far and starts over."""
+        dirty = {name: set(fids) for name, fids in self._dirty.items()}
+        self._dirty.clear()
+        return dirty
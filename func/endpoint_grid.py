@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+
+class EndpointGrid:
+    """Hash grid for points (usually line endpoints) with cells the size of the tolerance.
+
+    Two points closer than *tol* always fall in the same or in neighbouring cells,
+    so a look-up only has to scan the 3 × 3 block around the query point instead of
+    every stored point.
+
+    Every stored entry is ``(x, y, owner)``; *owner* is whatever the caller wants
+    back – for line endpoints ``(fid, end)`` with ``end`` 0 for start, 1 for end.
+    ``degree(entry)`` tells how many stored points (the entry included) lie within
+    *tol* of it, so an endpoint of degree 1 is a terminal / dangling one.
+    """
+
+    def __init__(self, tol: float):
+        if tol <= 0:
+            raise ValueError("EndpointGrid needs a strictly positive tolerance")
+        self.tol = tol
+        self._tol2 = tol * tol
+        self._cells = defaultdict(list)
+        self._degree = None
+        self.queries = 0                    # look-ups, for the run statistics
+
+    def _cell(self, x: float, y: float):
+        return (int(x // self.tol), int(y // self.tol))
+
+    def add(self, x: float, y: float, owner) -> None:
+        self._cells[self._cell(x, y)].append((x, y, owner))
+        self._degree = None
+
+    def add_line_ends(self, fid, ends) -> None:
+        """Store both ends of a line; *ends* is a (start, end) pair of QgsPointXY-likes."""
+        for i, p in enumerate(ends):
+            self.add(p.x(), p.y(), (fid, i))
+
+    def near(self, x: float, y: float) -> list:
+        """All entries within the tolerance of (x, y)."""
+        self.queries += 1
+        cx, cy = self._cell(x, y)
+        hits = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for entry in self._cells.get((cx + dx, cy + dy), ()):
+                    ex, ey, _ = entry
+                    if (ex - x) ** 2 + (ey - y) ** 2 <= self._tol2:
+                        hits.append(entry)
+        return hits
+
+    def has_near(self, x: float, y: float) -> bool:
+        self.queries += 1
+        cx, cy = self._cell(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for ex, ey, _ in self._cells.get((cx + dx, cy + dy), ()):
+                    if (ex - x) ** 2 + (ey - y) ** 2 <= self._tol2:
+                        return True
+        return False
+
+    def degree(self, entry) -> int:
+        if self._degree is None:
+            self._degree = {
+                id(e): len(self.near(e[0], e[1]))
+                for cell in self._cells.values() for e in cell
+            }
+        return self._degree[id(entry)]
+
+    def terminal_near(self, x: float, y: float) -> list:
+        """Entries of degree 1 (not shared with any other point) within the tolerance of (x, y)."""
+        return [e for e in self.near(x, y) if self.degree(e) == 1]
@@ -0,0 +1,70 @@
+from collections import namedtuple
+
+from qgis.core import QgsFeature, QgsMessageLog, Qgis # type: ignore
+
+
+# One verifier error as a plain tuple.  *source* is the (layer name, fid) whose
+# evaluation first produced it; ErrorSink.sources() has all of them.
+ErrorRecord = namedtuple("ErrorRecord", "source geom layer_name fid tip det")
+
+
+class ErrorSink:
+    """Collects VectorVerifier errors and writes them in bulk.
+
+    Records are kept as compact tuples, one ordered dict per error layer kind
+    ("point" / "line") keyed on (NUME_LAYER, FID, TIP_EROARE), so the same error
+    reported twice is stored once.  Every source that reported it is kept with the
+    entry: on an incremental run the error only goes away once none of them
+    reports it any more.  ``write()`` turns them into features and hands them to
+    the provider with a single ``addFeatures`` call – no edit buffer.
+    """
+
+    KINDS = ("point", "line")
+
+    def __init__(self):
+        self._records = {kind: {} for kind in self.KINDS}
+        self._sources = {kind: {} for kind in self.KINDS}     # key -> {source, …}
+
+    @staticmethod
+    def key(record: ErrorRecord) -> tuple:
+        return (record.layer_name, record.fid, record.tip)
+
+    def add(self, kind: str, source, geom, layer_name: str, fid: int, tip: str, det: str) -> None:
+        record = ErrorRecord(source, geom, layer_name, fid, tip, det)
+        key = self.key(record)
+        self._records[kind].setdefault(key, record)
+        self._sources[kind].setdefault(key, set()).add(source)
+
+    def records(self, kind: str) -> list:
+        return list(self._records[kind].values())
+
+    def sources(self, kind: str, key: tuple) -> frozenset:
+        """Every (layer name, fid) that reported the *kind* error with *key*."""
+        return frozenset(self._sources[kind].get(key, ()))
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._records.values())
+
+    def write(self, layer, kind: str, skip=()) -> list:
+        """Adds every *kind* record whose key is not in *skip* to *layer*.
+
+        Returns ``[(error layer fid, record), …]`` for the features written.
+        """
+        fields = layer.fields()
+        records = [r for k, r in self._records[kind].items() if k not in skip]
+        features = []
+        for r in records:
+            f = QgsFeature(fields)
+            f.setGeometry(r.geom)
+            f.setAttributes([r.layer_name, r.fid, r.tip, r.det])
+            features.append(f)
+
+        ok, added = layer.dataProvider().addFeatures(features)
+        if not ok:
+            QgsMessageLog.logMessage(
+                f"Failed to add {len(features)} error features to {layer.name()}",
+                "DesenAssist",
+                level=Qgis.Critical
+            )
+            return []
+        return [(f.id(), r) for f, r in zip(added, records)]
@@ -1,7 +1,7 @@
 import os
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
-from qgis.core import QgsVectorLayer, QgsProject, QgsMessageLog, Qgis # type: ignore
+from qgis.core import NULL, QgsFeatureRequest, QgsVectorLayer, QgsProject, QgsMessageLog, Qgis # type: ignore
 
 
 class HelperBase:
@@ -97,6 +97,62 @@ class HelperBase:
             QgsMessageLog.logMessage(f"Error processing and adding output: {e}", "DesenAssist", level=Qgis.Critical)
             return False
 
+# MARK: ATTRIBUTES
+    @staticmethod
+    def same_value(current, target):
+        """
+        Compares an attribute value with the one about to be written, the way they end up stored:
+        NULL and None are the same, and so are 100 and "100". Whitespace counts, so "Da " is rewritten as "Da".
+        """
+        current_null = current is None or current == NULL
+        target_null = target is None or target == NULL
+        if current_null or target_null:
+            return current_null and target_null
+        return current == target or str(current) == str(target)
+
+    def write_attribute_changes(self, layer, changes):
+        """
+        Writes {fid: {field index: value}} to layer in bulk and returns the number of features changed.
+        Without an open edit session it is a single dataProvider().changeAttributeValues call: no edit buffer, no commit.
+        A layer the user is editing gets the values in its edit buffer, as one undoable command, and stays in edit mode.
+        """
+        if not changes:
+            return 0
+
+        if layer.isEditable():
+            layer.beginEditCommand("Actualizare atribute")
+            for fid, attributes in changes.items():
+                layer.changeAttributeValues(fid, attributes)
+            layer.endEditCommand()
+        else:
+            if not layer.dataProvider().changeAttributeValues(changes):
+                raise IOError(f"Nu s-au putut actualiza atributele în {layer.name()}: "
+                              f"{'; '.join(layer.dataProvider().errors())}")
+            layer.triggerRepaint()
+        return len(changes)
+
+    def describe_attribute_changes(self, layer, changes):
+        """
+        Dry run of write_attribute_changes: nothing is written.
+        Returns ({field name: features changed}, [(fid, field name, current value, new value), ...]),
+        the current values read back in a single request.
+        """
+        fields = layer.fields()
+        counts = {}
+        rows = []
+        if not changes:
+            return counts, rows
+
+        indexes = sorted({idx for attributes in changes.values() for idx in attributes})
+        request = QgsFeatureRequest().setFilterFids(list(changes)).setSubsetOfAttributes(indexes)
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        for feature in layer.getFeatures(request):
+            for idx, value in sorted(changes[feature.id()].items()):
+                name = fields.at(idx).name()
+                counts[name] = counts.get(name, 0) + 1
+                rows.append((feature.id(), name, feature[idx], value))
+        return counts, rows
+
 # MARK: PARSERS
     def save_xml(self, xml_name, name, xml_file):
         root = ET.Element(xml_name) 
@@ -0,0 +1,295 @@
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from qgis.core import ( # type: ignore
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest,
+    QgsFields,
+    QgsRectangle,
+    QgsVectorLayerFeatureSource,
+)
+
+from .endpoint_grid import EndpointGrid
+from .segment_engine import SegmentDistanceEngine
+
+
+# Snapping tolerance in layer units when none is given – ≈ 1 cm in a metric CRS.
+# Shared by the verification rules and the ID_BDI join of the export.
+DEFAULT_TOLERANCE = 0.01
+
+# One record per feature – only what the verification rules actually read.
+PoleRecord = namedtuple("PoleRecord", "fid geom point attrs")
+LineRecord = namedtuple("LineRecord", "fid geom parts vertices ends attrs")
+# A pole touching a line: at one of its vertices and/or at one of its two ends.
+Touch = namedtuple("Touch", "fid at_vertex at_endpoint")
+
+
+class ContactTable(defaultdict):
+    """``defaultdict(list)`` that counts its ``get()`` look-ups for the run statistics."""
+
+    def __init__(self):
+        super().__init__(list)
+        self.lookups = 0
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        return super().get(key, default)
+
+
+class DetachedLayer:
+    """Thread-safe stand-in for a QgsVectorLayer: a frozen feature source and its fields.
+
+    Create it on the main thread; ``getFeatures()`` can then be called from a
+    QgsTask without touching the layer itself.
+    """
+
+    def __init__(self, layer):
+        self._source = QgsVectorLayerFeatureSource(layer)
+        self._fields = QgsFields(layer.fields())
+        self._wkb_type = layer.wkbType()
+        self._crs = QgsCoordinateReferenceSystem(layer.crs())
+        self._name = layer.name()
+
+    def fields(self) -> QgsFields:
+        return self._fields
+
+    def wkbType(self):
+        return self._wkb_type
+
+    def crs(self) -> QgsCoordinateReferenceSystem:
+        return self._crs
+
+    def name(self) -> str:
+        return self._name
+
+    def getFeatures(self, request=None):
+        return self._source.getFeatures(request if request is not None else QgsFeatureRequest())
+
+
+class NetworkSnapshot:
+    """Read-once, in-memory copy of STALP_JT, BRANS_FIRI_GRPM_JT and TRONSON_JT.
+
+    Every layer is read with a single provider pass that fetches the geometry plus
+    the handful of fields the rules need, so the rules never have to go back to
+    the data provider; contacts are found in memory (build_adjacency /
+    build_endpoint_grids), not through spatial indexes.
+
+        • poles   – {fid: PoleRecord}
+        • brans   – {fid: LineRecord}
+        • tronson – {fid: LineRecord}
+
+    After ``build_adjacency(tol)`` the pole ↔ line contacts are available as
+        • pole_tronson / pole_brans – {pole fid: [Touch(line fid, …)]}
+        • tronson_poles / brans_poles – {line fid: [Touch(pole fid, …)]}
+
+    and ``build_endpoint_grids(tol)`` hashes the poles and the BRANS endpoints into
+    tolerance-sized cells (pole_grid, brans_ends) – the only grids a rule reads.
+
+    With a *rect* only the features meeting it are read (``setFilterRect``), so the
+    records cover just that area – see ``reach()``.
+
+    ``refresh()`` re-reads just the features edited since, so a re-check does not
+    go back to the provider for the whole network.
+    """
+
+    STALP_FIELDS = ("DENUM", "TIP_CIR", "TIP_LEG_JT")
+    BRANS_FIELDS = ("TIP_COND", "TIP_FIRI_BR")
+    TRONSON_FIELDS = ("TIP_COND", "LINIA_JT")
+
+    def __init__(self, stalp_layer, brans_layer, tronson_layer, rect: QgsRectangle | None = None):
+        # layers or DetachedLayer copies – only fields() and getFeatures() are used
+        self.rect = rect
+        self.features_read = 0
+
+        self.poles = self._load_poles(stalp_layer)
+        self.brans = self._load_lines(brans_layer, self.BRANS_FIELDS)
+        self.tronson = self._load_lines(tronson_layer, self.TRONSON_FIELDS)
+
+        self.pole_tronson = ContactTable()
+        self.pole_brans = ContactTable()
+        self.tronson_poles = ContactTable()
+        self.brans_poles = ContactTable()
+
+        self.pole_grid = None
+        self.brans_ends = None
+
+    # ------------------------------------------------------------------
+    #  Loading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def reach(layers, rect: QgsRectangle, tol: float) -> QgsRectangle:
+        """Area to load so every feature meeting *rect* has all its contacts.
+
+        Features within *tol* of *rect* may end anywhere; anything touching them
+        lies within *tol* of their bounding boxes.  One cheap pass without
+        attributes measures that extent.
+        """
+        request = QgsFeatureRequest().setFilterRect(rect.buffered(tol)).setNoAttributes()
+        extent = QgsRectangle(rect)
+        for layer in layers:
+            for f in layer.getFeatures(QgsFeatureRequest(request)):
+                if f.hasGeometry():
+                    extent.combineExtentWith(f.geometry().boundingBox())
+        return extent.buffered(tol)
+
+    def _request(self, layer, names, fids=None):
+        present = [n for n in names if layer.fields().indexFromName(n) != -1]
+        request = QgsFeatureRequest().setSubsetOfAttributes(present, layer.fields())
+        if self.rect is not None:
+            request.setFilterRect(self.rect)
+        if fids is not None:
+            request.setFilterFids(list(fids))
+        return request, present
+
+    def within(self, rect: QgsRectangle) -> dict:
+        """``{layer name: {fid, …}}`` of the loaded poles inside *rect* and lines whose
+        bounding box meets it."""
+        return {
+            "STALP_JT": {p.fid for p in self.poles.values() if rect.contains(p.point)},
+            "BRANS_FIRI_GRPM_JT": {l.fid for l in self.brans.values()
+                                   if l.geom.boundingBox().intersects(rect)},
+            "TRONSON_JT": {l.fid for l in self.tronson.values()
+                           if l.geom.boundingBox().intersects(rect)},
+        }
+
+    @staticmethod
+    def _attrs(feat, names, present):
+        return {n: (feat[n] if n in present else None) for n in names}
+
+    def _load_poles(self, layer, fids=None):
+        request, present = self._request(layer, self.STALP_FIELDS, fids)
+        poles = {}
+        for f in layer.getFeatures(request):
+            self.features_read += 1
+            geom = f.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            poles[f.id()] = PoleRecord(
+                f.id(), geom, geom.asPoint(), self._attrs(f, self.STALP_FIELDS, present))
+        return poles
+
+    def _load_lines(self, layer, names, fids=None):
+        request, present = self._request(layer, names, fids)
+        lines = {}
+        for f in layer.getFeatures(request):
+            self.features_read += 1
+            geom = f.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            if geom.isMultipart():
+                parts = [part for part in geom.asMultiPolyline() if part]
+            else:
+                parts = [geom.asPolyline()]
+            vertices = [v for part in parts for v in part]
+            if not vertices:
+                continue
+            lines[f.id()] = LineRecord(
+                f.id(), geom, parts, vertices, (vertices[0], vertices[-1]),
+                self._attrs(f, names, present))
+        return lines
+
+    def refresh(self, stalp_layer, brans_layer, tronson_layer, dirty: dict) -> None:
+        """Re-reads the *dirty* features – ``{layer name: {fid, …}}`` – of a whole-layer snapshot.
+
+        Deleted features drop out, edited ones are read again and added ones come
+        in; every other feature is left as it was.  The contacts have to be rebuilt afterwards (``build_adjacency`` /
+        ``build_endpoint_grids``), which works on memory only.
+        """
+        if self.rect is not None:
+            raise ValueError("Only a snapshot of whole layers can be refreshed")
+        self.features_read = 0
+        for name, layer, records, load in (
+                ("STALP_JT", stalp_layer, self.poles, self._load_poles),
+                ("BRANS_FIRI_GRPM_JT", brans_layer, self.brans,
+                 lambda l, f: self._load_lines(l, self.BRANS_FIELDS, f)),
+                ("TRONSON_JT", tronson_layer, self.tronson,
+                 lambda l, f: self._load_lines(l, self.TRONSON_FIELDS, f))):
+            fids = set(dirty.get(name, ()))
+            if not fids:
+                continue
+            for fid in fids:
+                records.pop(fid, None)
+            records.update(load(layer, fids))
+
+    # ------------------------------------------------------------------
+    #  Pole ↔ line adjacency
+    # ------------------------------------------------------------------
+    def build_adjacency(self, tol: float) -> None:
+        """Spatial join of every pole against every line within *tol*.
+
+        Pole coordinates and line segments are matched in bulk by the NumPy
+        ``SegmentDistanceEngine`` – no per-pole index query or GEOS call.
+        """
+        engine = SegmentDistanceEngine(tol)
+        pole_ids = list(self.poles)
+        pts = np.array([(p.point.x(), p.point.y()) for p in self.poles.values()],
+                       dtype=float).reshape(-1, 2)
+        self._join(engine, pole_ids, pts, self.tronson, self.pole_tronson, self.tronson_poles)
+        self._join(engine, pole_ids, pts, self.brans, self.pole_brans, self.brans_poles)
+
+    @staticmethod
+    def _segments(lines):
+        """(S, 4) segment array plus owner fid and first/last flags per segment."""
+        rows, owner, first, last = [], [], [], []
+        for line in lines.values():
+            nparts = len(line.parts)
+            for k, part in enumerate(line.parts):
+                if len(part) == 1:                  # degenerate part – keep it as a point
+                    part = [part[0], part[0]]
+                nseg = len(part) - 1
+                for i in range(nseg):
+                    a, b = part[i], part[i + 1]
+                    rows.append((a.x(), a.y(), b.x(), b.y()))
+                    owner.append(line.fid)
+                    first.append(k == 0 and i == 0)
+                    last.append(k == nparts - 1 and i == nseg - 1)
+        return np.array(rows, dtype=float).reshape(-1, 4), owner, first, last
+
+    def _join(self, engine, pole_ids, pts, lines, by_pole, by_line):
+        by_pole.clear()
+        by_line.clear()
+        seg, owner, first, last = self._segments(lines)
+        pt_idx, seg_idx, near_start, near_end = engine.match(pts, seg)
+
+        contacts = {}                               # (pole fid, line fid) -> (at_vertex, at_endpoint)
+        for pi, si, ns, ne in zip(pt_idx.tolist(), seg_idx.tolist(),
+                                  near_start.tolist(), near_end.tolist()):
+            key = (pole_ids[pi], owner[si])
+            at_vertex = ns or ne
+            at_endpoint = (ns and first[si]) or (ne and last[si])
+            prev_vertex, prev_endpoint = contacts.get(key, (False, False))
+            contacts[key] = (prev_vertex or at_vertex, prev_endpoint or at_endpoint)
+
+        for (pid, lid), (at_vertex, at_endpoint) in contacts.items():
+            by_pole[pid].append(Touch(lid, at_vertex, at_endpoint))
+            by_line[lid].append(Touch(pid, at_vertex, at_endpoint))
+
+        # deterministic order – rules sometimes report "the first" hit
+        for touches in by_pole.values():
+            touches.sort()
+        for touches in by_line.values():
+            touches.sort()
+
+    # ------------------------------------------------------------------
+    #  Endpoint grids
+    # ------------------------------------------------------------------
+    def build_endpoint_grids(self, tol: float) -> None:
+        """Tolerance-sized hash grids for poles and for the ends of every BRANS line."""
+        self.pole_grid = EndpointGrid(tol)
+        for pole in self.poles.values():
+            self.pole_grid.add(pole.point.x(), pole.point.y(), pole.fid)
+
+        self.brans_ends = EndpointGrid(tol)
+        for line in self.brans.values():
+            self.brans_ends.add_line_ends(line.fid, line.ends)
+
+    # ------------------------------------------------------------------
+    #  Statistics
+    # ------------------------------------------------------------------
+    def lookups(self) -> int:
+        """Adjacency and grid look-ups made so far – the rules' spatial queries."""
+        tables = (self.pole_tronson, self.pole_brans, self.tronson_poles, self.brans_poles)
+        grids = (self.pole_grid, self.brans_ends)
+        return (sum(t.lookups for t in tables)
+                + sum(g.queries for g in grids if g is not None))
@@ -0,0 +1,634 @@
+import os
+import re
+import sqlite3
+from collections import Counter, defaultdict
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+from osgeo import ogr, osr # type: ignore
+from qgis.core import ( # type: ignore
+    NULL,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransform,
+    QgsCoordinateTransformContext,
+    QgsExpression,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsMessageLog,
+    QgsProject,
+    QgsProviderRegistry,
+    QgsRectangle,
+    QgsSpatialIndex,
+    QgsTask,
+    QgsVectorDataProvider,
+    QgsVectorFileWriter,
+    QgsVectorLayer,
+    QgsWkbTypes,
+    Qgis,
+)
+from qgis.PyQt.QtCore import QDate, QDateTime, Qt, QTime, QVariant # type: ignore
+
+from .network_snapshot import DEFAULT_TOLERANCE
+from .segment_engine import SegmentDistanceEngine
+
+
+# Layers of a post, in the order they are exported and loaded back
+POST_LAYERS = ("LINIE_JT", "STALP_JT", "BRANS_FIRI_GRPM_JT", "FB pe C LES", "TRONSON_JT")
+# Layers cut out by a polygon – LINIE_JT has no geometry
+SELECTION_LAYERS = POST_LAYERS[1:]
+
+# Fields the separations and the checks look features up by
+INDEXED_FIELDS = ("ID_BDI", "LINIA_JT", "DENUM")
+
+# features written between two cancel checks
+CHECK_EVERY = 500
+
+
+class ExportCanceled(Exception):
+    """Raised inside an export when its task is cancelled; the outputs are aborted."""
+
+
+def id_bdi_request(layer, wanted) -> QgsFeatureRequest:
+    """``"ID_BDI" IN (…)`` request, so OGR / SQLite only returns the *wanted* posts.
+
+    Values are typed like the field: a numeric ID_BDI is compared with numbers,
+    and IDs that are not numbers cannot match it.
+    """
+    field = layer.fields().field("ID_BDI")
+    values = []
+    for key in wanted:
+        if field.isNumeric():
+            try:
+                values.append(QgsExpression.quotedValue(float(key) if "." in key else int(key)))
+            except ValueError:
+                continue
+        else:
+            values.append(QgsExpression.quotedValue(key))
+    if not values:
+        return QgsFeatureRequest().setFilterExpression("FALSE")
+    return QgsFeatureRequest().setFilterExpression(f'"ID_BDI" IN ({", ".join(values)})')
+
+
+def _gpkg_table(layer) -> tuple | None:
+    """``(file, table)`` behind an OGR GeoPackage layer, None for anything else."""
+    if layer.providerType() != "ogr":
+        return None
+    parts = QgsProviderRegistry.instance().decodeUri("ogr", layer.source())
+    path = parts.get("path", "")
+    if not path.lower().endswith(".gpkg") or not os.path.isfile(path):
+        return None
+    return path, parts.get("layerName") or Path(path).stem
+
+
+def _indexed_columns(path: str, table: str) -> set:
+    """Lower-case names of the columns leading an index of *table*."""
+    with closing(sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)) as con:
+        names = [row[0] for row in con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))]
+        columns = set()
+        for name in names:
+            info = con.execute(f'PRAGMA index_info("{name}")').fetchall()
+            if info:
+                columns.add(str(info[0][2]).lower())
+    return columns
+
+
+def ensure_attribute_indexes(layer, fields=INDEXED_FIELDS) -> list:
+    """Creates the attribute indexes of *fields* missing from a GeoPackage layer.
+
+    Other sources are left alone.  Returns the names of the fields indexed now.
+    """
+    table = _gpkg_table(layer)
+    provider = layer.dataProvider()
+    if table is None or not provider.capabilities() & QgsVectorDataProvider.CreateAttributeIndex:
+        return []
+    try:
+        existing = _indexed_columns(*table)
+    except sqlite3.Error as e:
+        QgsMessageLog.logMessage(f"Nu s-au putut citi indecșii din {table[0]}: {e}",
+                                 "DesenAssist", level=Qgis.Warning)
+        return []
+
+    created = []
+    for name in fields:
+        index = layer.fields().indexOf(name)
+        if index < 0 or name.lower() in existing:
+            continue
+        if provider.createAttributeIndex(index):
+            created.append(name)
+        else:
+            QgsMessageLog.logMessage(f"Nu s-a putut crea indexul {name} pentru {layer.name()}",
+                                     "DesenAssist", level=Qgis.Warning)
+    return created
+
+
+def iter_by_id_bdi(layer, wanted=None):
+    """Yields ``(ID_BDI, feature)`` for *layer*, read in a single pass.
+
+    With *wanted* (ID_BDI strings) only those posts are read – the filter runs in
+    the provider; without it every feature that has an ID_BDI is yielded.
+    """
+    index = layer.fields().indexOf("ID_BDI")
+    if index < 0:
+        return
+    request = QgsFeatureRequest() if wanted is None else id_bdi_request(layer, wanted)
+    for feature in layer.getFeatures(request):
+        value = feature[index]
+        if value is None or value == NULL:
+            continue
+        key = str(value).strip()
+        if key and (wanted is None or key in wanted):
+            yield key, feature
+
+
+def pole_id_bdi_votes(poles, line_layers, tol: float = DEFAULT_TOLERANCE) -> dict:
+    """``{pole fid: Counter({ID_BDI: lines})}`` – the ID_BDI of the lines each pole touches.
+
+    A pole touches a line when it lies within *tol* of any of its segments, ends
+    and interior alike – the contact test of the verification rules, with the
+    same default tolerance.  The pole coordinates are read once and every layer
+    of *line_layers* is matched against them in bulk by the SegmentDistanceEngine;
+    a line votes once for every pole it touches.  The layers are in priority
+    order – a pole keeps the votes of the first layer that reaches it with an
+    ID_BDI, later layers only fill in the poles left without one.
+    """
+    engine = SegmentDistanceEngine(tol)
+    pole_ids, points = [], []
+    for pole in poles.getFeatures(QgsFeatureRequest().setNoAttributes()):
+        if pole.hasGeometry():
+            point = pole.geometry().boundingBox().center()
+            pole_ids.append(pole.id())
+            points.append((point.x(), point.y()))
+    pts = np.array(points, dtype=float).reshape(-1, 2)
+
+    votes = {}
+    for layer in line_layers:
+        index = layer.fields().indexOf("ID_BDI")
+        if index < 0:
+            continue
+        values, rows, owner = {}, [], []
+        request = QgsFeatureRequest().setSubsetOfAttributes([index])
+        for line in layer.getFeatures(request):
+            value = line[index]
+            if not value or not line.hasGeometry():
+                continue
+            values[line.id()] = value
+            geom = line.geometry()
+            for part in (geom.asMultiPolyline() if geom.isMultipart() else [geom.asPolyline()]):
+                if len(part) == 1:                  # degenerate part – keep it as a point
+                    part = [part[0], part[0]]
+                for a, b in zip(part, part[1:]):
+                    rows.append((a.x(), a.y(), b.x(), b.y()))
+                    owner.append(line.id())
+
+        seg = np.array(rows, dtype=float).reshape(-1, 4)
+        pt_idx, seg_idx, _near_start, _near_end = engine.match(pts, seg)
+        layer_votes = defaultdict(Counter)
+        for pole_fid, line_fid in {(pole_ids[pi], owner[si])
+                                   for pi, si in zip(pt_idx.tolist(), seg_idx.tolist())}:
+            layer_votes[pole_fid][values[line_fid]] += 1
+        for fid, counter in layer_votes.items():
+            votes.setdefault(fid, counter)
+    return votes
+
+
+def majority_id_bdi(counter: Counter):
+    """The most voted ID_BDI; a tie goes to the smallest value, so reruns agree."""
+    return min(counter.items(), key=lambda item: (-item[1], str(item[0])))[0]
+
+
+class GpkgStream:
+    """A GeoPackage output fed straight from a feature iterator.
+
+    Features are handed to the QgsVectorFileWriter in chunks of CHUNK, so the
+    export never holds more than one chunk per output in memory.  The file is
+    created on construction – an output that receives nothing is still written,
+    empty – and finalised by ``close()``.  *transform_context* is the project's,
+    read on the main thread.
+    """
+
+    CHUNK = 1000
+
+    def __init__(self, path: str, layer_name: str, source_layer, transform_context):
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = "GPKG"
+        options.fileEncoding = "UTF-8"
+        options.layerName = layer_name
+        self.path = path
+        self.count = 0
+        self._pending = []
+        self._writer = QgsVectorFileWriter.create(
+            path, source_layer.fields(), source_layer.wkbType(), source_layer.crs(),
+            transform_context, options
+        )
+        if self._writer.hasError() != QgsVectorFileWriter.NoError:
+            raise IOError(f"Nu s-a putut crea {path}: {self._writer.errorMessage()}")
+
+    def add(self, feature) -> None:
+        self._pending.append(feature)
+        if len(self._pending) >= self.CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending and not self._writer.addFeatures(self._pending):
+            raise IOError(f"Nu s-a putut scrie în {self.path}: {self._writer.errorMessage()}")
+        self.count += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._writer = None             # the writer closes the file when destroyed
+
+
+# ----------------------------------------------------------------------
+#  Outputs: a folder of <layer>.gpkg files, or one multi-layer GeoPackage
+# ----------------------------------------------------------------------
+class LayerFiles:
+    """One ``<layer>.gpkg`` per layer in *directory*, each written by a GpkgStream."""
+
+    def __init__(self, directory: str, transform_context):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.transform_context = transform_context
+        self.written = set()
+
+    def uri(self, layer_name: str) -> str:
+        return os.path.join(self.directory, f"{layer_name}.gpkg")
+
+    def table(self, layer_name: str, source_layer) -> GpkgStream:
+        self.written.add(layer_name)
+        return GpkgStream(self.uri(layer_name), layer_name, source_layer, self.transform_context)
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        for layer_name in self.written:
+            if os.path.exists(self.uri(layer_name)):
+                os.remove(self.uri(layer_name))
+
+
+_OGR_TYPES = {
+    QVariant.Int: ogr.OFTInteger,
+    QVariant.UInt: ogr.OFTInteger64,
+    QVariant.LongLong: ogr.OFTInteger64,
+    QVariant.ULongLong: ogr.OFTInteger64,
+    QVariant.Double: ogr.OFTReal,
+    QVariant.Bool: ogr.OFTInteger,
+    QVariant.Date: ogr.OFTDate,
+    QVariant.Time: ogr.OFTTime,
+    QVariant.DateTime: ogr.OFTDateTime,
+}
+
+
+def _ogr_value(value):
+    if isinstance(value, (QDate, QTime, QDateTime)):
+        return value.toString(Qt.ISODate)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+class GpkgTable:
+    """One table of a GpkgPackage; features are converted to OGR as they come."""
+
+    def __init__(self, ogr_layer, fields):
+        self._layer = ogr_layer
+        self._defn = ogr_layer.GetLayerDefn()
+        self._fid = -1
+        self._columns = []                  # (OGR field index, source attribute index)
+        for i, field in enumerate(fields):
+            if field.name().lower() == "fid":
+                self._fid = i               # the GeoPackage primary key
+                continue
+            self._columns.append((self._defn.GetFieldIndex(field.name()), i))
+        self.count = 0
+
+    def add(self, feature) -> None:
+        out = ogr.Feature(self._defn)
+        attributes = feature.attributes()
+        if self._fid >= 0 and attributes[self._fid] not in (None, NULL):
+            out.SetFID(int(attributes[self._fid]))
+        for column, i in self._columns:
+            value = attributes[i]
+            if value is None or value == NULL:
+                out.SetFieldNull(column)
+            else:
+                out.SetField(column, _ogr_value(value))
+        if feature.hasGeometry():
+            out.SetGeometryDirectly(ogr.CreateGeometryFromWkb(bytes(feature.geometry().asWkb())))
+        if self._layer.CreateFeature(out) != ogr.OGRERR_NONE:
+            raise IOError(f"Nu s-a putut scrie entitatea {feature.id()} în {self._layer.GetName()}")
+        self.count += 1
+
+    def close(self) -> None:
+        pass
+
+
+class GpkgPackage:
+    """Several layers written as the tables of one new GeoPackage.
+
+    Every insert goes into a single SQLite transaction, and the tables are created
+    without their R-tree: ``close()`` builds the spatial indexes in bulk once the
+    data is in, then commits – one write of the file instead of one per layer and
+    row-by-row index updates.  ``abort()`` rolls back and removes the file.
+    """
+
+    def __init__(self, path: str):
+        if os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self.written = set()
+        self._indexed = []                  # (table, geometry column)
+        self._ds = ogr.GetDriverByName("GPKG").CreateDataSource(path)
+        if self._ds is None:
+            raise IOError(f"Nu s-a putut crea {path}")
+        self._ds.StartTransaction()
+
+    def uri(self, layer_name: str) -> str:
+        return f"{self.path}|layername={layer_name}"
+
+    def table(self, layer_name: str, source_layer) -> GpkgTable:
+        crs = source_layer.crs()
+        srs = None
+        if crs.isValid():
+            srs = osr.SpatialReference()
+            srs.ImportFromWkt(crs.toWkt(QgsCoordinateReferenceSystem.WKT_PREFERRED_GDAL))
+            srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+        wkb_type = source_layer.wkbType()
+        if QgsWkbTypes.geometryType(wkb_type) == QgsWkbTypes.NullGeometry:
+            geometry_type = ogr.wkbNone
+        else:
+            geometry_type = int(QgsWkbTypes.flatType(wkb_type))
+            if QgsWkbTypes.hasZ(wkb_type):
+                geometry_type = ogr.GT_SetZ(geometry_type)
+            if QgsWkbTypes.hasM(wkb_type):
+                geometry_type = ogr.GT_SetM(geometry_type)
+
+        ogr_layer = self._ds.CreateLayer(layer_name, srs, geometry_type, ["SPATIAL_INDEX=NO"])
+        if ogr_layer is None:
+            raise IOError(f"Nu s-a putut crea tabela {layer_name} în {self.path}")
+        fields = source_layer.fields()
+        for field in fields:
+            if field.name().lower() == "fid":
+                continue
+            definition = ogr.FieldDefn(field.name(), _OGR_TYPES.get(field.type(), ogr.OFTString))
+            if field.type() == QVariant.Bool:
+                definition.SetSubType(ogr.OFSTBoolean)
+            elif field.type() == QVariant.String and field.length() > 0:
+                definition.SetWidth(field.length())
+            ogr_layer.CreateField(definition)
+
+        if geometry_type != ogr.wkbNone:
+            self._indexed.append((layer_name, ogr_layer.GetGeometryColumn()))
+        self.written.add(layer_name)
+        return GpkgTable(ogr_layer, fields)
+
+    def close(self) -> None:
+        if self._ds is None:
+            return
+        try:
+            for table, column in self._indexed:
+                result = self._ds.ExecuteSQL(f"SELECT CreateSpatialIndex('{table}', '{column}')")
+                if result is not None:
+                    self._ds.ReleaseResultSet(result)
+            if self._ds.CommitTransaction() != ogr.OGRERR_NONE:
+                raise IOError(f"Nu s-a putut salva {self.path}")
+        finally:
+            self._ds = None                 # closes the file
+
+    def abort(self) -> None:
+        if self._ds is None:
+            return
+        self._ds.RollbackTransaction()
+        self._ds = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _export(layers: dict, layer_names, routed, open_output, route=None, keys=(), feedback=None) -> tuple:
+    """Writes every ``(key, feature)`` yielded by ``routed(layer_name)`` into the
+    output of ``route(key)`` – the key itself by default.
+
+    Outputs are opened on first use (those of *keys* up front), each layer is read
+    once, and every output ends up with all *layer_names*, empty where it received
+    nothing.  On failure the outputs are aborted.
+
+    *feedback* (a QgsTask) gets the progress after every layer and is checked for
+    cancellation every CHECK_EVERY features – ExportCanceled is raised then.
+
+    Returns ``({layer name: {key: feature count}}, {output key: output})``.
+    """
+    route = route or (lambda key: key)
+    counts = {name: defaultdict(int) for name in layer_names}
+    outputs = {}
+
+    def output(key):
+        if key not in outputs:
+            outputs[key] = open_output(key)
+        return outputs[key]
+
+    try:
+        for key in keys:
+            output(key)
+        for step, layer_name in enumerate(layer_names):
+            tables = {}
+            try:
+                for n, (key, feature) in enumerate(routed(layer_name)):
+                    if feedback is not None and n % CHECK_EVERY == 0 and feedback.isCanceled():
+                        raise ExportCanceled()
+                    target = route(key)
+                    table = tables.get(target)
+                    if table is None:
+                        table = tables[target] = output(target).table(layer_name, layers[layer_name])
+                    table.add(feature)
+                    counts[layer_name][key] += 1
+            finally:
+                for table in tables.values():
+                    table.close()
+            if feedback is not None:
+                feedback.setProgress(100.0 * (step + 1) / len(layer_names))
+
+        for out in outputs.values():
+            for layer_name in layer_names:
+                if layer_name not in out.written:
+                    out.table(layer_name, layers[layer_name]).close()
+            out.close()
+    except BaseException:
+        for out in outputs.values():
+            out.abort()
+        raise
+    return counts, outputs
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r'[\\/:*?"<>|]', "_", text)
+
+
+def load_output(output_path: str, layer_name: str, group, original_layer=None) -> QgsVectorLayer:
+    """Adds a saved layer to *group*, styled like *original_layer* when one is given."""
+    permanent_layer = QgsVectorLayer(output_path, layer_name, "ogr")
+    QgsProject.instance().addMapLayer(permanent_layer, False)
+    group.addLayer(permanent_layer)
+
+    if original_layer is not None:
+        orig_renderer = original_layer.renderer()
+        if orig_renderer is not None:
+            permanent_layer.setRenderer(orig_renderer.clone())
+        else:
+            QgsMessageLog.logMessage(f"Nu s-a găsit niciun renderer pentru {layer_name}",
+                                     "DesenAssist", level=Qgis.Warning)
+
+        # Clone labeling if enabled and available
+        if original_layer.labelsEnabled() and original_layer.labeling() is not None:
+            permanent_layer.setLabeling(original_layer.labeling().clone())
+            permanent_layer.setLabelsEnabled(True)
+
+        permanent_layer.triggerRepaint()
+    return permanent_layer
+
+
+def export_posts(layers: dict, base_dir: str, wanted=None, single_file: bool = False,
+                 feedback=None, transform_context=None) -> tuple:
+    """Splits the POST_LAYERS of *layers* into posts with one pass per layer.
+
+    *wanted* None exports every ID_BDI found, one output per post.  Otherwise the
+    *wanted* posts are exported together into a single output.  An output is a
+    folder of ``<layer>.gpkg`` files – *base_dir* itself or ``<base_dir>/<ID_BDI>/`` –
+    or with *single_file* one GeoPackage holding all five layers:
+    ``<base_dir>/Date_Filtrate_<ID_BDI>_….gpkg`` or ``<base_dir>/<ID_BDI>.gpkg``.
+    Features go from the source iterator straight into the outputs.
+
+    *layers* may be DetachedLayer copies, so the export can run in a PostExportTask
+    (*feedback*) – add the missing attribute indexes with ensure_attribute_indexes()
+    and read ``QgsProject.instance().transformContext()`` (*transform_context*, an
+    empty context when None) on the main thread first.
+
+    Returns ``({layer name: {ID_BDI: feature count}}, {ID_BDI or None: output})`` –
+    the *wanted* posts share the output under None.
+    """
+    if transform_context is None:
+        transform_context = QgsCoordinateTransformContext()
+
+    def routed(layer_name):
+        return iter_by_id_bdi(layers[layer_name], wanted)
+
+    if wanted is not None:
+        def open_output(_key):
+            if single_file:
+                return GpkgPackage(os.path.join(base_dir, f"Date_Filtrate_{_safe_name('_'.join(wanted))}.gpkg"))
+            return LayerFiles(base_dir, transform_context)
+        return _export(layers, POST_LAYERS, routed, open_output, route=lambda key: None, keys=(None,),
+                       feedback=feedback)
+
+    def open_output(id_bdi):
+        if single_file:
+            return GpkgPackage(os.path.join(base_dir, f"{_safe_name(id_bdi)}.gpkg"))
+        return LayerFiles(os.path.join(base_dir, _safe_name(id_bdi)), transform_context)
+    return _export(layers, POST_LAYERS, routed, open_output, feedback=feedback)
+
+
+def _prepared(polygons: dict, polygon_crs, layer_crs, transform_context) -> list:
+    """``[(name, geometry, prepared engine)]`` of *polygons* in *layer_crs*."""
+    transform = None
+    if polygon_crs is not None and polygon_crs.isValid() and polygon_crs != layer_crs:
+        transform = QgsCoordinateTransform(polygon_crs, layer_crs, transform_context)
+    shapes = []
+    for name, geom in polygons.items():
+        if geom is None or geom.isEmpty():
+            continue
+        geom = QgsGeometry(geom)
+        if transform is not None:
+            geom.transform(transform)
+        engine = QgsGeometry.createGeometryEngine(geom.constGet())
+        engine.prepareGeometry()
+        shapes.append((name, geom, engine))
+    return shapes
+
+
+def export_selection(layers: dict, polygons: dict, base_dir: str, single_file: bool = False,
+                     polygon_crs=None, feedback=None, transform_context=None) -> tuple:
+    """Exports the SELECTION_LAYERS features intersecting each of *polygons*
+    (``{name: QgsGeometry}``, in *polygon_crs*) – one output per polygon, every
+    layer read once.
+
+    Only the features within the polygons' bounding box are fetched
+    (``setFilterRect``); they are matched through a spatial index of the
+    polygons and tested against a prepared QgsGeometryEngine, so a feature can
+    go to several outputs.  The polygon named None keeps the classic location,
+    ``<base_dir>/<layer>.gpkg`` or ``<base_dir>/Date_Filtrate_poligon.gpkg``;
+    the others go to ``<base_dir>/<name>/`` or ``<base_dir>/Date_Filtrate_<name>.gpkg``.
+    *layers*, *feedback* and *transform_context* as for export_posts().
+
+    Returns ``({layer name: {polygon name: feature count}}, {polygon name: output})``.
+    """
+    if transform_context is None:
+        transform_context = QgsCoordinateTransformContext()
+
+    def routed(layer_name):
+        layer = layers[layer_name]
+        shapes = _prepared(polygons, polygon_crs, layer.crs(), transform_context)
+        if not shapes:
+            return
+        index = QgsSpatialIndex()
+        rect = QgsRectangle(shapes[0][1].boundingBox())
+        for i, (_name, geom, _engine) in enumerate(shapes):
+            index.addFeature(i, geom.boundingBox())
+            rect.combineExtentWith(geom.boundingBox())
+
+        for f in layer.getFeatures(QgsFeatureRequest().setFilterRect(rect)):
+            geom = f.geometry()
+            if geom.isNull():
+                continue
+            for i in index.intersects(geom.boundingBox()):
+                name, _geom, engine = shapes[i]
+                if engine.intersects(geom.constGet()):
+                    yield name, f
+
+    def open_output(name):
+        if single_file:
+            return GpkgPackage(os.path.join(base_dir, f"Date_Filtrate_{_safe_name(name or 'poligon')}.gpkg"))
+        return LayerFiles(base_dir if name is None else os.path.join(base_dir, _safe_name(name)),
+                          transform_context)
+
+    return _export(layers, SELECTION_LAYERS, routed, open_output, keys=tuple(polygons),
+                   feedback=feedback)
+
+
+class PostExportTask(QgsTask):
+    """Runs a separation export off the GUI thread.
+
+    *export* is called as ``export(task)`` and must only read DetachedLayer
+    copies; the task is its feedback.  ``on_finished(ok, result, exception)`` runs
+    on the main thread – that is where the outputs are loaded into the project.
+    """
+
+    def __init__(self, description: str, export, on_finished):
+        super().__init__(description, QgsTask.CanCancel)
+        self.export = export
+        self.on_finished = on_finished
+        self.result = None
+        self.exception = None
+
+    def run(self) -> bool:
+        try:
+            self.result = self.export(self)
+            return True
+        except ExportCanceled:
+            return False
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def finished(self, result: bool) -> None:
+        if self.exception is not None:
+            QgsMessageLog.logMessage(f"{self.description()}: {self.exception}", "DesenAssist", level=Qgis.Critical)
+        self.on_finished(result, self.result, self.exception)
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+
+from qgis.core import QgsApplication, QgsGeometry, QgsMessageLog, Qgis # type: ignore
+
+from .error_sink import ErrorSink
+from .run_stats import plugin_version
+
+
+class ResultCache:
+    """VectorVerifier errors of earlier runs on disk, one JSON file per input fingerprint.
+
+    The fingerprint covers the plugin version, the run parameters (tolerance,
+    LINIE_JT, rules, scope) and every source layer: its source, subset and
+    feature count plus the size / mtime of the file behind it.  Layers with
+    unsaved edits or without a file (memory, database) are hashed feature by
+    feature instead.  Files live in ``<directory>/cache_verificare`` – by default
+    under the QGIS profile (default_directory), never next to the deliverables;
+    only the MAX_ENTRIES most recent ones are kept.
+    """
+
+    PLUGIN_FOLDER = "desen_assist"
+    FOLDER = "cache_verificare"
+    MAX_ENTRIES = 20
+    # layout of the JSON files – part of the fingerprint, so older files are never misread
+    FORMAT = 2
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, self.FOLDER)
+
+    @classmethod
+    def default_directory(cls) -> str:
+        """The plugin folder of the active QGIS profile; the fingerprint holds the
+        full layer sources, so one cache serves every project."""
+        return os.path.join(QgsApplication.qgisSettingsDirPath(), cls.PLUGIN_FOLDER)
+
+    # ------------------------------------------------------------------
+    #  Fingerprint
+    # ------------------------------------------------------------------
+    @staticmethod
+    def file_stamp(layer) -> tuple | None:
+        """Main thread: what identifies the saved content of *layer*, None when
+        it has to be hashed (unsaved edits, no file behind it)."""
+        if layer.providerType() != "ogr" or layer.isModified():
+            return None
+        path = layer.source().split("|")[0]
+        if not os.path.isfile(path):
+            return None
+        stamp = [layer.source(), layer.subsetString(), layer.featureCount()]
+        # GeoPackage edits may still sit in the write-ahead log
+        for name in (path, path + "-wal"):
+            if os.path.exists(name):
+                st = os.stat(name)
+                stamp += [st.st_size, st.st_mtime_ns]
+        return tuple(stamp)
+
+    @staticmethod
+    def content_hash(source) -> str:
+        """Digest of every feature of *source* – a layer or a DetachedLayer."""
+        digest = hashlib.sha1()
+        for f in source.getFeatures():
+            digest.update(str(f.id()).encode())
+            if f.hasGeometry():
+                digest.update(bytes(f.geometry().asWkb()))
+            digest.update(repr(f.attributes()).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint(cls, params, stamps, sources) -> str:
+        """Key of a run with *params* over *sources*; a None stamp is replaced by
+        the content hash of the matching source."""
+        layers = [stamp if stamp is not None else cls.content_hash(source)
+                  for stamp, source in zip(stamps, sources)]
+        text = json.dumps([cls.FORMAT, plugin_version(), list(params), layers], default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    #  Storage
+    # ------------------------------------------------------------------
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def load(self, key: str) -> ErrorSink | None:
+        """The errors stored under *key*, None when there are none."""
+        try:
+            with open(self._file(key), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(self._file(key))       # recently used -> kept by _prune()
+        except OSError:
+            pass
+
+        sink = ErrorSink()
+        for kind in ErrorSink.KINDS:
+            for sources, wkb, layer_name, fid, tip, det in data.get(kind, ()):
+                geom = QgsGeometry()
+                geom.fromWkb(bytes.fromhex(wkb))
+                for source in sources:
+                    sink.add(kind, tuple(source), geom, layer_name, fid, tip, det)
+        return sink
+
+    def store(self, key: str, sink: ErrorSink) -> None:
+        # every source of a deduplicated error – the first one stays first
+        data = {
+            kind: [[[list(r.source)] + sorted(list(s) for s in sink.sources(kind, ErrorSink.key(r)) if s != r.source),
+                    bytes(r.geom.asWkb()).hex(), r.layer_name, r.fid, r.tip, r.det]
+                   for r in sink.records(kind)]
+            for kind in ErrorSink.KINDS
+        }
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp = self._file(key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self._file(key))
+            self._prune()
+        except OSError as e:
+            QgsMessageLog.logMessage(f"Nu s-a putut salva cache-ul verificării în {self.path}: {e}",
+                                     "VectorVerifier", level=Qgis.Warning)
+
+    def _prune(self) -> None:
+        entries = [os.path.join(self.path, n) for n in os.listdir(self.path) if n.endswith(".json")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.MAX_ENTRIES:]:
+            os.remove(path)
@@ -0,0 +1,68 @@
+import configparser
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+def plugin_version() -> str:
+    """``version`` from the plugin's metadata.txt, or "" when it cannot be read."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(os.path.dirname(__file__)), "metadata.txt"),
+                encoding="utf-8")
+    return parser.get("general", "version", fallback="")
+
+
+class RunStats:
+    """Wall time and work counters for every phase of a verification run.
+
+    Each phase (snapshot, adjacency, one per rule) is a plain dict:
+        • seconds – wall time
+        • visited – features the phase iterated over
+        • lookups – spatial look-ups (adjacency tables, endpoint grids, indexes)
+        • fetches – features read from the data providers
+        • errors  – errors emitted
+    """
+
+    COUNTERS = ("visited", "lookups", "fetches", "errors")
+
+    def __init__(self):
+        self.phases = []
+        self.current = None
+
+    @contextmanager
+    def phase(self, name: str):
+        entry = {"name": name, "seconds": 0.0}
+        entry.update((c, 0) for c in self.COUNTERS)
+        self.phases.append(entry)
+        self.current = entry
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = time.perf_counter() - start
+            self.current = None
+
+    def count(self, counter: str, n: int = 1) -> None:
+        if self.current is not None:
+            self.current[counter] += n
+
+    def totals(self) -> dict:
+        total = {"name": "Total", "seconds": sum(p["seconds"] for p in self.phases)}
+        total.update((c, sum(p[c] for p in self.phases)) for c in self.COUNTERS)
+        return total
+
+    def report(self) -> str:
+        """Fixed-width table, one line per phase plus the total."""
+        width = max([len(p["name"]) for p in self.phases] + [5])
+        header = f"{'Etapă':<{width}} {'timp (s)':>9} " + " ".join(f"{c:>8}" for c in self.COUNTERS)
+        lines = [header, "-" * len(header)]
+        for p in self.phases + [self.totals()]:
+            lines.append(f"{p['name']:<{width}} {p['seconds']:>9.3f} "
+                         + " ".join(f"{p[c]:>8}" for c in self.COUNTERS))
+        return "\n".join(lines)
+
+    def write_json(self, path: str, **meta) -> None:
+        data = dict(meta, version=plugin_version(), phases=self.phases, total=self.totals())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,127 @@
+import numpy as np
+
+
+class SegmentDistanceEngine:
+    """Vectorised point-to-segment proximity search.
+
+    Points (poles) and segments (consecutive vertices of TRONSON / BRANS lines) are
+    held in NumPy arrays.  Both are bucketed into a coarse square grid; a segment is
+    registered in every cell its bounding box (grown by the tolerance) overlaps, a
+    point in the one cell it falls into.  Only point/segment pairs sharing a cell are
+    measured, and they are measured in fixed-size batches so memory stays bounded on
+    very large networks.
+
+    ``match()`` returns, for every pair closer than the tolerance, the point index,
+    the segment index and whether the point also lies within the tolerance of the
+    segment start / end vertex.
+    """
+
+    BATCH = 200_000
+
+    def __init__(self, tol: float, cell_size: float | None = None):
+        self.tol = float(tol)
+        self.cell_size = cell_size
+
+    # ------------------------------------------------------------------
+    #  Grid bucketing
+    # ------------------------------------------------------------------
+    def _pick_cell_size(self, seg: np.ndarray) -> float:
+        if self.cell_size:
+            return float(self.cell_size)
+        lengths = np.hypot(seg[:, 2] - seg[:, 0], seg[:, 3] - seg[:, 1])
+        typical = float(np.median(lengths)) if len(lengths) else 0.0
+        # a cell of about one segment keeps both candidate lists short
+        return max(typical, 8 * self.tol, 1e-6)
+
+    @staticmethod
+    def _keys(cx: np.ndarray, cy: np.ndarray, ox: int, oy: int, height: int) -> np.ndarray:
+        return (cx - ox) * height + (cy - oy)
+
+    def _candidates(self, pts: np.ndarray, seg: np.ndarray):
+        cell = self._pick_cell_size(seg)
+        tol = self.tol
+
+        pcx = np.floor(pts[:, 0] / cell).astype(np.int64)
+        pcy = np.floor(pts[:, 1] / cell).astype(np.int64)
+
+        sx0 = np.floor((np.minimum(seg[:, 0], seg[:, 2]) - tol) / cell).astype(np.int64)
+        sx1 = np.floor((np.maximum(seg[:, 0], seg[:, 2]) + tol) / cell).astype(np.int64)
+        sy0 = np.floor((np.minimum(seg[:, 1], seg[:, 3]) - tol) / cell).astype(np.int64)
+        sy1 = np.floor((np.maximum(seg[:, 1], seg[:, 3]) + tol) / cell).astype(np.int64)
+
+        # expand every segment to the list of cells it covers
+        nx = sx1 - sx0 + 1
+        ny = sy1 - sy0 + 1
+        ncell = nx * ny
+        seg_rep = np.repeat(np.arange(len(seg)), ncell)
+        offset = np.arange(len(seg_rep)) - np.repeat(np.cumsum(ncell) - ncell, ncell)
+        scx = sx0[seg_rep] + offset % nx[seg_rep]
+        scy = sy0[seg_rep] + offset // nx[seg_rep]
+
+        ox = int(min(pcx.min(), scx.min()))
+        oy = int(min(pcy.min(), scy.min()))
+        height = int(max(pcy.max(), scy.max())) - oy + 1
+        pkey = self._keys(pcx, pcy, ox, oy, height)
+        skey = self._keys(scx, scy, ox, oy, height)
+
+        # points sorted by cell key -> each segment cell maps to a contiguous range
+        order = np.argsort(pkey, kind="stable")
+        pkey_sorted = pkey[order]
+        lo = np.searchsorted(pkey_sorted, skey, side="left")
+        hi = np.searchsorted(pkey_sorted, skey, side="right")
+        counts = hi - lo
+        keep = counts > 0
+        seg_rep, lo, counts = seg_rep[keep], lo[keep], counts[keep]
+
+        pair_seg = np.repeat(seg_rep, counts)
+        inner = np.arange(len(pair_seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_pt = order[np.repeat(lo, counts) + inner]
+        return pair_pt, pair_seg
+
+    # ------------------------------------------------------------------
+    #  Distances
+    # ------------------------------------------------------------------
+    def match(self, pts: np.ndarray, seg: np.ndarray):
+        """Pairs within the tolerance.
+
+        Parameters
+        ----------
+        pts : (P, 2) float array of point coordinates
+        seg : (S, 4) float array of x1, y1, x2, y2 per segment
+
+        Returns
+        -------
+        (pt_idx, seg_idx, near_start, near_end) – four aligned 1-D arrays.
+        """
+        empty = (np.empty(0, np.int64), np.empty(0, np.int64),
+                 np.empty(0, bool), np.empty(0, bool))
+        if len(pts) == 0 or len(seg) == 0:
+            return empty
+
+        pair_pt, pair_seg = self._candidates(pts, seg)
+        tol2 = self.tol * self.tol
+        out = []
+        for start in range(0, len(pair_pt), self.BATCH):
+            bp = pair_pt[start:start + self.BATCH]
+            bs = pair_seg[start:start + self.BATCH]
+            px, py = pts[bp, 0], pts[bp, 1]
+            x1, y1, x2, y2 = seg[bs, 0], seg[bs, 1], seg[bs, 2], seg[bs, 3]
+
+            vx, vy = x2 - x1, y2 - y1
+            wx, wy = px - x1, py - y1
+            len2 = vx * vx + vy * vy
+            t = np.where(len2 > 0, (wx * vx + wy * vy) / np.where(len2 > 0, len2, 1.0), 0.0)
+            t = np.clip(t, 0.0, 1.0)
+            dx, dy = wx - t * vx, wy - t * vy
+            hit = dx * dx + dy * dy <= tol2
+            if not hit.any():
+                continue
+
+            near_start = wx * wx + wy * wy <= tol2
+            ex, ey = px - x2, py - y2
+            near_end = ex * ex + ey * ey <= tol2
+            out.append((bp[hit], bs[hit], near_start[hit], near_end[hit]))
+
+        if not out:
+            return empty
+        return tuple(np.concatenate(parts) for parts in zip(*out))
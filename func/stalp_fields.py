@@ -0,0 +1,166 @@
+import json
+from pathlib import Path
+from types import MappingProxyType
+
+from qgis.core import NULL, QgsFeatureRequest, QgsSpatialIndex # type: ignore
+
+from .helper_functions import HelperBase
+
+
+# Rule tables of "Completare câmpuri" – edit the JSON to add pole types
+RULES_FILE = Path(__file__).resolve().parent / "templates" / "stalp_fields.json"
+
+
+class StalpRules:
+    """The STALP_JT rule tables of RULES_FILE, compiled into frozen look-ups.
+
+    Loaded when "Completare câmpuri" runs, not on import: a broken file only
+    stops that command, and edits to it count from the next run.
+
+        • prop       – {DESC_CTG_MT_JT: PROP}; a code listed under two owners keeps the first
+        • prop_kept  – PROP values a pole keeps whatever its DESC_CTG_MT_JT
+        • tip_fund   – {DESC_CTG_MT_JT: TIP_FUND}, tip_fund_default for any other code
+        • flag_columns – {circuit count column: its Da/Nu column}
+    """
+
+    def __init__(self, data: dict):
+        self.prop = self._table(data["PROP"])
+        self.prop_kept = frozenset(data["PROP_KEPT"])
+        self.tip_fund = self._table(data["TIP_FUND"])
+        self.tip_fund_default = data["TIP_FUND_DEFAULT"]
+        self.flag_columns = MappingProxyType(dict(data["FLAG_COLUMNS"]))
+        self.flag_filled, self.flag_empty = data["FLAG_VALUES"]
+        self.prop_fo_default = data["PROP_FO_DEFAULT"]
+        self.uzura_stp_default = data["UZURA_STP_DEFAULT"]
+
+        # STALP_JT columns read by the rules
+        self.source_fields = ("TIP_CIR", "DESC_CTG_MT_JT", "PROP", "TIP_FUND", "PROP_FO", "UZURA_STP",
+                              *self.flag_columns, *self.flag_columns.values())
+
+    @staticmethod
+    def _table(groups: dict) -> MappingProxyType:
+        table = {}
+        for value, codes in groups.items():
+            for code in codes:
+                table.setdefault(code, value)
+        return MappingProxyType(table)
+
+    @classmethod
+    def load(cls, path=RULES_FILE) -> "StalpRules":
+        """Raises IOError when *path* cannot be read, ValueError when it is not valid rule tables."""
+        with open(path, encoding="utf-8") as f:
+            try:
+                return cls(json.load(f))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}: tabele de reguli invalide ({type(e).__name__}: {e})") from e
+
+
+class LineContacts:
+    """The lines of a layer read once – geometry plus LINIA_JT – behind a spatial index.
+
+    ``touching(geom)`` returns the LINIA_JT of every line intersecting *geom*, without
+    going back to the data provider.
+    """
+
+    def __init__(self, layer):
+        self.index = QgsSpatialIndex()
+        self.lines = {}
+        names = [n for n in ("LINIA_JT",) if layer.fields().indexFromName(n) != -1]
+        request = QgsFeatureRequest().setSubsetOfAttributes(names, layer.fields())
+        for f in layer.getFeatures(request):
+            geom = f.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            self.index.addFeature(f.id(), geom.boundingBox())
+            linia_jt = f["LINIA_JT"] if names else None
+            self.lines[f.id()] = (geom, None if linia_jt == NULL else linia_jt)
+
+    def touching(self, geom) -> list:
+        hits = []
+        for fid in self.index.intersects(geom.boundingBox()):
+            line_geom, linia_jt = self.lines[fid]
+            if line_geom.intersects(geom):
+                hits.append(linia_jt)
+        return hits
+
+
+def stalp_values(attrs: dict, tronson_names, has_branch: bool, null_values, rules: StalpRules) -> dict:
+    """Every derived STALP_JT field of one pole, as ``{field: value}``.
+
+    *attrs* holds the rules.source_fields present in the layer, *tronson_names*
+    the LINIA_JT of the TRONSON_JT touching the pole and *has_branch* whether a
+    BRANS_FIRI_GRPM_JT touches it.  A field missing from the result is left as it is.
+
+        • NR_CIR    – distinct LINIA_JT of the touching tronsons, else 1 for a branch,
+                      plus 1 when TIP_CIR contains 'IL'
+        • PROP      – looked up from DESC_CTG_MT_JT, unless set to a prop_kept value
+        • TIP_FUND  – looked up from DESC_CTG_MT_JT, when it is filled in
+        • FIB_OPT, LTC, CATV – Da when their NR_CIR_* column is filled in, else Nu
+        • PROP_FO   – prop_fo_default for poles with fibre and no owner
+        • UZURA_STP – uzura_stp_default when empty
+    """
+    values = {}
+
+    nr_cir = len(set(tronson_names)) or (1 if has_branch else 0)
+    if "IL" in (attrs.get("TIP_CIR") or "").upper():
+        nr_cir += 1
+    values["NR_CIR"] = nr_cir
+
+    desc = attrs.get("DESC_CTG_MT_JT")
+    if desc:
+        expected_prop = rules.prop.get(desc)
+        if expected_prop and "PROP" in attrs and attrs["PROP"] != expected_prop \
+                and attrs["PROP"] not in rules.prop_kept:
+            values["PROP"] = expected_prop
+        if "TIP_FUND" in attrs:
+            values["TIP_FUND"] = rules.tip_fund.get(desc, rules.tip_fund_default)
+
+    for key_field, bool_field in rules.flag_columns.items():
+        if key_field in attrs and bool_field in attrs:
+            values[bool_field] = rules.flag_filled if attrs[key_field] not in null_values else rules.flag_empty
+
+    if "NR_CIR_FO" in attrs and "PROP_FO" in attrs:
+        if attrs["NR_CIR_FO"] not in null_values and attrs["PROP_FO"] in null_values:
+            values["PROP_FO"] = rules.prop_fo_default
+
+    if "UZURA_STP" in attrs and attrs["UZURA_STP"] in null_values:
+        values["UZURA_STP"] = rules.uzura_stp_default
+
+    return values
+
+
+def stalp_field_changes(st_layer, tr_layer, br_layer, null_values, rules: StalpRules) -> dict:
+    """One pass over STALP_JT: ``{fid: {field index: value}}`` of the values that change.
+
+    TRONSON_JT and BRANS_FIRI_GRPM_JT are read once each into LineContacts; every
+    pole is then read once, gets all its derived fields from stalp_values() and
+    keeps only those that differ from the stored value (HelperBase.same_value) –
+    ready for a single bulk attribute write.  *null_values* are the values that
+    count as empty (config.NULL_VALUES).
+    """
+    fields = st_layer.fields()
+    if fields.indexFromName("NR_CIR") == -1 or fields.indexFromName("TIP_CIR") == -1:
+        raise ValueError("STALP_JT is missing NR_CIR or TIP_CIR")
+
+    tronson = LineContacts(tr_layer)
+    brans = LineContacts(br_layer)
+
+    present = [n for n in rules.source_fields + ("NR_CIR",) if fields.indexFromName(n) != -1]
+    request = QgsFeatureRequest().setSubsetOfAttributes(present, fields)
+
+    changes = {}
+    for pole in st_layer.getFeatures(request):
+        geom = pole.geometry()
+        if geom is None or geom.isEmpty():
+            continue
+        tronson_names = tronson.touching(geom)
+        has_branch = not tronson_names and bool(brans.touching(geom))
+        attrs = {n: pole[n] for n in present}
+
+        changed = {}
+        for name, value in stalp_values(attrs, tronson_names, has_branch, null_values, rules).items():
+            if not HelperBase.same_value(attrs[name], value):
+                changed[fields.indexFromName(name)] = value
+        if changed:
+            changes[pole.id()] = changed
+    return changes
@@ -1,28 +1,31 @@
 from qgis.core import ( # type: ignore
+    QgsApplication,
+    QgsCoordinateTransform,
     QgsProject,
+    QgsReferencedRectangle,
+    QgsTask,
     QgsVectorLayer,
     QgsFields,
     QgsField,
-    QgsFeature,
     QgsGeometry,
-    QgsPointXY,
-    QgsSpatialIndex,
     QgsWkbTypes,
     QgsMessageLog,
     Qgis,
-    QgsProcessing,
     QgsRectangle,
 )
 
-from collections import defaultdict
-from itertools   import islice
-
-import processing # type: ignore
+import os
+from datetime    import datetime
 
 from qgis.PyQt.QtCore import QVariant # type: ignore
-from qgis.PyQt.QtWidgets import QInputDialog # type: ignore
 
+from .change_tracker import ChangeTracker
+from .error_sink import ErrorSink
 from .helper_functions import HelperBase
+from .network_snapshot import DEFAULT_TOLERANCE, DetachedLayer, NetworkSnapshot
+from .result_cache import ResultCache
+from .run_stats import RunStats
+from .verify_options import VerifyOptionsDialog
 
 
 class VectorVerifier:
@@ -33,10 +36,50 @@ class VectorVerifier:
         • erori_brans_tronson – line layer (errors concerning BRANS_FIRI_GRPM_JT or TRONSON_JT)
     Both layers receive four string/int fields:  NUME_LAYER, FID, TIP_EROARE, DETALII.
     At the end they are added to the current group "DE_VERIFICAT" in the QGIS project.
+
+    The work is split in three steps so the rules can run off the GUI thread:
+        • prepare() – main thread: resolve the layers, detach thread-safe sources
+        • run()     – any thread: snapshot + rules, errors collected in memory
+        • publish() – main thread: build the error layers and add them to the project
+
+    The same instance can be reused: after a run it watches the edit signals of the
+    three source layers, and the next run with the same parameters re-reads only the
+    edited features into the previous snapshot, re-evaluates them and their
+    neighbours within tolerance, and patches the existing error layers in place
+    instead of rebuilding them.  An error is removed only once none of the
+    features that reported it reports it any more.
+
+    With a *cache_dir* every run is keyed on a fingerprint of its inputs (see
+    ResultCache): when nothing changed since the last run the error layers are
+    left as they are, and a run already done once – in this session or an
+    earlier one – reloads its errors from disk instead of running the rules.
     """
 
+    # (progress label, method) – rules are numbered from 1 in this order
+    RULES = (
+        ("Regula 1 – snapping", "_rule1_snapping"),
+        ("Regula 2 – TIP_CIR BR", "_rule2_tip_cir_br"),
+        ("Regula 3 – TIP_CIR JT", "_rule3_tip_cir_jt"),
+        ("Regula 4 – terminal BRANS", "_rule4_terminal_br"),
+        ("Regula 5 – terminal TRONSON", "_rule5_terminal_tronson"),
+        ("Regula 6 – întindere", "_rule6_intindere"),
+        ("Regula 7 – rupere conductor", "_rule7_rupere_cond"),
+    )
+
+    # features handled between two progress / cancel checks
+    CHUNK = 500
+
     def __init__ (self, iface):
         self.iface = iface
+        self.task = None
+        self._feedback = None
+        self._tracker = ChangeTracker()
+        self._state = None                  # previous run: parameters + snapshot
+        self._emitted = {}                  # error layer id -> {error fid: (sources, error key)}
+        self._only = None
+        self.stats = None                   # RunStats of the last run
+        self._options = {"denum": None, "rules": None, "scope": "layer",  # last dialog choices
+                         "save_report": False}
 
     # ------------------------------------------------------------------
     #  Public API
@@ -45,8 +88,15 @@ class VectorVerifier:
                stalp_layer_name: str = "STALP_JT",
                brans_layer_name: str = "BRANS_FIRI_GRPM_JT",
                tronson_layer_name: str = "TRONSON_JT",
-               tolerance: float | None = None) -> None:
-        """Runs the full validation routine.
+               tolerance: float | None = None,
+               on_finished=None,
+               report_dir: str | None = None,
+               cache_dir: str | None = None) -> None:
+        """Asks for the run options and validates in a background QgsTask.
+
+        The options dialog picks the LINIE_JT DENUM, the rules to run, the area
+        checked – the whole layers, the current map extent or the selected features –
+        and whether the timing report is saved to *report_dir*.
 
         Parameters
         ----------
@@ -55,30 +105,19 @@ class VectorVerifier:
         tolerance : float, optional
             Snapping tolerance in the layer units.  If *None* (default) the
             algorithm falls back to 0.01 × the layer‑coordinate reference
-            system unit (≈ 1 cm for metric CRS ≃ EPSG:3844 or EPSG:3857).
+            system unit (≈ 1 cm for metric CRS ≃ EPSG:3844 or EPSG:3857).
+        on_finished : callable, optional
+            Called on the main thread as ``on_finished(ok, exception)`` once the
+            task ends; *ok* is False when it failed or was cancelled.
+        report_dir : str, optional
+            Directory that receives the per-rule timing report as JSON when the
+            user ticks it in the options dialog; the report always goes to the
+            log panel.
+        cache_dir : str, optional
+            Directory of the on-disk result cache; no caching when None.
         """
-        self.helper = HelperBase()
-        self._proj = QgsProject.instance()
-        self._stalp = self._get_vector(stalp_layer_name, QgsWkbTypes.PointGeometry)
-        self._brans = self._get_vector(brans_layer_name, QgsWkbTypes.LineGeometry)
-        self._tronson = self._get_vector(tronson_layer_name, QgsWkbTypes.LineGeometry)
-
-        if tolerance is None:
-            # loose heuristic
-            tolerance = 0.01
-
-        self._tol = tolerance
-
-        # Spatial indices for speed
-        self._idx_brans = QgsSpatialIndex(self._brans.getFeatures())
-        self._idx_tronson = QgsSpatialIndex(self._tronson.getFeatures())
-        self._idx_stalp = QgsSpatialIndex(self._stalp.getFeatures())
-
-        # Prepare error layers
-        self._init_error_layers()
-        
         # get the values from layer LINIA_JT - DENUM and have the user choose it from a dropdown
-        linia_jt_layer = self._proj.mapLayersByName("LINIE_JT")
+        linia_jt_layer = QgsProject.instance().mapLayersByName("LINIE_JT")
         if not linia_jt_layer:
             QgsMessageLog.logMessage("Layer 'LINIE_JT' not found in the project", "VectorVerifier", level=Qgis.Critical)
             return
@@ -90,36 +129,244 @@ class VectorVerifier:
                 linia_jt_values.add(denum)
                 
         # keep the list deterministic & human-friendly
-        linia_jt_choices = sorted(linia_jt_values)
-
-        self.linia_jt_val, ok = QInputDialog.getItem(
-            self.iface.mainWindow(),                # parent – QGIS main window
-            "Selectează denumirea liniei JT",                # dialog title
-            "DENUM:",                               # label
-            linia_jt_choices,                       # items shown in the drop-down
-            0,                                      # initially selected index
-            False                                   # editable?  False = fixed list
-        )
+        linia_jt_choices = sorted(str(v) for v in linia_jt_values)
 
-        if not ok:          # user hit Cancel or closed the dialog
+        has_selection = any(
+            layer.selectedFeatureCount()
+            for name in (stalp_layer_name, brans_layer_name, tronson_layer_name)
+            for layer in QgsProject.instance().mapLayersByName(name)
+        )
+        dialog = VerifyOptionsDialog(
+            self.iface.mainWindow(),
+            linia_jt_choices,
+            [label for label, _ in self.RULES],
+            has_selection,
+            **self._options
+        )
+        if not dialog.exec_():          # user hit Cancel or closed the dialog
             return
+        self._options = {"denum": dialog.denum(), "rules": dialog.rules(), "scope": dialog.scope(),
+                         "save_report": dialog.save_report()}
+
+        canvas = self.iface.mapCanvas()
+        extent = QgsReferencedRectangle(canvas.extent(), canvas.mapSettings().destinationCrs())
+
+        self.prepare(stalp_layer_name, brans_layer_name, tronson_layer_name,
+                     tolerance, dialog.denum(), report_dir if dialog.save_report() else None,
+                     rules=dialog.rules(), scope=dialog.scope(), extent=extent,
+                     cache_dir=cache_dir)
+
+        self.task = VectorVerifierTask(self, on_finished)
+        QgsApplication.taskManager().addTask(self.task)
 
-        # Perform the five groups of checks
-        self._rule1_snapping()
-        self._rule2_tip_cir_br()
-        self._rule3_tip_cir_jt()
-        self._rule4_terminal_br()
-        self._rule5_terminal_tronson()
-        self._rule6_intindere()
-        self._rule7_rupere_cond()
-
-        # Commit & add layers to the project
-        self._erori_stalp.commitChanges()
-        self._erori_line.commitChanges()
-        self.helper.add_layer_to_de_verificat(self._erori_stalp)
-        self.helper.add_layer_to_de_verificat(self._erori_line)
+    def is_running(self) -> bool:
+        if self.task is None:
+            return False
+        try:
+            return self.task.status() in (QgsTask.Queued, QgsTask.OnHold, QgsTask.Running)
+        except RuntimeError:                # the task manager already deleted it
+            self.task = None
+            return False
+
+    def prepare(self,
+                stalp_layer_name: str = "STALP_JT",
+                brans_layer_name: str = "BRANS_FIRI_GRPM_JT",
+                tronson_layer_name: str = "TRONSON_JT",
+                tolerance: float | None = None,
+                linia_jt_val: str | None = None,
+                report_dir: str | None = None,
+                rules=None,
+                scope: str = "layer",
+                extent: QgsRectangle | None = None,
+                cache_dir: str | None = None) -> None:
+        """Main-thread set-up: resolves the layers and detaches thread-safe copies.
+
+        *rules* are rule numbers (1 = first entry of RULES), all of them when None.
+        *scope* is "layer", "extent" (*extent*, in the STALP_JT CRS unless it is a
+        QgsReferencedRectangle) or "selection" (the features selected on the three
+        layers).  Only the features in scope are evaluated; their neighbours within
+        tolerance are still read so the contacts at the border are right.
+        With a *cache_dir* the results are looked up in / saved to a ResultCache.
+        """
+        self.helper = HelperBase()
+        self._proj = QgsProject.instance()
+        self._stalp = self._get_vector(stalp_layer_name, QgsWkbTypes.PointGeometry)
+        self._brans = self._get_vector(brans_layer_name, QgsWkbTypes.LineGeometry)
+        self._tronson = self._get_vector(tronson_layer_name, QgsWkbTypes.LineGeometry)
+
+        if tolerance is None:
+            # loose heuristic
+            tolerance = DEFAULT_TOLERANCE
+
+        self._tol = tolerance
+        self.linia_jt_val = linia_jt_val
+        self.report_dir = report_dir
+        # read here – _report_stats() runs in the task and must not touch the layer
+        self._dataset_source = self._stalp.source()
+        self._rules = self._pick_rules(rules)
+        self._scope_rect, self._focus = self._resolve_scope(scope, extent)
+
+        self._sources = (DetachedLayer(self._stalp),
+                         DetachedLayer(self._brans),
+                         DetachedLayer(self._tronson))
+        self._sink = ErrorSink()
+
+        # incremental run when nothing but some features changed since the last one
+        self._params = (self._stalp.id(), self._brans.id(), self._tronson.id(),
+                        self._tol, self.linia_jt_val, tuple(self._rules), scope,
+                        None if self._scope_rect is None else self._scope_rect.asWktPolygon(),
+                        None if self._focus is None else
+                        tuple(sorted((k, frozenset(v)) for k, v in self._focus.items())))
+        dirty = self._tracker.take()
+        self._incremental = (self._state is not None
+                             and self._state["params"] == self._params
+                             and self._tracker.valid
+                             and self._error_layers_alive())
+        self._dirty = dirty if self._incremental else None
+        self._prev_net = self._state["net"] if self._incremental else None
+        self._prev_key = self._state["key"] if self._incremental else None
+        self._only = None
+
+        # file stamps must be read here; layers without one are hashed in run()
+        self._cache = ResultCache(cache_dir) if cache_dir else None
+        self._stamps = (None if self._cache is None else
+                        [ResultCache.file_stamp(l) for l in (self._stalp, self._brans, self._tronson)])
+        self._key = None
+        self._cached = False
+        # a cancelled or failed run leaves nothing to build on
+        self._state = None
+
+        if not self._incremental:
+            self._tracker.unwatch_all()
+            self._tracker = ChangeTracker()
+        # edits made while the task runs count for the next run
+        self._tracker.watch("STALP_JT", self._stalp)
+        self._tracker.watch("BRANS_FIRI_GRPM_JT", self._brans)
+        self._tracker.watch("TRONSON_JT", self._tronson)
+
+    def run(self, feedback=None) -> bool:
+        """Builds the snapshot and runs every rule.  Safe to call from a QgsTask.
+
+        *feedback* only needs ``setProgress(float)`` and ``isCanceled()`` – the task
+        itself is passed.  Returns False when cancelled.
+        """
+        self._feedback = feedback
+        self._progress_span = (0.0, 20.0)
+        self.stats = stats = RunStats()
+
+        if self._cache is not None:
+            with stats.phase("Cache rezultate") as phase:
+                # layer ids change between sessions – the file stamps identify the data
+                self._key = ResultCache.fingerprint(self._params[3:], self._stamps, self._sources)
+                if self._incremental and self._key == self._prev_key:
+                    # nothing changed: publish() keeps the error layers as they are
+                    self._net, self._only = self._prev_net, {}
+                    self._cached = True
+                else:
+                    sink = self._cache.load(self._key)
+                    if sink is not None:
+                        self._sink, self._net = sink, None
+                        self._incremental, self._cached = False, True
+                phase["errors"] = len(self._sink)
+            if self._cached:
+                self._report_stats()
+                return True
+
+        # One provider pass per layer – every rule reads from this snapshot
+        with stats.phase("Citire straturi") as phase:
+            # contacts of the edited features before the edit, while they are still there
+            before = (self._neighbourhood(self._prev_net, self._dirty)
+                      if self._prev_net is not None else None)
+            if self._prev_net is not None and self._scope_rect is None:
+                # incremental run over whole layers: only the edited features are read again
+                self._net = self._prev_net
+                self._net.refresh(*self._sources, self._dirty)
+            else:
+                load_rect = None
+                if self._scope_rect is not None:
+                    load_rect = NetworkSnapshot.reach(self._sources, self._scope_rect, self._tol)
+                self._net = NetworkSnapshot(*self._sources, rect=load_rect)
+            phase["fetches"] = self._net.features_read
+        if self._canceled():
+            return False
+        self._set_progress(20.0)
+        with stats.phase("Adiacență stâlp ↔ linie"):
+            # pole ↔ line contacts shared by rules 1, 2, 3, 5 and 6
+            self._net.build_adjacency(self._tol)
+            # endpoint hash grids for the terminal checks of rules 4 and 5
+            self._net.build_endpoint_grids(self._tol)
+            focus = self._focus
+            if focus is None and self._scope_rect is not None:
+                focus = self._net.within(self._scope_rect)
+            only = None
+            if self._dirty is not None:
+                # ... and after it
+                only = self._neighbourhood(self._net, self._dirty)
+                for name, fids in before.items():
+                    only[name] |= fids
+            self._only = self._limit(only, focus)
+        self._set_progress(30.0)
+
+        # Perform the groups of checks, each one owning an equal slice of the bar
+        step = 70.0 / len(self._rules)
+        for i, (label, method) in enumerate(self._rules):
+            if self._canceled():
+                return False
+            self._progress_span = (30.0 + i * step, 30.0 + (i + 1) * step)
+            self._set_progress(self._progress_span[0])
+            QgsMessageLog.logMessage(label, "VectorVerifier", level=Qgis.Info)
+            with stats.phase(label) as phase:
+                lookups, errors = self._net.lookups(), len(self._sink)
+                getattr(self, method)()
+                phase["lookups"] = self._net.lookups() - lookups
+                phase["errors"] = len(self._sink) - errors
+
+        if self._canceled():
+            return False
+        if self._cache is not None and not self._incremental:
+            self._cache.store(self._key, self._sink)
+        self._report_stats()
+        return True
+
+    def publish(self) -> None:
+        """Main thread: adds the error layers to DE_VERIFICAT.
+
+        After an incremental run the existing layers are patched in place.
+        """
+        if self._incremental:
+            # the re-evaluated features no longer vouch for their old errors; an error
+            # goes away once none of the features that reported it does any more
+            rechecked = {(name, fid) for name, fids in self._only.items() for fid in fids}
+            for layer, kind in ((self._erori_stalp, "point"), (self._erori_line, "line")):
+                stale = []
+                for fid, (sources, _) in self._emitted.get(layer.id(), {}).items():
+                    sources -= rechecked
+                    if not sources:
+                        stale.append(fid)
+                self._write_errors(layer, kind, stale)
+        else:
+            self.build_error_layers()
+
+            # add layers to the project
+            self.helper.add_layer_to_de_verificat(self._erori_stalp)
+            self.helper.add_layer_to_de_verificat(self._erori_line)
+
+        # from now on only the edits matter for the next run – unless the errors
+        # came from the disk cache, which leaves no snapshot to diff against
+        self._state = (None if self._net is None else
+                       {"params": self._params, "net": self._net, "key": self._key})
+        self._prev_net = None
         
 
+    def build_error_layers(self) -> tuple:
+        """Fresh *erori_stalp* / *erori_brans_tronson* memory layers holding the
+        errors of the last ``run()``, without touching the project."""
+        self._init_error_layers()
+        self._emitted = {}
+        self._write_errors(self._erori_stalp, "point")
+        self._write_errors(self._erori_line, "line")
+        return self._erori_stalp, self._erori_line
+
     # ------------------------------------------------------------------
     #  Internal helpers
     # ------------------------------------------------------------------
@@ -134,127 +381,244 @@ class VectorVerifier:
                 f"expected {QgsWkbTypes.displayString(expected_geom_type)}")
         return layer
 
-    def _init_error_layers(self) -> None:
+    @staticmethod
+    def _error_fields() -> QgsFields:
         fields = QgsFields()
         fields.append(QgsField("NUME_LAYER", QVariant.String))
         fields.append(QgsField("FID", QVariant.Int))
         fields.append(QgsField("TIP_EROARE", QVariant.String))
         fields.append(QgsField("DETALII", QVariant.String))
+        return fields
+
+    def _init_error_layers(self) -> None:
+        fields = self._error_fields()
 
         crs = self._stalp.crs()  # use the point layer CRS for both
         self._erori_stalp = QgsVectorLayer(f"Point?crs={crs.authid()}", "erori_stalp", "memory")
         self._erori_stalp.dataProvider().addAttributes(fields)
         self._erori_stalp.updateFields()
-        self._erori_stalp.startEditing()
 
         self._erori_line = QgsVectorLayer(f"LineString?crs={crs.authid()}", "erori_brans_tronson", "memory")
         self._erori_line.dataProvider().addAttributes(fields)
         self._erori_line.updateFields()
-        self._erori_line.startEditing()
+
+    def _write_errors(self, layer: QgsVectorLayer, kind: str, stale_ids=()) -> None:
+        """Replaces *stale_ids* with the sink's *kind* records on the provider and
+        remembers every feature that reported each error.  Errors still present in
+        the layer are not written a second time – they only gain the new sources.
+        Keyed by layer id, so an error layer renamed by the user is still patched."""
+        emitted = self._emitted.setdefault(layer.id(), {})
+        if stale_ids:
+            layer.dataProvider().deleteFeatures(list(stale_ids))
+            for fid in stale_ids:
+                emitted.pop(fid, None)
+        kept = {key: fid for fid, (_, key) in emitted.items()}
+        for record in self._sink.records(kind):
+            key = ErrorSink.key(record)
+            if key in kept:
+                emitted[kept[key]][0].update(self._sink.sources(kind, key))
+        for fid, record in self._sink.write(layer, kind, skip=kept):
+            key = ErrorSink.key(record)
+            emitted[fid] = (set(self._sink.sources(kind, key)), key)
+        layer.updateExtents()
+        layer.triggerRepaint()
+
+    def _pick_rules(self, rules) -> list:
+        if rules is None:
+            return list(self.RULES)
+        picked = [self.RULES[n - 1] for n in sorted(set(rules)) if 1 <= n <= len(self.RULES)]
+        if not picked:
+            raise ValueError("Nicio regulă selectată pentru verificare")
+        return picked
+
+    def _resolve_scope(self, scope: str, extent: QgsRectangle | None) -> tuple:
+        """``(rectangle to load around, {layer name: fids} to evaluate)`` for *scope*.
+
+        The fids are left None for an extent – they are known once the snapshot is read.
+        """
+        layers = {"STALP_JT": self._stalp, "BRANS_FIRI_GRPM_JT": self._brans,
+                  "TRONSON_JT": self._tronson}
+        if scope == "layer":
+            return None, None
+
+        if scope == "extent":
+            if extent is None:
+                raise ValueError("Lipsește extinderea pentru verificare")
+            rect = QgsRectangle(extent)
+            if isinstance(extent, QgsReferencedRectangle) and extent.crs().isValid():
+                transform = QgsCoordinateTransform(extent.crs(), self._stalp.crs(), self._proj)
+                rect = transform.transformBoundingBox(rect)
+            return rect, None
+
+        if scope == "selection":
+            focus = {name: set(layer.selectedFeatureIds()) for name, layer in layers.items()}
+            if not any(focus.values()):
+                raise ValueError("Nu există entități selectate în STALP_JT, BRANS_FIRI_GRPM_JT sau TRONSON_JT")
+            rect = None
+            for name, layer in layers.items():
+                if focus[name]:
+                    box = layer.boundingBoxOfSelected()
+                    if rect is None:
+                        rect = QgsRectangle(box)
+                    else:
+                        rect.combineExtentWith(box)
+            return rect, focus
+
+        raise ValueError(f"Zonă de verificare necunoscută: {scope}")
+
+    def _error_layers_alive(self) -> bool:
+        try:
+            return all(QgsProject.instance().mapLayer(layer.id()) is not None
+                       for layer in (self._erori_stalp, self._erori_line))
+        except (AttributeError, RuntimeError):      # never created / already deleted
+            return False
 
     # ------------------------------------------------------------------
-    #  Error‑record helpers
+    #  Incremental scope
     # ------------------------------------------------------------------
-    def _add_err_point(self, geom: QgsGeometry, layer_name: str, fid: int, tip: str, det: str):
-        f = QgsFeature(self._erori_stalp.fields())
-        f.setGeometry(geom)
-        f.setAttribute("NUME_LAYER", layer_name)
-        f.setAttribute("FID", fid)
-        f.setAttribute("TIP_EROARE", tip)
-        f.setAttribute("DETALII", det)
-        try:
-            self._erori_stalp.addFeature(f)
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Failed to add error point feature: {e}",
-                "DesenAssist",
-                level=Qgis.Critical
-            )
+    @staticmethod
+    def _neighbourhood(net: NetworkSnapshot, dirty: dict) -> dict:
+        """Edited features plus every feature touching them in *net* – run it on the
+        snapshot before the edit and on the one after."""
+        poles = set(dirty.get("STALP_JT", ()))
+        tronson = set(dirty.get("TRONSON_JT", ()))
+        brans = set(dirty.get("BRANS_FIRI_GRPM_JT", ()))
+        only = {"STALP_JT": set(poles), "TRONSON_JT": set(tronson), "BRANS_FIRI_GRPM_JT": set(brans)}
+
+        for pid in poles:
+            only["TRONSON_JT"].update(t.fid for t in net.pole_tronson.get(pid, ()))
+            only["BRANS_FIRI_GRPM_JT"].update(t.fid for t in net.pole_brans.get(pid, ()))
+        for lid in tronson:
+            only["STALP_JT"].update(t.fid for t in net.tronson_poles.get(lid, ()))
+        for lid in brans:
+            only["STALP_JT"].update(t.fid for t in net.brans_poles.get(lid, ()))
+        return only
+
+    @staticmethod
+    def _limit(only: dict | None, focus: dict | None) -> dict | None:
+        """Intersection of two ``{layer name: fids}`` scopes, None meaning everything."""
+        if focus is None:
+            return only
+        if only is None:
+            return {name: set(fids) for name, fids in focus.items()}
+        return {name: only.get(name, set()) & fids for name, fids in focus.items()}
+
+    def _scoped(self, layer_name: str, records: dict) -> list:
+        """The records a rule has to evaluate – all of them on a full run."""
+        if self._only is None:
+            return list(records.values())
+        return [records[fid] for fid in self._only.get(layer_name, ()) if fid in records]
+
+    # ------------------------------------------------------------------
+    #  Progress & cancellation
+    # ------------------------------------------------------------------
+    def _canceled(self) -> bool:
+        return self._feedback is not None and self._feedback.isCanceled()
+
+    def _set_progress(self, value: float) -> None:
+        if self._feedback is not None:
+            self._feedback.setProgress(value)
+
+    def _each(self, items):
+        """Yields *items*, reporting progress inside the current rule's slice every
+        CHUNK features and stopping early once the task is cancelled."""
+        self.stats.count("visited", len(items))
+        total = max(len(items), 1)
+        lo, hi = self._progress_span
+        for i, item in enumerate(items):
+            if i % self.CHUNK == 0:
+                if self._canceled():
+                    return
+                self._set_progress(lo + (hi - lo) * i / total)
+            yield item
+
+    # ------------------------------------------------------------------
+    #  Statistics
+    # ------------------------------------------------------------------
+    def _report_stats(self) -> None:
+        """Logs the per-rule timing table and, with a report_dir, saves it as JSON."""
+        net = self._net
+        if self._cached:
+            summary = "rezultate reutilizate din cache"
+        else:
+            summary = (f"{len(net.poles)} stâlpi, {len(net.brans)} branșamente, "
+                       f"{len(net.tronson)} tronsoane")
+        QgsMessageLog.logMessage(
+            f"Statistici verificare ({summary}):\n{self.stats.report()}",
+            "VectorVerifier", level=Qgis.Info)
+        if not self.report_dir:
             return
 
-    def _add_err_line(self, geom: QgsGeometry, layer_name: str, fid: int, tip: str, det: str):
-        f = QgsFeature(self._erori_line.fields())
-        f.setGeometry(geom)
-        f.setAttribute("NUME_LAYER", layer_name)
-        f.setAttribute("FID", fid)
-        f.setAttribute("TIP_EROARE", tip)
-        f.setAttribute("DETALII", det)
+        stamp = datetime.now()
+        # the STALP_JT file names the dataset, so runs in one folder stay apart
+        dataset = os.path.splitext(os.path.basename(self._dataset_source.split("|")[0]))[0]
+        path = os.path.join(self.report_dir,
+                            f"statistici_verificare_{dataset}_{stamp:%Y%m%d_%H%M%S}.json")
         try:
-            self._erori_line.addFeature(f)
-        except Exception as e:
-            QgsMessageLog.logMessage(
-                f"Failed to add error line feature: {e}",
-                "DesenAssist",
-                level=Qgis.Critical
+            self.stats.write_json(
+                path,
+                dataset=self._dataset_source,
+                timestamp=stamp.isoformat(timespec="seconds"),
+                tolerance=self._tol,
+                linia_jt=self.linia_jt_val,
+                incremental=self._incremental,
+                cached=self._cached,
+                features=None if net is None else
+                         {"STALP_JT": len(net.poles),
+                          "BRANS_FIRI_GRPM_JT": len(net.brans),
+                          "TRONSON_JT": len(net.tronson)},
             )
-            return        
+        except OSError as e:
+            QgsMessageLog.logMessage(f"Nu s-au putut salva statisticile în {path}: {e}",
+                                     "VectorVerifier", level=Qgis.Warning)
 
     # ------------------------------------------------------------------
-    #  Geometry utilities
+    #  Error‑record helpers
     # ------------------------------------------------------------------
-    def _nearest_lines(self, point: QgsPointXY, index: QgsSpatialIndex, layer: QgsVectorLayer):
-        ids = index.nearestNeighbor(point, 5)
-        for fid in ids:
-            feat = layer.getFeature(fid)
-            if feat.geometry().distance(QgsGeometry.fromPointXY(point)) <= self._tol:
-                yield feat
+    # *source* is the feature whose evaluation produced the error – by default the
+    # feature the error is reported on.  Records stay plain tuples until publish().
+    def _add_err_point(self, geom: QgsGeometry, layer_name: str, fid: int, tip: str, det: str, source=None):
+        self._sink.add("point", source or (layer_name, fid), geom, layer_name, fid, tip, det)
+
+    def _add_err_line(self, geom: QgsGeometry, layer_name: str, fid: int, tip: str, det: str, source=None):
+        self._sink.add("line", source or (layer_name, fid), geom, layer_name, fid, tip, det)
 
     # ------------------------------------------------------------------
     #  RULE 1 – snapping of STALP_JT to either BRANS or TRONSON
     # ------------------------------------------------------------------
     def _rule1_snapping(self):
+        net = self._net
 
         # ---------------- 1. STALP must touch either BRANS or TRONSON ------------
-        for feat in self._stalp.getFeatures():
-            pt = feat.geometry().asPoint()                       # STALP is point ✓
-            snapped_to_brans   = any(self._nearest_lines(pt,  self._idx_brans,   self._brans))
-            snapped_to_tronson = any(self._nearest_lines(pt,  self._idx_tronson, self._tronson))
+        for pole in self._each(self._scoped("STALP_JT", net.poles)):
+            snapped_to_brans   = bool(net.pole_brans.get(pole.fid))
+            snapped_to_tronson = bool(net.pole_tronson.get(pole.fid))
 
             if not (snapped_to_brans or snapped_to_tronson):
                 self._add_err_point(
-                    feat.geometry(), "STALP_JT", feat.id(),
+                    pole.geom, "STALP_JT", pole.fid,
                     "STALP fără legătură",
                     "Nu este ‘snapped’ nici la BRANS_FIRI_GRPM_JT, nici la TRONSON_JT"
                 )
 
-        # ------- helper: stream every vertex of a (multi)-line, one by one -------
-        def _vertices(g):
-            """Yield all vertex points from a (multi)-LineString geometry."""
-            if g.isMultipart():
-                for part in g.asMultiPolyline():
-                    for v in part:
-                        yield v
-            else:
-                for v in g.asPolyline():
-                    yield v
-            # If you’re on QGIS ≥3.34 you can replace the whole block with:
-            #   yield from g.vertices()
-
         # ---------------- 2. each BRANS must snap to at least one STALP ----------
-        for feat in self._brans.getFeatures():
-            if feat["TIP_COND"].upper() != "ACYABY 4x16":
-                snapped = False
-                for v in _vertices(feat.geometry()):
-                    if any(self._nearest_lines(v, self._idx_stalp, self._stalp)):
-                        snapped = True
-                        break                        # one hit is enough
+        for line in self._each(self._scoped("BRANS_FIRI_GRPM_JT", net.brans)):
+            if (line.attrs["TIP_COND"] or "").upper() != "ACYABY 4x16":
+                # a STALP sitting on one of the vertices is enough
+                snapped = any(t.at_vertex for t in net.brans_poles.get(line.fid, ()))
                 if not snapped:
                     self._add_err_line(
-                        feat.geometry(), "BRANS_FIRI_GRPM_JT", feat.id(),
+                        line.geom, "BRANS_FIRI_GRPM_JT", line.fid,
                         "BRANS fără legătură",
                         "Nu este ‘snapped’ la STALP_JT"
                     )
 
         # ---------------- 3. each TRONSON must snap to at least one STALP -------
-        for feat in self._tronson.getFeatures():
-            snapped = False
-            for v in _vertices(feat.geometry()):
-                if any(self._nearest_lines(v, self._idx_stalp, self._stalp)):
-                    snapped = True
-                    break
+        for line in self._each(self._scoped("TRONSON_JT", net.tronson)):
+            snapped = any(t.at_vertex for t in net.tronson_poles.get(line.fid, ()))
             if not snapped:
                 self._add_err_line(
-                    feat.geometry(), "TRONSON_JT", feat.id(),
+                    line.geom, "TRONSON_JT", line.fid,
                     "TRONSON fără legătură",
                     "Nu este ‘snapped’ la STALP_JT"
                 )
@@ -264,18 +628,17 @@ class VectorVerifier:
     #  RULE 2 – TIP_CIR ↔ ‘BR’ consistency
     # ------------------------------------------------------------------
     def _rule2_tip_cir_br(self):
-        for feat in self._stalp.getFeatures():
-            pt = feat.geometry().asPoint()
-            intersects_br = any(self._nearest_lines(pt, self._idx_brans, self._brans))
-            tip_cir: str = feat["TIP_CIR"] or ""
+        for pole in self._each(self._scoped("STALP_JT", self._net.poles)):
+            intersects_br = bool(self._net.pole_brans.get(pole.fid))
+            tip_cir: str = pole.attrs["TIP_CIR"] or ""
             has_br = "BR" in tip_cir.upper()
 
             if intersects_br and not has_br:
-                self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "TIP_CIR lipsă BR",
                                     "Intersecție cu BRANS_FIRI_GRPM_JT dar ‘BR’ nu este inclus în TIP_CIR")
             if (not intersects_br) and has_br:
-                self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "TIP_CIR conține BR fără intersecție",
                                     "‘BR’ prezent în TIP_CIR dar nu intersectează BRANS_FIRI_GRPM_JT")
 
@@ -283,20 +646,18 @@ class VectorVerifier:
     #  RULE 3 – TIP_CIR ↔ ‘JT’ consistency (numeric DENUM on TRONSON)
     # ------------------------------------------------------------------
     def _rule3_tip_cir_jt(self):
-        for feat in self._stalp.getFeatures():
-            pt = feat.geometry().asPoint()
-            jtronson_feats = [tr for tr in self._nearest_lines(pt, self._idx_tronson, self._tronson)
-                              if self._denum_is_numeric(feat["DENUM"])]
-            intersects_jt = bool(jtronson_feats)
-            tip_cir: str = feat["TIP_CIR"] or ""
+        for pole in self._each(self._scoped("STALP_JT", self._net.poles)):
+            intersects_jt = bool(self._net.pole_tronson.get(pole.fid)) \
+                            and self._denum_is_numeric(pole.attrs["DENUM"])
+            tip_cir: str = pole.attrs["TIP_CIR"] or ""
             has_jt = "JT" in tip_cir.upper()
 
             if intersects_jt and not has_jt:
-                self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "TIP_CIR lipsă JT",
                                     "Intersectează TRONSON_JT cu DENUM numeric, dar ‘JT’ lipsește din TIP_CIR")
             if (not intersects_jt) and has_jt:
-                self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "TIP_CIR conține JT fără intersecție",
                                     "‘JT’ în TIP_CIR dar nu intersectează TRONSON_JT numeric")
 
@@ -308,28 +669,14 @@ class VectorVerifier:
     #  RULE 4 – terminal BRANS endpoints & TIP_LEG_JT
     # ------------------------------------------------------------------
     def _rule4_terminal_br(self):
-        # Determine BRANS endpoints that are not shared with another line
-        end_pts = {}
-        for feat in self._brans.getFeatures():
-            geom = feat.geometry()
-            start_pt = QgsPointXY(geom.constGet().pointN(0))
-            end_pt = QgsPointXY(geom.constGet().pointN(geom.constGet().numPoints() - 1))
-            for p in (start_pt, end_pt):
-                key = (round(p.x(), 6), round(p.y(), 6))
-                end_pts[key] = end_pts.get(key, 0) + 1
-
-        terminal_coords = {k for k, v in end_pts.items() if v == 1}  # degree 1 -> terminal
-
-        for feat in self._stalp.getFeatures():
-            pt = feat.geometry().asPoint()
-            snapped_to_terminal_br = False
-            for coord in terminal_coords:
-                term_pt = QgsPointXY(*coord)
-                if QgsGeometry.fromPointXY(term_pt).distance(QgsGeometry.fromPointXY(pt)) <= self._tol:
-                    snapped_to_terminal_br = True
-                    break
-            if snapped_to_terminal_br and str(feat["TIP_LEG_JT"]).strip().lower() in ["t", "t/d"] and self._contains_letters(feat["DENUM"]):
-                self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+        # BRANS endpoints not shared with another line have degree 1 -> terminal
+        brans_ends = self._net.brans_ends
+
+        for pole in self._each(self._scoped("STALP_JT", self._net.poles)):
+            pt = pole.point
+            snapped_to_terminal_br = bool(brans_ends.terminal_near(pt.x(), pt.y()))
+            if snapped_to_terminal_br and str(pole.attrs["TIP_LEG_JT"]).strip().lower() in ["t", "t/d"] and self._contains_letters(pole.attrs["DENUM"]):
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "Terminal BR greșit",
                                     "STÂLP terminal cu litere în DENUM pe BRANS și TIP_LEG_JT = t / t/d")
 
@@ -349,94 +696,57 @@ class VectorVerifier:
             "tyir 2x25al",
         }
 
-        tol  = self._tol
-        tron = self._tronson
-        poles = self._stalp
-
-        # ---------- 0. speed helpers ----------
-        get_pole     = poles.getFeature
-        get_tronson  = tron.getFeature
-
-        # ---------- 1. map TRONSON id -> its two end-points ----------
-        tron_endpts = {}                          # fid -> {QgsPointXY, QgsPointXY}
-        for f in tron.getFeatures():
-            g = f.geometry().constGet()
-            tron_endpts[f.id()] = (
-                QgsPointXY(g.pointN(0)),
-                QgsPointXY(g.pointN(g.numPoints()-1)),
-            )
+        net   = self._net
+        poles = net.poles
 
-        # ---------- 1.5. orphan-endpoint sweep (capăt de TRONSON fără STÂLP) ----------
-        for tid, (p0, p1) in tron_endpts.items():
-            for pt in (p0, p1):
-                #  a tiny bbox query keeps the candidate list microscopic
-                bb_ids = self._idx_stalp.intersects(QgsRectangle(
-                    pt.x() - tol, pt.y() - tol, pt.x() + tol, pt.y() + tol))
-
-                has_pole = any(
-                    poles.getFeature(pid).geometry().intersects(
-                        QgsGeometry.fromPointXY(pt))
-                    for pid in bb_ids
-                )
-                err_geom = tron.getFeature(tid).geometry()
-                if not has_pole:
+        # ---------- 1. orphan-endpoint sweep (capăt de TRONSON fără STÂLP) ----------
+        for line in self._each(self._scoped("TRONSON_JT", net.tronson)):
+            tid = line.fid
+            for pt in line.ends:
+                #  O(1) look-up in the tolerance grid of poles
+                if not net.pole_grid.has_near(pt.x(), pt.y()):
                     self._add_err_line(
-                        err_geom, "TRONSON_JT", tid,
+                        line.geom, "TRONSON_JT", tid,
                         "Sfârșit tronson fără STÂLP",
                         "Capăt de TRONSON fără STALP_JT corespunzător",
                     )
 
-        # ---------- 2. map STALP id -> [intersecting TRONSON ids] ----------
-        poles_touching = defaultdict(list)
-        for tf in tron.getFeatures():
-            bb = tf.geometry().boundingBox()
-            for pid in self._idx_stalp.intersects(bb):
-                pf = get_pole(pid)
-                if tf.geometry().intersects(pf.geometry()):
-                    poles_touching[pid].append(tf.id())
-
+        # ---------- 2. STALP id -> [touching TRONSON] comes from the adjacency table ----------
         # ---------- 3. evaluate each pole that has exactly one hit ----------
-        for pid, tron_ids in poles_touching.items():
-            if len(tron_ids) != 1:
+        for pf in self._each(self._scoped("STALP_JT", poles)):
+            pid = pf.fid
+            touches = net.pole_tronson.get(pid, ())
+            if len(touches) != 1:
                 continue                                    # pole is a node, not a terminal
 
-            tid  = tron_ids[0]
-            pf   = get_pole(pid)
-            tf   = get_tronson(tid)
-
-            pole_geom   = pf.geometry()
-            t_end_0, t_end_1 = tron_endpts[tid]
-
+            touch = touches[0]
             # is the pole geometry coincident with *one* of the two end vertices?
-            if not (
-                pole_geom.intersects(QgsGeometry.fromPointXY(t_end_0).buffer(tol, 1)) or
-                pole_geom.intersects(QgsGeometry.fromPointXY(t_end_1).buffer(tol, 1))
-            ):
+            if not touch.at_endpoint:
                 continue                                    # touches mid-span → ignore
 
+            tf   = net.tronson[touch.fid]
+            pole_geom = pf.geom
+
             # ------------ 4. now you KNOW it's a dangling endpoint ------------
-            tip_leg = str(pf['TIP_LEG_JT']).strip().lower()
+            tip_leg = str(pf.attrs['TIP_LEG_JT']).strip().lower()
             cond_list = [
-                str(tf['TIP_COND']).strip().lower()
+                str(tf.attrs['TIP_COND']).strip().lower()
             ]
 
             # --- 4.a “one BRANS BMPM/BMPT” sub-rule ----------
-            br_hits = [
-                self._brans.getFeature(bid)
-                for bid in self._idx_brans.intersects(pole_geom.boundingBox())
-                if self._brans.getFeature(bid).geometry().intersects(pole_geom)
-            ]
+            br_hits = [net.brans[t.fid] for t in net.pole_brans.get(pid, ())]
 
             if len(br_hits) >= 1:
-                tip_firi = str(br_hits[0]['TIP_FIRI_BR']).strip().lower()
+                tip_firi = str(br_hits[0].attrs['TIP_FIRI_BR']).strip().lower()
                 if tip_firi in {'bmpm', 'bmpt'} \
                 and tip_leg not in ('t', 't/d') \
                 and all(c not in allowed_cond for c in cond_list):
                     self._add_err_point(
-                        pole_geom, "BRANS_FIRI_GRPM_JT", br_hits[0].id(),
+                        pole_geom, "BRANS_FIRI_GRPM_JT", br_hits[0].fid,
                         f"STÂLP intersectează o singură BRANS_FIRI_GRPM_JT "
                         f"cu TIP_FIRI_BR = ‘{tip_firi.upper()}’.",
-                        f"TIP_LEG_JT trebuie să fie ‘t’ sau ‘t/d’. Valoare actuală: {tip_leg}"
+                        f"TIP_LEG_JT trebuie să fie ‘t’ sau ‘t/d’. Valoare actuală: {tip_leg}",
+                        source=("STALP_JT", pid)
                     )
                     continue
 
@@ -444,96 +754,89 @@ class VectorVerifier:
     #  RULE 6 – Întindere (ramificare) – ≥3 intersects & wrong TIP_LEG_JT
     # ------------------------------------------------------------------
     def _rule6_intindere(self):
-        for feat in self._stalp.getFeatures():
-            pt = feat.geometry().asPoint()
+        for pole in self._each(self._scoped("STALP_JT", self._net.poles)):
             # count how many tronson features touch this pole
-            intersecting_trons = [tr for tr in self._nearest_lines(pt, self._idx_tronson, self._tronson)]
+            intersecting_trons = self._net.pole_tronson.get(pole.fid, ())
             if len(intersecting_trons) > 2:
-                tip_leg = str(feat["TIP_LEG_JT"] or "").lower().strip()
+                tip_leg = str(pole.attrs["TIP_LEG_JT"] or "").lower().strip()
                 if tip_leg not in ("ic", "ic/d"):
-                    self._add_err_point(feat.geometry(), "STALP_JT", feat.id(),
+                    self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                         "Întindere fără IC",
                                         f"STÂLP cu >2 TRONSON_JT dar TIP_LEG_JT ≠ ‘ic’/‘ic/d’. Valoare actuală: `{tip_leg.strip()}`")
                     
                     
     # ------------------------------------------------------------------
-    #  RULE 7 – Rupere conductor via processing model
+    #  RULE 7 – Rupere conductor: LINIA_JT must be split at every pole
     # ------------------------------------------------------------------
     def _rule7_rupere_cond(self):
-        """Runs the *1.2.RUPERE__CONDUCTOR* model and folds its two outputs straight
-        into the existing error layers instead of adding separate ones.
-
-        Assumptions
-        -----------
-        • The model outputs *conductorul_nu_e_rupt_la_cs*   (Point layer)
-        •                 and *conductorul_nu_e_rupt* (Line layer).
-        • Each output carries an **fid** attribute back‑linking to the source feature.
-        • A point record signals a *conductor rupture at pole*;  a line record signals
-          *conductor rupture on tronson* – both are considered errors.
+        """Native replacement of the *1.2.RUPERE__CONDUCTOR* Processing model.
+
+        A TRONSON_JT of the chosen LINIA_JT that reaches a STALP_JT anywhere but at
+        one of its two ends passes the pole without being split there.  Same two
+        output classes as the model:
+        • the pole   -> erori_stalp           ("Conductorul nu e rupt/întrerupt pe stâlp")
+        • the tronson -> erori_brans_tronson  ("Conductorul nu e rupt/întrerupt pe tronson")
+
+        Each error is emitted while evaluating the feature it is reported on, so an
+        incremental run always recomputes it completely.
         """
-        
-        params = {
-            "linia_jt": self.linia_jt_val,
-            "stalpi": self._stalp,
-            "tronson": self._tronson,
-            "conductorul_nu_e_rupt": QgsProcessing.TEMPORARY_OUTPUT,
-            "conductorul_nu_e_rupt_la_cs": QgsProcessing.TEMPORARY_OUTPUT,
-        }
-        try:
-            result = processing.run("model:1.2.RUPERE__CONDUCTOR", params)
-        except Exception as e:
-            QgsMessageLog.logMessage(f"Model RUPERE_CONDUCTOR failed: {e}", "VectorVerifier", level=Qgis.Critical)
-            return
+        net = self._net
+        linia = None if self.linia_jt_val is None else str(self.linia_jt_val).strip()
+
+        def on_linia(line):
+            return linia is None or str(line.attrs["LINIA_JT"]).strip() == linia
 
-        # ---- Point output -> erori_stalp ----------------------------------
-        pt_layer = result.get("conductorul_nu_e_rupt_la_cs")
-        if isinstance(pt_layer, QgsVectorLayer):
-            for f in pt_layer.getFeatures():
-                fid_link = f["fid"] if "fid" in pt_layer.fields().names() else f.id()
-                self._add_err_point(f.geometry(), "STALP_JT", fid_link,
+        # ---- poles crossed mid-span -> erori_stalp ------------------------
+        for pole in self._each(self._scoped("STALP_JT", net.poles)):
+            if any(not t.at_endpoint and on_linia(net.tronson[t.fid])
+                   for t in net.pole_tronson.get(pole.fid, ())):
+                self._add_err_point(pole.geom, "STALP_JT", pole.fid,
                                     "Rupere conductor",
                                     "Conductorul nu e rupt/întrerupt pe stâlp")
-        else:
-            QgsMessageLog.logMessage("Output 'conductorul_nu_e_rupt' is not a vector layer", "VectorVerifier", level=Qgis.Warning)
-
-        # ---- Line output -> erori_brans_tronson ---------------------------
-        line_layer = result.get("conductorul_nu_e_rupt")
-        if isinstance(line_layer, QgsVectorLayer):
-
-            # Build a quick lookup on first use – O(1) fetch later
-            use_attr = "fid" in self._tronson.fields().names()
-            tronson_index = {
-                (f["fid"] if use_attr else f.id()): f.geometry()
-                for f in self._tronson.getFeatures()
-            }
-
-            for f in line_layer.getFeatures():
-                fid_link = f["fid"] if "fid" in line_layer.fields().names() else f.id()
-
-                # Grab the original geometry
-                geom = tronson_index.get(fid_link)
-
-                # fall back to a flattened copy if we can’t
-                if geom is None:
-                    g = f.geometry()
-                    if g.isMultipart():                     # MultiLineString → first part
-                        parts = g.asMultiPolyline()
-                        geom = QgsGeometry.fromPolylineXY(parts[0])
-                    else:
-                        geom = g
 
+        # ---- tronsons running through a pole -> erori_brans_tronson -------
+        for line in self._each(self._scoped("TRONSON_JT", net.tronson)):
+            if not on_linia(line):
+                continue
+            if any(not t.at_endpoint for t in net.tronson_poles.get(line.fid, ())):
                 self._add_err_line(
-                    geom,
+                    line.geom,
                     "TRONSON_JT",
-                    fid_link,
+                    line.fid,
                     "Rupere conductor",
                     "Conductorul nu e rupt/întrerupt pe tronson",
                 )
-        else:
-            QgsMessageLog.logMessage(
-                "Output 'conductorul_nu_e_rupt' is not a vector layer",
-                "VectorVerifier",
-                level=Qgis.Warning,
-            )
 
+class VectorVerifierTask(QgsTask):
+    """Runs the VectorVerifier rules off the GUI thread.
+
+    Only ``VectorVerifier.publish()`` – the error layers – runs on the main
+    thread, from ``finished()``.
+    """
+
+    def __init__(self, verifier: VectorVerifier, on_finished=None):
+        super().__init__("Verificare vectorială", QgsTask.CanCancel)
+        self.verifier = verifier
+        self.on_finished = on_finished
+        self.exception = None
 
+    def run(self) -> bool:
+        try:
+            return self.verifier.run(self)
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def finished(self, result: bool) -> None:
+        if result:
+            try:
+                self.verifier.publish()
+            except Exception as e:
+                self.exception = e
+                result = False
+        if self.exception is not None:
+            QgsMessageLog.logMessage(f"Verificare vectorială: {self.exception}", "VectorVerifier", level=Qgis.Critical)
+        # the task manager deletes the task once it returns – don't keep a dangling wrapper
+        self.verifier.task = None
+        if self.on_finished is not None:
+            self.on_finished(result, self.exception)
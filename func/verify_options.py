@@ -0,0 +1,94 @@
+from qgis.PyQt.QtWidgets import ( # type: ignore
+    QButtonGroup,
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QGroupBox,
+    QLabel,
+    QRadioButton,
+    QVBoxLayout,
+)
+
+
+class VerifyOptionsDialog(QDialog):
+    """Options of a "Verificare vectorială" run: LINIE_JT DENUM, rules, scope and timing report."""
+
+    SCOPES = (
+        ("layer", "Tot stratul"),
+        ("extent", "Extinderea curentă a hărții"),
+        ("selection", "Entitățile selectate"),
+    )
+
+    def __init__(self, parent, denum_choices, rule_labels, has_selection=False,
+                 denum=None, rules=None, scope="layer", save_report=False):
+        super().__init__(parent)
+        self.setWindowTitle("Verificare vectorială")
+        self.layout = QVBoxLayout()
+
+        # LINIE_JT – used by rule 7
+        self.layout.addWidget(QLabel("DENUM linie JT:"))
+        self.denum_combo = QComboBox(self)
+        self.denum_combo.addItems(denum_choices)
+        if denum in denum_choices:
+            self.denum_combo.setCurrentIndex(denum_choices.index(denum))
+        self.layout.addWidget(self.denum_combo)
+
+        # rules, numbered from 1 like VectorVerifier.RULES
+        rules_box = QGroupBox("Reguli", self)
+        rules_layout = QVBoxLayout()
+        self.rule_checks = []
+        for number, label in enumerate(rule_labels, start=1):
+            check = QCheckBox(label, rules_box)
+            check.setChecked(rules is None or number in rules)
+            check.toggled.connect(self._update_ok)
+            rules_layout.addWidget(check)
+            self.rule_checks.append(check)
+        rules_box.setLayout(rules_layout)
+        self.layout.addWidget(rules_box)
+
+        # scope
+        scope_box = QGroupBox("Zona verificată", self)
+        scope_layout = QVBoxLayout()
+        self.scope_group = QButtonGroup(self)
+        self.scope_buttons = {}
+        for key, label in self.SCOPES:
+            button = QRadioButton(label, scope_box)
+            self.scope_group.addButton(button)
+            scope_layout.addWidget(button)
+            self.scope_buttons[key] = button
+        self.scope_buttons["selection"].setEnabled(has_selection)
+        if scope == "selection" and not has_selection:
+            scope = "layer"
+        self.scope_buttons[scope].setChecked(True)
+        scope_box.setLayout(scope_layout)
+        self.layout.addWidget(scope_box)
+
+        # timing report – always logged, saved as JSON only on request
+        self.report_check = QCheckBox("Salvează statisticile (JSON)", self)
+        self.report_check.setChecked(save_report)
+        self.layout.addWidget(self.report_check)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        self.layout.addWidget(self.buttons)
+
+        self.setLayout(self.layout)
+        self._update_ok()
+
+    def _update_ok(self, *_):
+        self.buttons.button(QDialogButtonBox.Ok).setEnabled(bool(self.rules()))
+
+    def denum(self) -> str:
+        return self.denum_combo.currentText()
+
+    def rules(self) -> list:
+        """Numbers of the checked rules."""
+        return [i for i, check in enumerate(self.rule_checks, start=1) if check.isChecked()]
+
+    def scope(self) -> str:
+        return next(key for key, button in self.scope_buttons.items() if button.isChecked())
+
+    def save_report(self) -> bool:
+        return self.report_check.isChecked()
@@ -0,0 +1,315 @@
+# coding=utf-8
+"""Benchmarks of the toolbar actions and of every VectorVerifier rule.
+
+Runs headless against networks from ``network_generator``: the network is
+written once to a GeoPackage and every action gets a fresh copy of it, so each
+one starts from the same data, read through the same OGR provider as in
+production.  Message boxes and input dialogs are stubbed so nothing waits for a
+click.  For every action it reports the features involved, the wall time, the
+throughput and how far the process resident set size (RSS) rose above where it
+started – QGIS, GEOS and OGR allocations included.  RSS is sampled by a
+background thread through psutil, in a second run so sampling does not skew the
+timings; without psutil the column stays empty.  The table is printed and
+written to ``bench_output.txt`` in the current directory (``--output``).
+
+From the plugin directory::
+
+    python -m test.benchmark --poles 1000 10000 100000
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import argparse
+import contextlib
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import psutil
+except ImportError:                         # memory column left empty
+    psutil = None
+
+from qgis.core import QgsApplication, QgsProject, QgsVectorLayer
+from qgis.PyQt.QtCore import QEventLoop
+from qgis.PyQt.QtWidgets import QInputDialog, QMessageBox
+
+from func.run_stats import plugin_version
+from func.vector_verifier import VectorVerifier
+from .network_generator import SCHEMAS, generate
+from .utilities import get_qgis_app
+
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = "bench_output.txt"                 # current directory, never the plugin tree
+
+Result = namedtuple("Result", "name features seconds peak")
+
+ALL_LAYERS = ("LINIE_JT", "STALP_JT", "BRANS_FIRI_GRPM_JT", "FB pe C LES", "TRONSON_JT")
+
+
+def _recalc_length(plugin, layers):
+    plugin.layer = layers["TRONSON_JT"]
+    plugin.action_length = None
+    plugin.recalc_length()
+
+
+def _separate_poles_by_id(plugin, layers):
+    plugin.separate_poles_by_id(layers)
+    task = plugin.export_task
+    if task is None:                        # nothing was exported
+        return
+    # the export runs in a QgsTask – the time counts until its layers are loaded;
+    # the task manager calls finished() before the task signals its end
+    loop = QEventLoop()
+    task.taskCompleted.connect(loop.quit)
+    task.taskTerminated.connect(loop.quit)
+    loop.exec_()
+
+
+# (action, layers whose features it works through, call)
+ACTIONS = (
+    ("complete_fields", ("STALP_JT", "BRANS_FIRI_GRPM_JT"),
+     lambda plugin, layers: plugin.complete_fields()),
+    ("assign_id_bdis", ALL_LAYERS,
+     lambda plugin, layers: plugin.assign_id_bdis(layers)),
+    ("separate_poles_by_id", ALL_LAYERS, _separate_poles_by_id),
+    ("verify_mandatory_columns", ALL_LAYERS,
+     lambda plugin, layers: plugin.verify_mandatory_columns()),
+    ("verify_linia_jt_matches", ("BRANS_FIRI_GRPM_JT",),
+     lambda plugin, layers: plugin.verify_linia_jt_matches()),
+    ("verify_street_names_poles", ("STALP_JT",),
+     lambda plugin, layers: plugin.verify_street_names_poles()),
+    ("recalc_length", ("TRONSON_JT",), _recalc_length),
+    ("cut_bpmp", ("BRANS_FIRI_GRPM_JT",),
+     lambda plugin, layers: plugin.cut_bpmp()),
+)
+
+
+def load_plugin_module():
+    """desen_assist.py uses package-relative imports – load it through the plugin package."""
+    plugins = os.path.join(QgsApplication.pkgDataPath(), "python", "plugins")
+    if plugins not in sys.path:
+        sys.path.append(plugins)                # processing
+    parent, package = os.path.split(PLUGIN_DIR)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(f"{package}.desen_assist")
+
+
+@contextlib.contextmanager
+def unattended(id_bdi: str):
+    """Every message box is acknowledged, every input dialog answered with *id_bdi*."""
+    with contextlib.ExitStack() as stack:
+        for name in ("information", "warning", "critical"):
+            stack.enter_context(mock.patch.object(QMessageBox, name, return_value=QMessageBox.Ok))
+        stack.enter_context(mock.patch.object(QMessageBox, "question", return_value=QMessageBox.Yes))
+        stack.enter_context(mock.patch.object(QInputDialog, "getText", return_value=(id_bdi, True)))
+        stack.enter_context(mock.patch.object(
+            QInputDialog, "getItem", side_effect=lambda parent, title, label, items, *a, **k: (items[0], True)))
+        yield
+
+
+def load_layers(gpkg: str) -> dict:
+    project = QgsProject.instance()
+    project.removeAllMapLayers()
+    layers = {}
+    for name in SCHEMAS:
+        layer = QgsVectorLayer(f"{gpkg}|layername={name}", name, "ogr")
+        if not layer.isValid():
+            raise ValueError(f"Layer ‘{name}’ not found in {gpkg}")
+        project.addMapLayer(layer)
+        layers[name] = layer
+    return layers
+
+
+class RssSampler:
+    """Peak resident set size of this process, sampled every INTERVAL seconds in a
+    background thread while the context is open.
+
+    ``rise()`` is the peak above the RSS at the last ``reset()``, in MiB.
+    """
+
+    INTERVAL = 0.005
+
+    def __init__(self):
+        self._process = psutil.Process()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self.reset()
+
+    def _rss(self) -> int:
+        return self._process.memory_info().rss
+
+    def _sample(self):
+        while not self._done.wait(self.INTERVAL):
+            self.peak = max(self.peak, self._rss())
+
+    def reset(self) -> None:
+        self.base = self.peak = self._rss()
+
+    def rise(self) -> float:
+        self.peak = max(self.peak, self._rss())
+        return (self.peak - self.base) / 2 ** 20
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        self._thread.join()
+
+
+def sampling(sampled: bool):
+    """An RssSampler when *sampled* and psutil is there, else a context giving None."""
+    return RssSampler() if sampled and psutil is not None else contextlib.nullcontext()
+
+
+def measure(call, sampled: bool) -> tuple:
+    """(seconds, RSS rise MiB or None) of *call*."""
+    with sampling(sampled) as sampler:
+        start = time.perf_counter()
+        call()
+        seconds = time.perf_counter() - start
+        peak = None if sampler is None else sampler.rise()
+    return seconds, peak
+
+
+class Benchmark:
+    """Runs every action on fresh copies of one generated GeoPackage."""
+
+    def __init__(self, module, iface, gpkg: str, workdir: str, id_bdi: str):
+        self.module = module
+        self.iface = iface
+        self.gpkg = gpkg
+        self.workdir = workdir
+        self.id_bdi = id_bdi
+        self._copies = 0
+
+    def _fresh(self) -> dict:
+        self._copies += 1
+        copy = os.path.join(self.workdir, f"copie_{self._copies}.gpkg")
+        shutil.copyfile(self.gpkg, copy)
+        return load_layers(copy)
+
+    def action(self, name: str, counted, call, memory: bool) -> Result:
+        runs = []
+        for sampled in ((False, True) if memory else (False,)):
+            layers = self._fresh()
+            plugin = self.module.DesenAssist(self.iface)
+            plugin.base_dir = os.path.join(self.workdir, f"{name}_{self._copies}")
+            plugin.layers = layers
+            features = sum(layers[n].featureCount() for n in counted)
+            with unattended(self.id_bdi):
+                runs.append(measure(lambda: call(plugin, layers), sampled))
+            QgsProject.instance().removeAllMapLayers()
+        return Result(name, features, runs[0][0], runs[-1][1])
+
+    def verifier(self, memory: bool) -> list:
+        """One result per VectorVerifier phase, from its own RunStats."""
+        timed, peaks = None, {}
+        for sampled in ((False, True) if memory else (False,)):
+            self._fresh()
+            verifier = VectorVerifier(None)
+            verifier.prepare()
+            with sampling(sampled) as sampler:
+                if sampler is not None:
+                    self._sample_rules(verifier, sampler, peaks)
+                verifier.run()
+            if timed is None:
+                timed = verifier.stats.phases
+            QgsProject.instance().removeAllMapLayers()
+
+        return [Result(f"VectorVerifier: {p['name']}", p["visited"] or p["fetches"],
+                       p["seconds"], peaks.get(p["name"]))
+                for p in timed]
+
+    @staticmethod
+    def _sample_rules(verifier, sampler, peaks: dict) -> None:
+        """Wraps every rule so its own RSS rise is recorded."""
+        for label, method in verifier.RULES:
+            def sampled(rule=getattr(verifier, method), label=label):
+                sampler.reset()
+                try:
+                    rule()
+                finally:
+                    peaks[label] = sampler.rise()
+            setattr(verifier, method, sampled)
+
+
+def report(title: str, results) -> str:
+    width = max(len(r.name) for r in results)
+    header = f"{'Acțiune':<{width}} {'entități':>9} {'timp (s)':>9} {'entități/s':>11} {'RSS +MiB':>9}"
+    lines = [title, header, "-" * len(header)]
+    for r in results:
+        rate = f"{r.features / r.seconds:>11.0f}" if r.seconds > 0 else f"{'-':>11}"
+        peak = f"{r.peak:>9.1f}" if r.peak is not None else f"{'-':>9}"
+        lines.append(f"{r.name:<{width}} {r.features:>9} {r.seconds:>9.3f} {rate} {peak}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmark",
+                                     description="Benchmark pentru acțiunile DesenAssist.")
+    parser.add_argument("--poles", type=int, nargs="+", default=[1000, 10000],
+                        help="dimensiunile rețelelor generate (stâlpi)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", metavar="ACȚIUNE",
+                        help="doar aceste acțiuni (vector_verifier pentru reguli)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="fără a doua rulare, cu eșantionarea memoriei (RSS, psutil)")
+    parser.add_argument("--output", default=OUTPUT,
+                        help="fișierul tabelului (implicit bench_output.txt în directorul curent)")
+    args = parser.parse_args(argv)
+
+    _app, _canvas, iface, _parent = get_qgis_app()
+    module = load_plugin_module()
+    memory = not args.no_memory
+    wanted = set(args.only) if args.only else None
+
+    sections = []
+    for poles in args.poles:
+        with tempfile.TemporaryDirectory() as workdir:
+            network = generate(poles, seed=args.seed)
+            gpkg = os.path.join(workdir, "retea.gpkg")
+            network.write_gpkg(gpkg)
+            id_bdi = next(network.layers["LINIE_JT"].getFeatures())["ID_BDI"]
+            bench = Benchmark(module, iface, gpkg, workdir, str(id_bdi))
+
+            results = []
+            for name, counted, call in ACTIONS:
+                if wanted is None or name in wanted:
+                    results.append(bench.action(name, counted, call, memory))
+            if wanted is None or "vector_verifier" in wanted:
+                results.extend(bench.verifier(memory))
+
+        title = (f"DesenAssist {plugin_version()} – {poles} stâlpi (seed {args.seed}), "
+                 f"{datetime.now():%Y-%m-%d %H:%M}")
+        sections.append(report(title, results))
+        print(sections[-1] + "\n", flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(sections) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
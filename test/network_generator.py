@@ -0,0 +1,408 @@
+# coding=utf-8
+"""Synthetic LV network generator for scale and regression testing.
+
+Builds STALP_JT, TRONSON_JT, BRANS_FIRI_GRPM_JT, "FB pe C LES" and LINIE_JT with
+the field schemas the plugin works with.  The network is a grid of posts (one
+ID_BDI each); every post feeds a few straight LINIE_JT whose poles are 35 m
+apart, split into one TRONSON_JT per span, with an optional service drop
+(BRANS + FB pe C LES) on each pole.  The clean network passes every
+VectorVerifier rule.
+
+Errors are injected at a controlled rate per type, each one producing known
+VectorVerifier errors (see ``ERROR_TYPES``).  Everything is drawn from a seeded
+``random.Random``, so the same arguments always give the same network.
+
+Headless use, from the plugin directory::
+
+    python -m test.network_generator retea_10k.gpkg --poles 10000 --error rupere_conductor=0.01
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import argparse
+import math
+import random
+import sys
+from collections import Counter
+
+from qgis.core import (
+    QgsFeature,
+    QgsField,
+    QgsFields,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtCore import QVariant
+
+
+CRS = "EPSG:3844"
+ORIGIN = (400000.0, 500000.0)           # somewhere in Stereo 70
+SPACING = 35.0                          # pole to pole along a line
+BRANS_LENGTH = 18.0
+POLES_PER_LINE = 30
+LINES_PER_POST = 4
+
+S, I = QVariant.String, QVariant.Int
+SCHEMAS = {
+    "STALP_JT": ("Point", [
+        ("DENUM", S), ("NR_INS_STP", S), ("PROP", S), ("JUD", S), ("PRIM", S),
+        ("LOC", S), ("TIP_STR", S), ("STR", S), ("TIP_CIR", S), ("DESC_CTG_MT_JT", S),
+        ("NR_CIR", I), ("UZURA_STP", I), ("TIP_FUND", S), ("ADAOS", S),
+        ("TIP_LEG_JT", S), ("NR_CIR_FO", I), ("PROP_FO", S), ("NR_CIR_LTC", I),
+        ("NR_CIR_CATV", I), ("FIB_OPT", S), ("LTC", S), ("CATV", S),
+        ("NR_CONS_C2S", I), ("NR_CONS_C4S", I), ("NR_CONS_C2T", I),
+        ("NR_CONS_C4T", I), ("NR_CONS_C2BR", I), ("NR_CONS_C4BR", I), ("ID_BDI", S),
+    ]),
+    "TRONSON_JT": ("LineString", [
+        ("TIP_TR", S), ("TIP_COND", S), ("LINIA_JT", S), ("ID_BDI", S),
+    ]),
+    "BRANS_FIRI_GRPM_JT": ("LineString", [
+        ("TIP_BR", S), ("TIP_COND", S), ("JUD", S), ("PRIM", S), ("LOC", S),
+        ("TIP_STR", S), ("STR", S), ("NR_IMOB", S), ("TIP_FIRI_BR", S),
+        ("LINIA_JT", S), ("LIM_PROP", S), ("ID_BDI", S),
+    ]),
+    "FB pe C LES": ("Point", [
+        ("TIP_BR", S), ("TIP_COND", S), ("JUD", S), ("PRIM", S), ("LOC", S),
+        ("TIP_STR", S), ("STR", S), ("NR_IMOB", S), ("TIP_FIRI_BR", S),
+        ("LINIA_JT", S), ("ID_BDI", S),
+    ]),
+    "LINIE_JT": ("None", [
+        ("ID_BDI", S), ("DENUM", S),
+    ]),
+    # postal register the street names are checked against
+    "nr_postale": ("Point", [
+        ("DENUMIRE_D", S),
+    ]),
+}
+
+# DESC_CTG_MT_JT -> (PROP, TIP_FUND), consistent with "Completare câmpuri"
+POLE_TYPES = {
+    "St. lemn tip SU": ("TERTI", "Turnata"),
+    "St. metalic rotund": ("TERTI", "Turnata"),
+    "St. octogonal zincat sustinere": ("TERTI", "Burata"),
+    "SC 10001": ("ELECTRICA", "Turnata"),
+    "SC 10002": ("ELECTRICA", "Turnata"),
+    "SE 4": ("ELECTRICA", "Burata"),
+    "SE 10": ("ELECTRICA", "Turnata"),
+    "S 10 - U": ("ELECTRICA", "Burata"),
+}
+
+# (TIP_FIRI_BR, TIP_COND, TIP_BR) combinations accepted by update_branch_fields
+BRANS_TYPES = (
+    ("FB1", "ACBYCY 10/16", "monofazat"),
+    ("BMPM", "TYIR 10Al + 16Al", "monofazat"),
+    ("FB3", "AFYI 4x16", "trifazat"),
+    ("BMPT", "TYIR 3x25Al + 16Al", "trifazat"),
+    ("FDCS", "AFYI 16+25", "monofazat"),
+)
+
+# injected error type -> VectorVerifier errors it produces {TIP_EROARE: count}
+ERROR_TYPES = {
+    "stalp_izolat": {"STALP fără legătură": 1},
+    "brans_fara_stalp": {"BRANS fără legătură": 1},
+    "tip_cir_br": {"TIP_CIR lipsă BR": 1},
+    "tip_cir_jt": {"TIP_CIR lipsă JT": 1},
+    "terminal_br": {"Terminal BR greșit": 1},
+    "tronson_fara_stalp": {"Sfârșit tronson fără STÂLP": 1},
+    "intindere": {"Întindere fără IC": 1},
+    "rupere_conductor": {"Rupere conductor": 2},
+}
+
+ADDRESS = {"JUD": "CJ", "PRIM": "CLUJ-NAPOCA", "LOC": "CLUJ-NAPOCA", "TIP_STR": "Strada"}
+
+
+class SyntheticNetwork:
+    """Generated layers plus the number of errors injected per type."""
+
+    def __init__(self, layers: dict, injected: Counter):
+        self.layers = layers            # layer name -> memory QgsVectorLayer
+        self.injected = injected        # error type -> count
+
+    def expected_errors(self) -> Counter:
+        """``{TIP_EROARE: count}`` a full VectorVerifier run reports (all LINIE_JT)."""
+        expected = Counter()
+        for kind, count in self.injected.items():
+            for tip, n in ERROR_TYPES[kind].items():
+                expected[tip] += n * count
+        return expected
+
+    def add_to_project(self, project=None) -> None:
+        project = project or QgsProject.instance()
+        for layer in self.layers.values():
+            project.addMapLayer(layer)
+
+    def write_gpkg(self, path: str) -> None:
+        """All layers as tables of one GeoPackage."""
+        from func.batch_verify import write_gpkg
+        write_gpkg(list(self.layers.values()), path)
+
+
+def _layer(name: str) -> QgsVectorLayer:
+    geometry, fields = SCHEMAS[name]
+    uri = "None" if geometry == "None" else f"{geometry}?crs={CRS}"
+    layer = QgsVectorLayer(uri, name, "memory")
+    qfields = QgsFields()
+    for field_name, field_type in fields:
+        qfields.append(QgsField(field_name, field_type))
+    layer.dataProvider().addAttributes(qfields)
+    layer.updateFields()
+    return layer
+
+
+def _feature(layer: QgsVectorLayer, geom, values: dict) -> QgsFeature:
+    feature = QgsFeature(layer.fields())
+    if geom is not None:
+        feature.setGeometry(geom)
+    for name, value in values.items():
+        feature[name] = value
+    return feature
+
+
+class _Builder:
+    """Lays out the network as plain Python records, then turns them into features."""
+
+    def __init__(self, poles: int, seed: int, errors: dict, poles_per_line: int,
+                 lines_per_post: int):
+        unknown = set(errors) - set(ERROR_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown error types: {', '.join(sorted(unknown))}")
+        self.rng = random.Random(seed)
+        self.total = poles
+        self.errors = errors
+        self.poles_per_line = poles_per_line
+        self.lines_per_post = lines_per_post
+        self.injected = Counter()
+
+        self.poles = []                 # dicts: xy, attrs
+        self.tronson = []               # dicts: points, attrs
+        self.brans = []                 # dicts: points, attrs, fb (FB pe C LES attrs)
+        self.lines = []                 # (ID_BDI, DENUM)
+        self.streets = []               # (xy, street name)
+
+    # ---------------------------------------------------------------
+    #  Clean network
+    # ---------------------------------------------------------------
+    def build(self) -> SyntheticNetwork:
+        post_step = 2 * (self.poles_per_line * SPACING + 200.0)
+        per_post = self.poles_per_line * self.lines_per_post
+        posts = max(1, math.ceil(self.total / per_post))
+        cols = math.ceil(math.sqrt(posts))
+
+        left = self.total
+        for k in range(posts):
+            origin = (ORIGIN[0] + (k % cols) * post_step, ORIGIN[1] + (k // cols) * post_step)
+            id_bdi = str(100000 + k)
+            for j in range(self.lines_per_post):
+                count = min(self.poles_per_line, left)
+                if count < 2:
+                    break
+                left -= count
+                angle = math.pi / 8 + j * 2 * math.pi / self.lines_per_post
+                self._line(origin, angle, id_bdi, f"JT {k + 1}-{j + 1}", f"Strada {k + 1}-{j + 1}", count)
+        return self._to_layers()
+
+    def _line(self, origin, angle, id_bdi, denum, street, count):
+        self.lines.append((id_bdi, denum))
+        d = (math.cos(angle), math.sin(angle))
+        n = (-d[1], d[0])
+
+        def at(along, side=0.0):
+            return (origin[0] + d[0] * along + n[0] * side,
+                    origin[1] + d[1] * along + n[1] * side)
+
+        line = {"id_bdi": id_bdi, "denum": denum, "street": street, "at": at, "next": count + 1}
+        self.streets.append((at(15.0, -5.0), street))
+        chain = []
+        for i in range(count):
+            terminal = i in (0, count - 1)
+            pole = self._pole(at(15.0 + i * SPACING), str(i + 1), "JT",
+                              "t" if terminal else "s", line)
+            if self.rng.random() < 0.6:
+                self._service_drop(pole, line, 15.0 + i * SPACING)
+            chain.append(pole)
+        spans = [self._tronson([a["xy"], b["xy"]], line) for a, b in zip(chain, chain[1:])]
+
+        self._inject(chain, spans, line)
+
+    def _pole(self, xy, denum, tip_cir, tip_leg, line):
+        desc = self.rng.choice(sorted(POLE_TYPES))
+        prop, fund = POLE_TYPES[desc]
+        fo = self.rng.random() < 0.3
+        attrs = dict(ADDRESS, DENUM=denum, NR_INS_STP="1", PROP=prop, STR=line["street"],
+                     TIP_CIR=tip_cir, DESC_CTG_MT_JT=desc, NR_CIR=1,
+                     UZURA_STP=self.rng.randint(1, 5), TIP_FUND=fund, ADAOS="Nu",
+                     TIP_LEG_JT=tip_leg, NR_CIR_FO=1 if fo else None,
+                     PROP_FO="SC RCS&RDS S.A" if fo else None, NR_CIR_LTC=None,
+                     NR_CIR_CATV=None, FIB_OPT="Da" if fo else "Nu", LTC="Nu", CATV="Nu",
+                     NR_CONS_C2S=0, NR_CONS_C4S=0, NR_CONS_C2T=0, NR_CONS_C4T=0,
+                     NR_CONS_C2BR=0, NR_CONS_C4BR=0, ID_BDI=line["id_bdi"])
+        pole = {"xy": xy, "attrs": attrs, "brans": None}
+        self.poles.append(pole)
+        return pole
+
+    def _tronson(self, points, line):
+        span = {"points": points, "attrs": {"TIP_TR": "LEA", "TIP_COND": "TYIR 3x50Al + 50Al",
+                                            "LINIA_JT": line["denum"], "ID_BDI": line["id_bdi"]}}
+        self.tronson.append(span)
+        return span
+
+    def _service_drop(self, pole, line, along):
+        firi, cond, tip_br = self.rng.choice(BRANS_TYPES)
+        at = line["at"]
+        points = [pole["xy"], at(along + 2.0, BRANS_LENGTH / 2), at(along + 2.0, BRANS_LENGTH)]
+        common = dict(ADDRESS, TIP_BR=tip_br, TIP_COND=cond, STR=line["street"],
+                      NR_IMOB=str(self.rng.randint(1, 200)), TIP_FIRI_BR=firi,
+                      LINIA_JT=line["denum"], ID_BDI=line["id_bdi"])
+        brans = {"points": points,
+                 "attrs": dict(common, LIM_PROP="interior" if firi in ("FB1", "FB3") else "exterior"),
+                 "fb": common}
+        self.brans.append(brans)
+        pole["brans"] = brans
+        pole["attrs"]["TIP_CIR"] = "JT+BR"
+
+    # ---------------------------------------------------------------
+    #  Error injection – at most one error per pole
+    # ---------------------------------------------------------------
+    def _roll(self, kind: str) -> bool:
+        rate = self.errors.get(kind, 0.0)
+        return rate > 0 and self.rng.random() < rate
+
+    def _inject(self, chain, spans, line):
+        at = line["at"]
+        used = set()
+        last = len(chain) - 1
+        for i, pole in enumerate(chain):
+            along = 15.0 + i * SPACING
+            middle = 0 < i < last and i - 1 not in used
+            drop = pole["brans"]
+
+            if self._roll("stalp_izolat"):
+                # off the network, between two spans on the free side
+                self._pole(at(along + 10.0, -8.0), str(self._next(line)), "", "s", line)
+                self.injected["stalp_izolat"] += 1
+            if i in used:
+                continue
+
+            if drop and self._roll("brans_fara_stalp"):
+                drop["points"][0] = at(along, 0.5)
+                pole["attrs"]["TIP_CIR"] = "JT"
+                kind = "brans_fara_stalp"
+            elif drop and self._roll("tip_cir_br"):
+                pole["attrs"]["TIP_CIR"] = "JT"
+                kind = "tip_cir_br"
+            elif self._roll("tip_cir_jt"):
+                pole["attrs"]["TIP_CIR"] = "BR" if drop else ""
+                kind = "tip_cir_jt"
+            elif drop and self._roll("terminal_br"):
+                # auxiliary BR pole on the free end of the service drop
+                self._pole(drop["points"][-1], f"{i + 1}A", "BR", "t", line)
+                kind = "terminal_br"
+            elif i == last and self._roll("tronson_fara_stalp"):
+                self._tronson([pole["xy"], at(along + 20.0)], line)
+                kind = "tronson_fara_stalp"
+            elif middle and self._roll("intindere"):
+                spur = self._pole(at(along, -SPACING), str(self._next(line)), "JT", "t", line)
+                self._tronson([pole["xy"], spur["xy"]], line)
+                kind = "intindere"
+            elif middle and self._roll("rupere_conductor"):
+                # the span is not split at this pole
+                before, after = spans[i - 1], spans[i]
+                before["points"] = before["points"] + after["points"][1:]
+                after["merged"] = True
+                spans[i] = before
+                used.add(i + 1)
+                kind = "rupere_conductor"
+            else:
+                continue
+            used.add(i)
+            self.injected[kind] += 1
+
+    @staticmethod
+    def _next(line) -> int:
+        line["next"] += 1
+        return line["next"] - 1
+
+    # ---------------------------------------------------------------
+    #  Layers
+    # ---------------------------------------------------------------
+    def _to_layers(self) -> SyntheticNetwork:
+        layers = {name: _layer(name) for name in SCHEMAS}
+
+        def points(xy):
+            return QgsGeometry.fromPointXY(QgsPointXY(*xy))
+
+        def polyline(pts):
+            return QgsGeometry.fromPolylineXY([QgsPointXY(*p) for p in pts])
+
+        features = {
+            "STALP_JT": [_feature(layers["STALP_JT"], points(p["xy"]), p["attrs"])
+                         for p in self.poles],
+            "TRONSON_JT": [_feature(layers["TRONSON_JT"], polyline(t["points"]), t["attrs"])
+                           for t in self.tronson if not t.get("merged")],
+            "BRANS_FIRI_GRPM_JT": [_feature(layers["BRANS_FIRI_GRPM_JT"], polyline(b["points"]), b["attrs"])
+                                   for b in self.brans],
+            "FB pe C LES": [_feature(layers["FB pe C LES"], points(b["points"][-1]), b["fb"])
+                            for b in self.brans],
+            "LINIE_JT": [_feature(layers["LINIE_JT"], None, {"ID_BDI": id_bdi, "DENUM": denum})
+                         for id_bdi, denum in self.lines],
+            "nr_postale": [_feature(layers["nr_postale"], points(xy), {"DENUMIRE_D": name})
+                           for xy, name in self.streets],
+        }
+        for name, feats in features.items():
+            layers[name].dataProvider().addFeatures(feats)
+            layers[name].updateExtents()
+        return SyntheticNetwork(layers, self.injected)
+
+
+def generate(poles: int = 1000, seed: int = 1, errors: dict | None = None,
+             poles_per_line: int = POLES_PER_LINE,
+             lines_per_post: int = LINES_PER_POST) -> SyntheticNetwork:
+    """Builds a network of about *poles* line poles (plus the injected extra ones).
+
+    *errors* maps an ``ERROR_TYPES`` key to the probability, per eligible pole,
+    of injecting that error.
+    """
+    return _Builder(poles, seed, errors or {}, poles_per_line, lines_per_post).build()
+
+
+def _rate(text: str) -> tuple:
+    kind, _, rate = text.partition("=")
+    if kind not in ERROR_TYPES:
+        raise argparse.ArgumentTypeError(f"tip de eroare necunoscut: {kind}")
+    return kind, float(rate or 0.01)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="network_generator",
+                                     description="Generează o rețea JT sintetică într-un GeoPackage.")
+    parser.add_argument("output", help="fișierul .gpkg creat")
+    parser.add_argument("--poles", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--error", type=_rate, action="append", default=[],
+                        metavar="TIP=RATA", help=f"tipuri: {', '.join(ERROR_TYPES)}")
+    args = parser.parse_args(argv)
+
+    from func.batch_verify import init_qgis
+    qgs = init_qgis()
+    network = generate(args.poles, args.seed, dict(args.error))
+    network.write_gpkg(args.output)
+    print(f"{args.output}: " + ", ".join(f"{name} {layer.featureCount()}"
+                                          for name, layer in network.layers.items()))
+    for tip, count in sorted(network.expected_errors().items()):
+        print(f"  {tip}: {count}")
+    qgs.exitQgis()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# coding=utf-8
+"""Edit tracker test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+
+from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsProject, QgsVectorLayer
+
+from func.change_tracker import ChangeTracker
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+
+class ChangeTrackerTest(unittest.TestCase):
+    """Test which edits mark a feature dirty."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.layer = QgsVectorLayer("Point?crs=EPSG:3844&field=DENUM:string", "STALP_JT", "memory")
+        features = []
+        for i in range(3):
+            feature = QgsFeature(self.layer.fields())
+            feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(i, 0)))
+            feature.setAttributes([str(i)])
+            features.append(feature)
+        self.layer.dataProvider().addFeatures(features)
+        self.tracker = ChangeTracker()
+        self.tracker.watch("STALP_JT", self.layer)
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.tracker.unwatch_all()
+
+    def test_edits_mark_features(self):
+        """Attribute, geometry and delete edits are collected once, then cleared."""
+        self.layer.startEditing()
+        self.layer.changeAttributeValue(1, 0, "10")
+        self.layer.changeGeometry(2, QgsGeometry.fromPointXY(QgsPointXY(5, 5)))
+        self.layer.deleteFeature(3)
+        self.assertTrue(self.layer.commitChanges())
+        self.assertEqual(self.tracker.take(), {"STALP_JT": {1, 2, 3}})
+        self.assertEqual(self.tracker.take(), {})
+
+    def test_added_features_keep_their_committed_id(self):
+        """A feature added in the edit buffer is tracked under its id after commit."""
+        self.layer.startEditing()
+        feature = QgsFeature(self.layer.fields())
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(9, 9)))
+        self.layer.addFeature(feature)
+        self.assertTrue(self.layer.commitChanges())
+        committed = max(f.id() for f in self.layer.getFeatures())
+        self.assertIn(committed, self.tracker.take()["STALP_JT"])
+
+    def test_removed_layer_invalidates(self):
+        """Once a watched layer is deleted the tracker asks for a full run."""
+        QgsProject.instance().addMapLayer(self.layer)
+        self.assertTrue(self.tracker.valid)
+        QgsProject.instance().removeMapLayer(self.layer.id())
+        self.assertFalse(self.tracker.valid)
+
+    def test_unwatched_layer_is_ignored(self):
+        """After unwatch_all() edits are no longer collected."""
+        self.tracker.unwatch_all()
+        self.layer.startEditing()
+        self.layer.changeAttributeValue(1, 0, "10")
+        self.layer.commitChanges()
+        self.assertEqual(self.tracker.take(), {})
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ChangeTrackerTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,56 @@
+# coding=utf-8
+"""Endpoint grid test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+
+from qgis.core import QgsPointXY
+
+from func.endpoint_grid import EndpointGrid
+
+
+class EndpointGridTest(unittest.TestCase):
+    """Test the tolerance grid used for terminal detection."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.grid = EndpointGrid(0.01)
+        # two lines sharing (10, 10), one free end each
+        self.grid.add_line_ends(1, (QgsPointXY(0, 0), QgsPointXY(10, 10)))
+        self.grid.add_line_ends(2, (QgsPointXY(10.005, 10), QgsPointXY(20, 0)))
+
+    def test_near_across_cell_border(self):
+        """Points within the tolerance are found even in a neighbouring cell."""
+        owners = sorted(e[2] for e in self.grid.near(10.002, 10))
+        self.assertEqual(owners, [(1, 1), (2, 0)])
+
+    def test_has_near(self):
+        """Nothing is reported outside the tolerance."""
+        self.assertTrue(self.grid.has_near(20.009, 0))
+        self.assertFalse(self.grid.has_near(20.02, 0))
+
+    def test_terminal_near(self):
+        """Shared ends have degree 2, free ends are terminal."""
+        self.assertEqual(self.grid.terminal_near(10, 10), [])
+        self.assertEqual([e[2] for e in self.grid.terminal_near(0, 0)], [(1, 0)])
+
+    def test_rejects_zero_tolerance(self):
+        """A zero tolerance cannot size the cells."""
+        with self.assertRaises(ValueError):
+            EndpointGrid(0)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(EndpointGridTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
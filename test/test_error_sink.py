@@ -0,0 +1,75 @@
+# coding=utf-8
+"""Verifier error sink test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+
+from qgis.core import QgsGeometry, QgsPointXY, QgsVectorLayer
+
+from func.error_sink import ErrorSink
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+
+class ErrorSinkTest(unittest.TestCase):
+    """Test the de-duplication and the bulk write of verifier errors."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.sink = ErrorSink()
+        self.geom = QgsGeometry.fromPointXY(QgsPointXY(1, 2))
+
+    def add(self, source, fid=7, tip="BRANS BMPM"):
+        self.sink.add("point", source, self.geom, "BRANS_FIRI_GRPM_JT", fid, tip, "detalii")
+
+    def test_same_error_is_stored_once_with_every_source(self):
+        """An error reported through two poles is one entry that remembers both."""
+        self.add(("STALP_JT", 1))
+        self.add(("STALP_JT", 2))
+        self.add(("STALP_JT", 2))
+        records = self.sink.records("point")
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].source, ("STALP_JT", 1))
+        self.assertEqual(self.sink.sources("point", ErrorSink.key(records[0])),
+                         {("STALP_JT", 1), ("STALP_JT", 2)})
+        self.assertEqual(len(self.sink), 1)
+
+    def test_different_errors_are_kept_apart(self):
+        """Another feature, another error type or another kind is another entry."""
+        self.add(("STALP_JT", 1))
+        self.add(("STALP_JT", 1), fid=8)
+        self.add(("STALP_JT", 1), tip="altă eroare")
+        self.sink.add("line", ("STALP_JT", 1), self.geom, "BRANS_FIRI_GRPM_JT", 7, "BRANS BMPM", "detalii")
+        self.assertEqual(len(self.sink.records("point")), 3)
+        self.assertEqual(len(self.sink), 4)
+        self.assertEqual(self.sink.sources("line", ("BRANS_FIRI_GRPM_JT", 9, "x")), set())
+
+    def test_write_skips_known_keys(self):
+        """write() adds one feature per entry not in *skip* and returns its fid."""
+        layer = QgsVectorLayer("Point?field=NUME_LAYER:string&field=FID:integer"
+                               "&field=TIP_EROARE:string&field=DETALII:string", "erori", "memory")
+        self.add(("STALP_JT", 1))
+        self.add(("STALP_JT", 1), fid=8)
+        skip = {("BRANS_FIRI_GRPM_JT", 8, "BRANS BMPM")}
+        written = self.sink.write(layer, "point", skip=skip)
+        self.assertEqual([record.fid for _, record in written], [7])
+        self.assertEqual(layer.featureCount(), 1)
+        feature = layer.getFeature(written[0][0])
+        self.assertEqual(feature.attributes(), ["BRANS_FIRI_GRPM_JT", 7, "BRANS BMPM", "detalii"])
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ErrorSinkTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,73 @@
+# coding=utf-8
+"""Synthetic network generator test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+from collections import Counter
+
+from qgis.core import QgsProject
+
+from func.vector_verifier import VectorVerifier
+from .network_generator import ERROR_TYPES, generate
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+
+class NetworkGeneratorTest(unittest.TestCase):
+    """Test the generated networks against VectorVerifier."""
+
+    def tearDown(self):
+        """Runs after each test."""
+        QgsProject.instance().removeAllMapLayers()
+
+    @staticmethod
+    def verify(network) -> Counter:
+        network.add_to_project()
+        verifier = VectorVerifier(None)
+        verifier.prepare()
+        verifier.run()
+        found = Counter()
+        for layer in verifier.build_error_layers():
+            found.update(f["TIP_EROARE"] for f in layer.getFeatures())
+        return found
+
+    def test_deterministic(self):
+        """The same seed gives the same network."""
+        a = generate(500, seed=3, errors={"stalp_izolat": 0.05})
+        b = generate(500, seed=3, errors={"stalp_izolat": 0.05})
+        self.assertEqual(a.injected, b.injected)
+        for name, layer in a.layers.items():
+            self.assertEqual(layer.featureCount(), b.layers[name].featureCount())
+
+    def test_size(self):
+        """*poles* line poles, one LINIE_JT per line of 30."""
+        network = generate(600)
+        self.assertEqual(network.layers["STALP_JT"].featureCount(), 600)
+        self.assertEqual(network.layers["LINIE_JT"].featureCount(), 20)
+
+    def test_clean_network_passes(self):
+        """Without injected errors no rule fires."""
+        self.assertEqual(self.verify(generate(600)), Counter())
+
+    def test_injected_errors_are_found(self):
+        """Every injected error is reported by the rule it targets."""
+        network = generate(1200, seed=7, errors={kind: 0.05 for kind in ERROR_TYPES})
+        self.assertTrue(all(network.injected[kind] for kind in ERROR_TYPES))
+        self.assertEqual(self.verify(network), network.expected_errors())
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(NetworkGeneratorTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
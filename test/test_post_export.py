@@ -0,0 +1,222 @@
+# coding=utf-8
+"""Post separation test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from collections import Counter
+from contextlib import closing
+
+from qgis.core import QgsCoordinateTransformContext, QgsFeature, QgsGeometry, QgsRectangle, QgsVectorLayer
+
+from func.post_export import (
+    ExportCanceled,
+    GpkgStream,
+    POST_LAYERS,
+    ensure_attribute_indexes,
+    SELECTION_LAYERS,
+    export_posts,
+    export_selection,
+    id_bdi_request,
+    iter_by_id_bdi,
+    majority_id_bdi,
+    pole_id_bdi_votes,
+)
+from .network_generator import generate
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+
+class Canceled:
+    """Feedback of a task the user has just cancelled."""
+
+    def isCanceled(self):
+        return True
+
+    def setProgress(self, value):
+        pass
+
+
+def write_stream(layer_name: str, source_layer, features, path: str) -> int:
+    """Feeds *features* to a GpkgStream writing *path*; returns how many it wrote."""
+    stream = GpkgStream(path, layer_name, source_layer, QgsCoordinateTransformContext())
+    try:
+        for feature in features:
+            stream.add(feature)
+    finally:
+        stream.close()
+    return stream.count
+
+
+def memory_layer(uri: str, rows) -> QgsVectorLayer:
+    """Memory layer with one ID_BDI field and a (WKT, ID_BDI) feature per row."""
+    layer = QgsVectorLayer(f"{uri}?crs=EPSG:3844&field=ID_BDI:string", "test", "memory")
+    features = []
+    for wkt, id_bdi in rows:
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(QgsGeometry.fromWkt(wkt))
+        feature.setAttributes([id_bdi])
+        features.append(feature)
+    layer.dataProvider().addFeatures(features)
+    return layer
+
+
+class PostExportTest(unittest.TestCase):
+    """Test splitting the network layers by ID_BDI."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Runs once, before the tests."""
+        cls.layers = generate(300, seed=3).layers
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.tmp.cleanup()
+
+    @staticmethod
+    def count(path: str) -> int:
+        return QgsVectorLayer(path, "test", "ogr").featureCount()
+
+    def posts(self) -> list:
+        """Every ID_BDI of LINIE_JT, sorted."""
+        return sorted({key for key, _feature in iter_by_id_bdi(self.layers["LINIE_JT"])})
+
+    def test_every_feature_yielded_once(self):
+        """Each feature with an ID_BDI is yielded exactly once, under its post."""
+        for name in POST_LAYERS:
+            layer = self.layers[name]
+            fids = [feature.id() for _key, feature in iter_by_id_bdi(layer)]
+            self.assertEqual(sorted(fids), sorted(f.id() for f in layer.getFeatures()))
+        wanted = self.posts()[:1]
+        self.assertEqual({key for key, _feature in iter_by_id_bdi(self.layers["STALP_JT"], wanted)}, set(wanted))
+
+    def test_wanted_posts_only(self):
+        """Only the requested posts are kept, in one file per layer."""
+        posts = self.posts()
+        wanted = posts[:2]
+        partitions, _outputs = export_posts(self.layers, self.tmp.name, wanted)
+        for name in POST_LAYERS:
+            self.assertEqual(set(partitions[name]), set(wanted))
+            expected = sum(partitions[name].values())
+            self.assertEqual(self.count(os.path.join(self.tmp.name, f"{name}.gpkg")), expected)
+
+    def test_every_post(self):
+        """Without a list every post gets its own folder."""
+        partitions, _outputs = export_posts(self.layers, self.tmp.name)
+        posts = set(partitions["LINIE_JT"])
+        self.assertEqual(set(os.listdir(self.tmp.name)), posts)
+        for name in POST_LAYERS:
+            total = sum(self.count(os.path.join(self.tmp.name, post, f"{name}.gpkg")) for post in posts)
+            self.assertEqual(total, self.layers[name].featureCount())
+
+    def test_single_geopackage(self):
+        """All five layers become tables of one GeoPackage, R-trees included."""
+        wanted = self.posts()[:1]
+        partitions, outputs = export_posts(self.layers, self.tmp.name, wanted, single_file=True)
+        package = outputs[None]
+        self.assertEqual(os.listdir(self.tmp.name), [os.path.basename(package.path)])
+        for name in POST_LAYERS:
+            self.assertEqual(self.count(package.uri(name)), sum(partitions[name].values()))
+        with closing(sqlite3.connect(package.path)) as con:
+            rtrees = {row[0] for row in con.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'rtree_%' AND type = 'table'")}
+        self.assertIn("rtree_STALP_JT_geom", rtrees)
+        self.assertNotIn("rtree_LINIE_JT_geom", rtrees)
+
+    def test_one_output_per_polygon(self):
+        """Each polygon gets the features it intersects, read in one pass."""
+        extent = self.layers["STALP_JT"].extent()
+        half = QgsRectangle(extent.xMinimum(), extent.yMinimum(), extent.center().x(), extent.yMaximum())
+        polygons = {
+            "vest": QgsGeometry.fromRect(half),
+            "tot": QgsGeometry.fromRect(extent.buffered(10)),
+        }
+        counts, outputs = export_selection(self.layers, polygons, self.tmp.name)
+        self.assertEqual(set(outputs), set(polygons))
+        for name in SELECTION_LAYERS:
+            for key, polygon in polygons.items():
+                expected = sum(1 for f in self.layers[name].getFeatures() if f.geometry().intersects(polygon))
+                self.assertEqual(counts[name][key], expected)
+                self.assertEqual(self.count(outputs[key].uri(name)), expected)
+            self.assertEqual(counts[name]["tot"], self.layers[name].featureCount())
+
+    def test_cancel_removes_the_output(self):
+        """A cancelled export leaves no half-written GeoPackage behind."""
+        wanted = self.posts()[:1]
+        for single_file in (True, False):
+            with self.assertRaises(ExportCanceled):
+                export_posts(self.layers, self.tmp.name, wanted, single_file, feedback=Canceled())
+            self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_streaming_in_chunks(self):
+        """Outputs larger than a chunk are written whole."""
+        self.addCleanup(setattr, GpkgStream, "CHUNK", GpkgStream.CHUNK)
+        GpkgStream.CHUNK = 7
+        source = self.layers["STALP_JT"]
+        path = os.path.join(self.tmp.name, "STALP_JT.gpkg")
+        written = write_stream("STALP_JT", source, source.getFeatures(), path)
+        self.assertEqual(written, source.featureCount())
+        self.assertEqual(self.count(path), source.featureCount())
+
+    def test_request_filters_in_the_provider(self):
+        """The ID_BDI list becomes an expression; numeric fields get numbers."""
+        layer = QgsVectorLayer("Point?field=ID_BDI:integer", "numeric", "memory")
+        request = id_bdi_request(layer, ["100000", "abc"])
+        self.assertEqual(request.filterExpression().expression(), '"ID_BDI" IN (100000)')
+        request = id_bdi_request(self.layers["LINIE_JT"], ["100000"])
+        self.assertEqual(request.filterExpression().expression(), "\"ID_BDI\" IN ('100000')")
+
+    def test_attribute_indexes(self):
+        """Missing indexes are created once, in GeoPackage sources only."""
+        self.assertEqual(ensure_attribute_indexes(self.layers["TRONSON_JT"]), [])
+        path = os.path.join(self.tmp.name, "TRONSON_JT.gpkg")
+        write_stream("TRONSON_JT", self.layers["TRONSON_JT"], (), path)
+        layer = QgsVectorLayer(path, "TRONSON_JT", "ogr")
+        self.assertEqual(ensure_attribute_indexes(layer), ["ID_BDI", "LINIA_JT"])
+        self.assertEqual(ensure_attribute_indexes(layer), [])
+
+    def test_pole_majority_vote(self):
+        """A pole takes the ID_BDI most of its tronsons carry; branșamente only fill the gaps."""
+        poles = memory_layer("Point", [("POINT(0 0)", None), ("POINT(10 0)", None), ("POINT(20 0)", None),
+                                       ("POINT(50 0.005)", None)])
+        tronson = memory_layer("LineString", [
+            ("LINESTRING(-5 0, 0 0.001)", "1"),
+            ("LINESTRING(0 0, 0 5)", "1"),
+            ("LINESTRING(0 -5, 5 -5, 0 0)", "2"),
+            ("LINESTRING(10 0, 20 0)", None),
+            ("LINESTRING(40 0, 60 0)", "5"),
+        ])
+        brans = memory_layer("LineString", [("LINESTRING(10 0, 10 5)", "3"), ("LINESTRING(0 0, 3 3)", "4")])
+
+        votes = pole_id_bdi_votes(poles, [tronson, brans])
+        self.assertEqual(set(votes), {1, 2, 4})
+        self.assertEqual(votes[1], {"1": 2, "2": 1})
+        self.assertEqual(majority_id_bdi(votes[1]), "1")
+        self.assertEqual(votes[2], {"3": 1})
+        # within tolerance of a segment, away from any vertex
+        self.assertEqual(votes[4], {"5": 1})
+        self.assertNotIn(4, pole_id_bdi_votes(poles, [tronson], tol=0.001))
+        self.assertEqual(majority_id_bdi(Counter({"9": 1, "10": 1})), "10")
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(PostExportTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,121 @@
+# coding=utf-8
+"""Verification result cache test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import os
+import tempfile
+import unittest
+
+from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsVectorLayer
+
+from func.batch_verify import write_gpkg
+from func.error_sink import ErrorSink
+from func.result_cache import ResultCache
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+
+class ResultCacheTest(unittest.TestCase):
+    """Test the fingerprint and the on-disk error records."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp.name)
+        self.layer = QgsVectorLayer("Point?crs=EPSG:3844&field=DENUM:string", "STALP_JT", "memory")
+        feature = QgsFeature(self.layer.fields())
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(1, 2)))
+        feature.setAttributes(["1"])
+        self.layer.dataProvider().addFeatures([feature])
+
+    def tearDown(self):
+        """Runs after each test."""
+        self.tmp.cleanup()
+
+    def key(self, params=(0.01, None)):
+        return ResultCache.fingerprint(params, [ResultCache.file_stamp(self.layer)], [self.layer])
+
+    def test_memory_layers_are_hashed(self):
+        """Without a file behind it the layer content is the fingerprint."""
+        self.assertIsNone(ResultCache.file_stamp(self.layer))
+        before = self.key()
+        self.assertEqual(before, self.key())
+        self.layer.dataProvider().changeAttributeValues({1: {0: "2"}})
+        self.assertNotEqual(before, self.key())
+
+    def test_saved_file_changes_the_key(self):
+        """A GeoPackage is identified by its file: saving other data into it is another run."""
+        path = os.path.join(self.tmp.name, "retea.gpkg")
+        write_gpkg([self.layer], path)
+
+        def key():
+            layer = QgsVectorLayer(f"{path}|layername=STALP_JT", "STALP_JT", "ogr")
+            self.assertIsNotNone(ResultCache.file_stamp(layer))
+            return ResultCache.fingerprint((0.01, None), [ResultCache.file_stamp(layer)], [layer])
+
+        before = key()
+        self.assertEqual(before, key())
+        layer = QgsVectorLayer(f"{path}|layername=STALP_JT", "STALP_JT", "ogr")
+        self.assertTrue(layer.dataProvider().changeAttributeValues({1: {1: "2"}}))
+        del layer
+        # a coarse file-system clock could leave the mtime as it was
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertNotEqual(before, key())
+
+    def test_parameters_change_the_key(self):
+        """Another tolerance or LINIE_JT is another run."""
+        self.assertNotEqual(self.key((0.01, None)), self.key((0.02, None)))
+        self.assertNotEqual(self.key((0.01, None)), self.key((0.01, "LES 1")))
+
+    def test_round_trip(self):
+        """Stored records come back with their source, geometry and attributes."""
+        sink = ErrorSink()
+        sink.add("point", ("STALP_JT", 4), QgsGeometry.fromPointXY(QgsPointXY(1, 2)),
+                 "STALP_JT", 4, "STALP fără legătură", "detalii")
+        self.cache.store("k", sink)
+
+        loaded = self.cache.load("k")
+        self.assertEqual(len(loaded), 1)
+        record = loaded.records("point")[0]
+        self.assertEqual(record.source, ("STALP_JT", 4))
+        self.assertEqual((record.layer_name, record.fid, record.tip, record.det),
+                         ("STALP_JT", 4, "STALP fără legătură", "detalii"))
+        self.assertEqual(record.geom.asPoint(), QgsPointXY(1, 2))
+        self.assertIsNone(self.cache.load("missing"))
+
+    def test_every_source_survives(self):
+        """A deduplicated error comes back with all the features that reported it."""
+        sink = ErrorSink()
+        for pole in (4, 9):
+            sink.add("point", ("STALP_JT", pole), QgsGeometry.fromPointXY(QgsPointXY(1, 2)),
+                     "BRANS_FIRI_GRPM_JT", 3, "BRANS BMPM", "detalii")
+        self.cache.store("k", sink)
+
+        record = self.cache.load("k").records("point")[0]
+        self.assertEqual(record.source, ("STALP_JT", 4))
+        self.assertEqual(self.cache.load("k").sources("point", ErrorSink.key(record)),
+                         {("STALP_JT", 4), ("STALP_JT", 9)})
+
+    def test_prune(self):
+        """Only the most recent entries are kept."""
+        for i in range(ResultCache.MAX_ENTRIES + 3):
+            self.cache.store(str(i), ErrorSink())
+        self.assertEqual(len(os.listdir(self.cache.path)), ResultCache.MAX_ENTRIES)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ResultCacheTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
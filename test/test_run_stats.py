@@ -0,0 +1,68 @@
+# coding=utf-8
+"""Run statistics test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import json
+import os
+import tempfile
+import unittest
+
+from func.run_stats import RunStats
+
+
+class RunStatsTest(unittest.TestCase):
+    """Test the per-phase timing and counters of a verification run."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.stats = RunStats()
+        with self.stats.phase("Citire straturi") as phase:
+            phase["fetches"] = 30
+        with self.stats.phase("Regula 1 – snapping"):
+            self.stats.count("visited", 10)
+            self.stats.count("errors")
+
+    def test_counts_go_to_the_open_phase(self):
+        """count() only touches the phase currently running."""
+        self.stats.count("visited", 99)
+        self.assertEqual([p["visited"] for p in self.stats.phases], [0, 10])
+
+    def test_totals(self):
+        """Totals add up every counter over the phases."""
+        total = self.stats.totals()
+        self.assertEqual((total["fetches"], total["visited"], total["errors"]), (30, 10, 1))
+        self.assertGreaterEqual(total["seconds"], 0.0)
+
+    def test_report_has_one_line_per_phase(self):
+        """Header and rule, one line per phase, then the total."""
+        lines = self.stats.report().splitlines()
+        self.assertEqual(len(lines), 2 + 2 + 1)
+        self.assertTrue(lines[-1].startswith("Total"))
+
+    def test_write_json(self):
+        """The JSON file carries the metadata, the phases and the total."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.json")
+            self.stats.write_json(path, tolerance=0.01)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.assertEqual(data["tolerance"], 0.01)
+        self.assertEqual([p["name"] for p in data["phases"]],
+                         ["Citire straturi", "Regula 1 – snapping"])
+        self.assertEqual(data["total"]["fetches"], 30)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(RunStatsTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
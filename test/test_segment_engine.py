@@ -0,0 +1,60 @@
+# coding=utf-8
+"""Segment distance engine test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+
+import numpy as np
+
+from func.segment_engine import SegmentDistanceEngine
+
+
+class SegmentDistanceEngineTest(unittest.TestCase):
+    """Test the vectorised pole-to-segment matching."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.engine = SegmentDistanceEngine(0.01, cell_size=5.0)
+        self.seg = np.array([
+            (0.0, 0.0, 10.0, 0.0),      # crosses two grid cells
+            (10.0, 0.0, 10.0, 10.0),
+        ])
+
+    def test_mid_span_and_vertex(self):
+        """A point on the span matches one segment, a shared vertex matches both."""
+        pts = np.array([(7.5, 0.005), (10.0, 0.0), (3.0, 3.0)])
+        pt_idx, seg_idx, near_start, near_end = self.engine.match(pts, self.seg)
+        pairs = sorted(zip(pt_idx.tolist(), seg_idx.tolist(),
+                           near_start.tolist(), near_end.tolist()))
+        self.assertEqual(pairs, [
+            (0, 0, False, False),
+            (1, 0, False, True),
+            (1, 1, True, False),
+        ])
+
+    def test_outside_tolerance(self):
+        """Points just beyond the tolerance are not reported."""
+        pts = np.array([(5.0, 0.02), (-0.02, 0.0)])
+        pt_idx, _, _, _ = self.engine.match(pts, self.seg)
+        self.assertEqual(len(pt_idx), 0)
+
+    def test_empty_input(self):
+        """No points or no segments yield empty results."""
+        pt_idx, seg_idx, _, _ = self.engine.match(np.empty((0, 2)), self.seg)
+        self.assertEqual((len(pt_idx), len(seg_idx)), (0, 0))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(SegmentDistanceEngineTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,127 @@
+# coding=utf-8
+"""STALP_JT field completion test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import json
+import os
+import tempfile
+import unittest
+
+from qgis.core import NULL
+
+from config import NULL_VALUES
+from func.helper_functions import HelperBase
+from func.stalp_fields import StalpRules, stalp_field_changes, stalp_values
+from .network_generator import generate
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+RULES = StalpRules.load()
+
+
+class StalpFieldsTest(unittest.TestCase):
+    """Test the single-pass STALP_JT rules."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.layers = generate(200, seed=5).layers
+        self.st = self.layers["STALP_JT"]
+
+    def changes(self):
+        return stalp_field_changes(self.st, self.layers["TRONSON_JT"],
+                                   self.layers["BRANS_FIRI_GRPM_JT"], NULL_VALUES, RULES)
+
+    def test_rules(self):
+        """Each derived field follows its rule; unknown codes leave PROP alone."""
+        attrs = {"TIP_CIR": "Retea + IL", "DESC_CTG_MT_JT": "SE 4", "PROP": None,
+                 "TIP_FUND": None, "NR_CIR_FO": 1, "PROP_FO": None, "UZURA_STP": None,
+                 "NR_CIR_LTC": None, "NR_CIR_CATV": "", "FIB_OPT": None, "LTC": None, "CATV": None}
+        values = stalp_values(attrs, ["L1", "L1", "L2"], False, NULL_VALUES, RULES)
+        self.assertEqual(values, {
+            "NR_CIR": 3, "PROP": "ELECTRICA", "TIP_FUND": "Burata",
+            "FIB_OPT": "Da", "LTC": "Nu", "CATV": "Nu",
+            "PROP_FO": "SC RCS&RDS S.A", "UZURA_STP": 5,
+        })
+
+        attrs.update(TIP_CIR="Retea", DESC_CTG_MT_JT="necunoscut", PROP="TERTI + ELECTRICA(comodat)")
+        values = stalp_values(attrs, [], True, NULL_VALUES, RULES)
+        self.assertEqual(values["NR_CIR"], 1)
+        self.assertNotIn("PROP", values)
+
+    def test_rule_tables(self):
+        """The shipped JSON compiles to look-ups; a code listed twice keeps its first owner."""
+        self.assertEqual(RULES.prop["St. lemn tip SU"], "TERTI")
+        self.assertEqual(RULES.prop["SE 1A"], "ELECTRICA")
+        self.assertEqual(RULES.tip_fund["Portal"], "Turnata")
+        self.assertNotIn("SE 4", RULES.tip_fund)
+        self.assertEqual(RULES.flag_columns["NR_CIR_FO"], "FIB_OPT")
+
+        data = {"PROP": {"A": ["X"], "B": ["X", "Y"]}, "PROP_KEPT": [], "TIP_FUND": {},
+                "TIP_FUND_DEFAULT": "Burata", "FLAG_COLUMNS": {}, "FLAG_VALUES": ["Da", "Nu"],
+                "PROP_FO_DEFAULT": "", "UZURA_STP_DEFAULT": 5}
+        rules = StalpRules(data)
+        self.assertEqual(dict(rules.prop), {"X": "A", "Y": "B"})
+        with self.assertRaises(TypeError):
+            rules.prop["Z"] = "C"
+
+    def test_malformed_rules_file(self):
+        """A rules file that is missing, not JSON or missing a table fails to load with a clear error."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stalp_fields.json")
+            with self.assertRaises(IOError):
+                StalpRules.load(path)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"PROP": {"TERTI": [')
+            with self.assertRaises(ValueError):
+                StalpRules.load(path)
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"PROP": {}}, f)
+            with self.assertRaisesRegex(ValueError, "PROP_KEPT"):
+                StalpRules.load(path)
+
+    def test_same_value(self):
+        """NULL equals None and 100 equals "100", but stray whitespace is a difference."""
+        self.assertTrue(HelperBase.same_value(NULL, None))
+        self.assertTrue(HelperBase.same_value(100, "100"))
+        self.assertFalse(HelperBase.same_value("Da ", "Da"))
+        self.assertFalse(HelperBase.same_value("", None))
+
+    def test_only_differences_are_written(self):
+        """After one bulk write a second pass finds nothing left to change."""
+        self.st.dataProvider().changeAttributeValues(
+            {fid: {self.st.fields().indexOf("UZURA_STP"): None} for fid in (1, 2)})
+        changes = self.changes()
+        uzura = self.st.fields().indexOf("UZURA_STP")
+        self.assertEqual(changes[1][uzura], 5)
+        self.assertEqual(HelperBase().write_attribute_changes(self.st, changes), len(changes))
+        self.assertEqual(self.changes(), {})
+
+    def test_dry_run_describes_changes(self):
+        """The preview counts each field and shows the stored value next to the new one; nothing is written."""
+        uzura = self.st.fields().indexOf("UZURA_STP")
+        self.st.dataProvider().changeAttributeValues({3: {uzura: None}})
+        changes = self.changes()
+        counts, rows = HelperBase().describe_attribute_changes(self.st, changes)
+        self.assertEqual(sum(counts.values()), sum(len(c) for c in changes.values()))
+        self.assertIn((3, "UZURA_STP", None, 5), [(fid, name, None if current == NULL else current, value)
+                                                 for fid, name, current, value in rows])
+        self.assertEqual(self.changes(), changes)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(StalpFieldsTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
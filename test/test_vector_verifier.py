@@ -0,0 +1,181 @@
+# coding=utf-8
+"""Incremental vector verification test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'ioneladumitra@yahoo.ro'
+__date__ = '2026-10-16'
+__copyright__ = 'Copyright 2024, Ionela'
+
+import unittest
+from collections import Counter
+
+from qgis.core import QgsFeature, QgsGeometry, QgsPointXY, QgsProject, QgsVectorLayer
+
+from func.network_snapshot import DetachedLayer, NetworkSnapshot
+from func.vector_verifier import VectorVerifier
+from .network_generator import generate
+from .utilities import get_qgis_app
+
+QGIS_APP = get_qgis_app()
+
+TOL = 0.01
+
+
+def errors(layers) -> Counter:
+    """``{(NUME_LAYER, FID, TIP_EROARE): count}`` of error layers."""
+    return Counter((f["NUME_LAYER"], f["FID"], f["TIP_EROARE"])
+                   for layer in layers for f in layer.getFeatures())
+
+
+def memory_layer(uri: str, name: str, fields: str, rows) -> QgsVectorLayer:
+    """Memory layer *name* with string *fields* and a (WKT, [values]) feature per row."""
+    spec = "&".join(f"field={f}:string" for f in fields.split())
+    layer = QgsVectorLayer(f"{uri}?crs=EPSG:3844&{spec}", name, "memory")
+    features = []
+    for wkt, values in rows:
+        feature = QgsFeature(layer.fields())
+        feature.setGeometry(QgsGeometry.fromWkt(wkt))
+        feature.setAttributes(values)
+        features.append(feature)
+    layer.dataProvider().addFeatures(features)
+    return layer
+
+
+class IncrementalVerifierTest(unittest.TestCase):
+    """A re-check after edits must report exactly what a full run reports."""
+
+    def tearDown(self):
+        """Runs after each test."""
+        QgsProject.instance().removeAllMapLayers()
+
+    @staticmethod
+    def full_run() -> Counter:
+        verifier = VectorVerifier(None)
+        verifier.prepare(tolerance=TOL)
+        assert verifier.run()
+        return errors(verifier.build_error_layers())
+
+    @staticmethod
+    def incremental_run(verifier) -> Counter:
+        verifier.prepare(tolerance=TOL)
+        assert verifier._incremental
+        assert verifier.run()
+        verifier.publish()
+        return errors((verifier._erori_stalp, verifier._erori_line))
+
+    @staticmethod
+    def first_run() -> VectorVerifier:
+        verifier = VectorVerifier(None)
+        verifier.prepare(tolerance=TOL)
+        assert verifier.run()
+        verifier.publish()
+        return verifier
+
+    def test_generated_network(self):
+        """Moved, retyped, deleted and added features on a generated network."""
+        network = generate(600, seed=11, errors={
+            "terminal_br": 0.05, "tronson_fara_stalp": 0.3, "intindere": 0.05,
+            "brans_fara_stalp": 0.05, "rupere_conductor": 0.05})
+        network.add_to_project()
+        verifier = self.first_run()
+
+        st, br, tr = (network.layers[n] for n in ("STALP_JT", "BRANS_FIRI_GRPM_JT", "TRONSON_JT"))
+        for layer in (st, br, tr):
+            layer.startEditing()
+        tip_cir = st.fields().indexOf("TIP_CIR")
+        tip_leg = st.fields().indexOf("TIP_LEG_JT")
+        for fid in (5, 40, 77):
+            st.changeAttributeValue(fid, tip_cir, "")
+        for fid in (1, 30, 31, 60):
+            st.changeAttributeValue(fid, tip_leg, "s")
+        pole = st.getFeature(12).geometry().asPoint()
+        st.changeGeometry(12, QgsGeometry.fromPointXY(QgsPointXY(pole.x() + 3, pole.y() + 3)))
+        st.deleteFeature(100)
+        br.deleteFeature(3)
+        line = tr.getFeature(20).geometry().asPolyline()
+        tr.changeGeometry(20, QgsGeometry.fromPolylineXY(line[:-1] + [QgsPointXY(line[-1].x() + 2, line[-1].y())]))
+        isolated = QgsFeature(st.fields())
+        isolated.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(pole.x() - 500, pole.y() - 500)))
+        st.addFeature(isolated)
+        for layer in (st, br, tr):
+            self.assertTrue(layer.commitChanges())
+
+        self.assertEqual(self.incremental_run(verifier), self.full_run())
+
+    def test_error_shared_by_two_poles(self):
+        """A BRANS error reported through two poles stays while one of them still reports it."""
+        QgsProject.instance().addMapLayers([
+            memory_layer("Point", "STALP_JT", "DENUM TIP_CIR TIP_LEG_JT", [
+                ("POINT(10 0)", ["1", "JT+BR", "s"]),
+                ("POINT(20 0)", ["2", "JT+BR", "s"]),
+            ]),
+            memory_layer("LineString", "TRONSON_JT", "TIP_COND LINIA_JT", [
+                ("LINESTRING(0 0, 10 0)", ["x", "1"]),
+                ("LINESTRING(30 0, 20 0)", ["x", "1"]),
+            ]),
+            memory_layer("LineString", "BRANS_FIRI_GRPM_JT", "TIP_COND TIP_FIRI_BR", [
+                ("LINESTRING(10 0, 15 5, 20 0)", ["TYIR 10Al + 16Al", "BMPM"]),
+            ]),
+        ])
+        verifier = self.first_run()
+        shared = ("BRANS_FIRI_GRPM_JT", 1)
+        self.assertEqual(sum(n for key, n in errors((verifier._erori_stalp,)).items() if key[:2] == shared), 1)
+
+        st = QgsProject.instance().mapLayersByName("STALP_JT")[0]
+        st.startEditing()
+        st.changeAttributeValue(1, st.fields().indexOf("TIP_LEG_JT"), "t")
+        self.assertTrue(st.commitChanges())
+
+        incremental = self.incremental_run(verifier)
+        self.assertEqual(incremental, self.full_run())
+        self.assertTrue(any(key[:2] == shared for key in incremental))
+
+    def test_renamed_error_layer_is_patched(self):
+        """Renaming an error layer between runs does not stop the incremental patch."""
+        network = generate(200, seed=8)
+        network.add_to_project()
+        verifier = self.first_run()
+        verifier._erori_stalp.setName("erori_stalp (vechi)")
+
+        st = network.layers["STALP_JT"]
+        st.startEditing()
+        for fid in (2, 9):
+            st.changeAttributeValue(fid, st.fields().indexOf("TIP_CIR"), "")
+        self.assertTrue(st.commitChanges())
+
+        self.assertEqual(self.incremental_run(verifier), self.full_run())
+
+    def test_refreshed_snapshot_matches_a_fresh_one(self):
+        """refresh() re-reads only the edited features and ends where a new read ends."""
+        network = generate(300, seed=4)
+        st, br, tr = (network.layers[n] for n in ("STALP_JT", "BRANS_FIRI_GRPM_JT", "TRONSON_JT"))
+        net = NetworkSnapshot(DetachedLayer(st), DetachedLayer(br), DetachedLayer(tr))
+
+        st.dataProvider().deleteFeatures([7])
+        pole = st.getFeature(8).geometry().asPoint()
+        st.dataProvider().changeGeometryValues({8: QgsGeometry.fromPointXY(QgsPointXY(pole.x() + 4, pole.y()))})
+        br.dataProvider().deleteFeatures([2])
+        net.refresh(DetachedLayer(st), DetachedLayer(br), DetachedLayer(tr),
+                    {"STALP_JT": {7, 8}, "BRANS_FIRI_GRPM_JT": {2}})
+        self.assertEqual(net.features_read, 1)
+
+        fresh = NetworkSnapshot(DetachedLayer(st), DetachedLayer(br), DetachedLayer(tr))
+        net.build_adjacency(TOL)
+        fresh.build_adjacency(TOL)
+        self.assertEqual(set(net.poles), set(fresh.poles))
+        self.assertEqual(set(net.brans), set(fresh.brans))
+        self.assertEqual(dict(net.pole_tronson), dict(fresh.pole_tronson))
+        self.assertEqual(dict(net.pole_brans), dict(fresh.pole_brans))
+        self.assertEqual(net.poles[8].point, fresh.poles[8].point)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(IncrementalVerifierTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)